@@ -1,9 +1,12 @@
 """Base AI Agent class and interfaces"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 from enum import Enum
+from string import Formatter
+from copy import deepcopy
+import hashlib
 import structlog
 
 from app.services.llm_service import llm_service, LLMProvider
@@ -29,14 +32,23 @@ class ConversationContext:
         self.messages: List[Dict[str, str]] = []
         self.max_history = max_history
         self.metadata: Dict[str, Any] = {}
+        # Messages added since the context was last saved, so storage can
+        # append them instead of rewriting the whole history
+        self.unsaved_messages: List[Dict[str, str]] = []
+        # Set when storage must replace, not extend, the stored history
+        self.needs_rewrite = True
+        # Stored revision this context was loaded or last saved at
+        self.revision = 0
     
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history"""
-        self.messages.append({
+        message = {
             "role": role,
             "content": content,
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }
+        self.messages.append(message)
+        self.unsaved_messages.append(message)
         
         # Keep only recent messages to manage context window
         if len(self.messages) > self.max_history:
@@ -55,6 +67,23 @@ class ConversationContext:
         """Clear conversation history"""
         self.messages = []
         self.metadata = {}
+        self.unsaved_messages = []
+        self.needs_rewrite = True
+    
+    def mark_saved(self):
+        """Record that storage now holds every message of the context"""
+        self.unsaved_messages = []
+        self.needs_rewrite = False
+    
+    def copy(self) -> "ConversationContext":
+        """Independent copy of the context, including its storage state"""
+        context = ConversationContext(max_history=self.max_history)
+        context.messages = [dict(msg) for msg in self.messages]
+        context.metadata = deepcopy(self.metadata)
+        context.unsaved_messages = [dict(msg) for msg in self.unsaved_messages]
+        context.needs_rewrite = self.needs_rewrite
+        context.revision = self.revision
+        return context
     
     def set_metadata(self, key: str, value: Any):
         """Set metadata for the conversation"""
@@ -71,6 +100,9 @@ class PromptTemplate:
     def __init__(self, template: str, variables: Optional[List[str]] = None):
         self.template = template
         self.variables = variables or []
+        # Fixed text before the first variable, identical in every prompt
+        literal, *_ = next(iter(Formatter().parse(template)), ("", None, None, None))
+        self.static_prefix = literal
     
     def format(self, **kwargs) -> str:
         """Format the template with provided variables"""
@@ -123,6 +155,11 @@ class BaseAgent(ABC):
             role=role.value
         )
     
+    @property
+    def prompt_version(self) -> str:
+        """Short content hash identifying the current system prompt"""
+        return hashlib.sha256(self.system_prompt.encode("utf-8")).hexdigest()[:12]
+    
     @abstractmethod
     def _initialize_templates(self):
         """Initialize agent-specific prompt templates"""
@@ -142,10 +179,18 @@ class BaseAgent(ABC):
         """Get a prompt template by name"""
         return self.prompt_templates.get(name)
     
+    def _completion_options(self, message: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """LLM call options, marking the template preamble of the message as cacheable"""
+        template = self.prompt_templates.get(kwargs.get("template") or "")
+        if template and template.static_prefix and message.startswith(template.static_prefix):
+            return {"cacheable_prefix": template.static_prefix, **kwargs}
+        return kwargs
+    
     async def process_message(
         self,
         message: str,
         context: ConversationContext,
+        deadline: Optional[float] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -154,6 +199,7 @@ class BaseAgent(ABC):
         Args:
             message: User message
             context: Conversation context
+            deadline: Absolute ``time.monotonic()`` deadline for the LLM call
             **kwargs: Additional parameters
         
         Returns:
@@ -177,7 +223,9 @@ class BaseAgent(ABC):
                 messages=messages,
                 provider=self.llm_provider,
                 fallback=True,
-                **kwargs
+                agent_id=self.agent_id,
+                deadline=deadline,
+                **self._completion_options(message, kwargs)
             )
             
             # Add assistant response to context
@@ -202,6 +250,73 @@ class BaseAgent(ABC):
             )
             raise
     
+    async def stream_message(
+        self,
+        message: str,
+        context: ConversationContext,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user message and stream the response as it is generated
+        
+        Yields ``{"type": "token", "content": ...}`` events followed by a
+        final ``{"type": "done", "response": ...}`` event carrying the same
+        formatted response as ``process_message``. The assistant message is
+        only added to the context once the stream has completed.
+        
+        Args:
+            message: User message
+            context: Conversation context
+            deadline: Absolute ``time.monotonic()`` deadline for the LLM call
+            **kwargs: Additional parameters
+        """
+        try:
+            logger.info(
+                "agent_streaming_message",
+                agent_id=self.agent_id,
+                message_length=len(message)
+            )
+            
+            # Add user message to context
+            context.add_message("user", message)
+            
+            async for event in llm_service.stream_completion(
+                messages=context.get_messages(),
+                provider=self.llm_provider,
+                fallback=True,
+                agent_id=self.agent_id,
+                deadline=deadline,
+                **self._completion_options(message, kwargs)
+            ):
+                if event["type"] == "token":
+                    yield event
+                    continue
+                
+                result = event["completion"]
+                
+                # Add assistant response to context once complete
+                context.add_message("assistant", result["content"])
+                
+                logger.info(
+                    "agent_message_streamed",
+                    agent_id=self.agent_id,
+                    response_length=len(result["content"])
+                )
+                
+                yield {
+                    "type": "done",
+                    "response": self._format_response(result, context)
+                }
+            
+        except Exception as e:
+            logger.error(
+                "agent_streaming_failed",
+                agent_id=self.agent_id,
+                error=str(e)
+            )
+            raise
+    
     def _format_response(
         self,
         llm_result: Dict[str, Any],
@@ -228,7 +343,8 @@ class BaseAgent(ABC):
                 "provider": llm_result["provider"],
                 "usage": llm_result["usage"],
                 "personality": self.personality,
-                "context_length": len(context.get_messages())
+                "context_length": len(context.get_messages()),
+                "cached": llm_result["metadata"].get("cached", False)
             }
         }
     
@@ -177,7 +177,8 @@ class BlazeAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.8
+            temperature=0.8,
+            template="mission_contribution"
         )
         
         return {
@@ -222,7 +223,7 @@ class BlazeAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.7)
+        result = await self.process_message(prompt, context, temperature=0.7, template="funnel_blueprint")
         
         return result
     
@@ -254,6 +255,6 @@ class BlazeAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.8)
+        result = await self.process_message(prompt, context, temperature=0.8, template="pitch_deck")
         
         return result
@@ -176,7 +176,8 @@ class EchoAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.8
+            temperature=0.8,
+            template="mission_contribution"
         )
         
         return {
@@ -221,7 +222,7 @@ class EchoAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.7)
+        result = await self.process_message(prompt, context, temperature=0.7, template="market_intelligence")
         
         return result
     
@@ -253,6 +254,6 @@ class EchoAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.8)
+        result = await self.process_message(prompt, context, temperature=0.8, template="opportunity_identification")
         
         return result
@@ -221,7 +221,8 @@ class LexiAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.6
+            temperature=0.6,
+            template="mission_contribution"
         )
         
         return {
@@ -263,7 +264,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.5)
+        result = await self.process_message(prompt, context_obj, temperature=0.5, template="metrics_analysis")
         
         return result
     
@@ -292,7 +293,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.6)
+        result = await self.process_message(prompt, context_obj, temperature=0.6, template="trend_identification")
         
         return result
     
@@ -321,7 +322,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.7)
+        result = await self.process_message(prompt, context_obj, temperature=0.7, template="insight_generation")
         
         return result
     
@@ -350,7 +351,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.6)
+        result = await self.process_message(prompt, context_obj, temperature=0.6, template="dashboard_insights")
         
         return result
     
@@ -379,7 +380,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.5)
+        result = await self.process_message(prompt, context_obj, temperature=0.5, template="anomaly_detection")
         
         return result
     
@@ -408,7 +409,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.5)
+        result = await self.process_message(prompt, context_obj, temperature=0.5, template="performance_comparison")
         
         return result
     
@@ -437,7 +438,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.7)
+        result = await self.process_message(prompt, context_obj, temperature=0.7, template="data_storytelling")
         
         return result
     
@@ -466,7 +467,7 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.6)
+        result = await self.process_message(prompt, context_obj, temperature=0.6, template="predictive_insights")
         
         return result
     
@@ -495,6 +496,6 @@ class LexiAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.6)
+        result = await self.process_message(prompt, context_obj, temperature=0.6, template="metric_correlation")
         
         return result
@@ -1,6 +1,6 @@
 """Lumi - Legal & Docs Agent"""
 
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 from app.agents.base_agent import BaseAgent, AgentRole, LLMProvider, ResponseFormatter
 
 
@@ -167,6 +167,21 @@ class LumiAgent(BaseAgent):
         result["metadata"]["disclaimer_included"] = True
         return result
     
+    async def stream_message(
+        self,
+        message: str,
+        context,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Override to stream the legal disclaimer after the response"""
+        async for event in super().stream_message(message, context, **kwargs):
+            if event["type"] == "done":
+                yield {"type": "token", "content": self.LEGAL_DISCLAIMER}
+                response = event["response"]
+                response["content"] = self._add_legal_disclaimer(response["content"])
+                response["metadata"]["disclaimer_included"] = True
+            yield event
+    
     async def contribute_to_mission(
         self,
         objective: str,
@@ -207,7 +222,8 @@ class LumiAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.5
+            temperature=0.5,
+            template="mission_contribution"
         )
         
         return {
@@ -256,7 +272,7 @@ class LumiAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.3)
+        result = await self.process_message(prompt, context, temperature=0.3, template="document_generation")
         
         return result
     
@@ -288,6 +304,6 @@ class LumiAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.4)
+        result = await self.process_message(prompt, context, temperature=0.4, template="legal_compliance")
         
         return result
@@ -201,7 +201,8 @@ class NovaAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.8
+            temperature=0.8,
+            template="mission_contribution"
         )
         
         return {
@@ -246,7 +247,7 @@ class NovaAgent(BaseAgent):
         )
         
         context_obj = self.create_context()
-        result = await self.process_message(prompt, context_obj, temperature=0.7)
+        result = await self.process_message(prompt, context_obj, temperature=0.7, template="uiux_guidance")
         
         return result
     
@@ -278,7 +279,7 @@ class NovaAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.7)
+        result = await self.process_message(prompt, context, temperature=0.7, template="wireframe_suggestion")
         
         return result
     
@@ -310,7 +311,7 @@ class NovaAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.7)
+        result = await self.process_message(prompt, context, temperature=0.7, template="design_system")
         
         return result
     
@@ -342,6 +343,6 @@ class NovaAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.6)
+        result = await self.process_message(prompt, context, temperature=0.6, template="user_flow")
         
         return result
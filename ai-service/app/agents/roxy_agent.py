@@ -150,7 +150,8 @@ class RoxyAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.7
+            temperature=0.7,
+            template="mission_contribution"
         )
         
         return {
@@ -192,7 +193,7 @@ class RoxyAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.6)
+        result = await self.process_message(prompt, context, temperature=0.6, template="schedule_management")
         
         return result
     
@@ -224,6 +225,6 @@ class RoxyAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.6)
+        result = await self.process_message(prompt, context, temperature=0.6, template="priority_assessment")
         
         return result
@@ -82,7 +82,8 @@ class SampleAgent(BaseAgent):
         # Process the mission objective
         result = await self.process_message(
             message=mission_prompt,
-            context=mission_context
+            context=mission_context,
+            template="mission_contribution"
         )
         
         return {
@@ -202,7 +202,8 @@ class VexAgent(BaseAgent):
         result = await self.process_message(
             message=mission_prompt,
             context=mission_context,
-            temperature=0.6
+            temperature=0.6,
+            template="mission_contribution"
         )
         
         return {
@@ -250,7 +251,7 @@ class VexAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.6)
+        result = await self.process_message(prompt, context, temperature=0.6, template="tech_recommendation")
         
         return result
     
@@ -282,7 +283,7 @@ class VexAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.5)
+        result = await self.process_message(prompt, context, temperature=0.5, template="architecture_design")
         
         return result
     
@@ -311,6 +312,6 @@ class VexAgent(BaseAgent):
         )
         
         context = self.create_context()
-        result = await self.process_message(prompt, context, temperature=0.4)
+        result = await self.process_message(prompt, context, temperature=0.4, template="architecture_diagram")
         
         return result
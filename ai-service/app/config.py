@@ -1,6 +1,6 @@
 """Application configuration management"""
 
-from typing import List
+from typing import List, Dict, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -25,13 +25,56 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str
     openai_model: str = "gpt-4"
-    openai_max_tokens: int = 2000
+    openai_max_tokens: int = 1000
     openai_temperature: float = 0.7
+    openai_base_url: str = ""  # Optional override (proxies, local fake providers)
     
     # Anthropic Configuration
     anthropic_api_key: str
     anthropic_model: str = "claude-3-sonnet-20240229"
-    anthropic_max_tokens: int = 2000
+    anthropic_max_tokens: int = 1000
+    anthropic_base_url: str = ""  # Optional override (proxies, local fake providers)
+    anthropic_prompt_caching: bool = True  # Cache system prompts and template preambles
+    
+    # Fake Provider (deterministic local backend for offline load tests and benchmarks)
+    enable_fake_provider: bool = False
+    llm_provider_override: str = ""  # Send every call to this provider, e.g. "fake"
+    fake_model: str = "fake-premium"
+    fake_economy_model: str = "fake-economy"
+    fake_latency_distribution: str = "lognormal"  # fixed, uniform, normal or lognormal
+    fake_latency_ms: float = 800.0  # Median call latency
+    fake_latency_spread: float = 0.5  # Relative spread (sigma for lognormal)
+    fake_first_token_ratio: float = 0.2  # Share of the latency before the first streamed token
+    fake_error_rate: float = 0.0
+    fake_output_tokens: int = 200
+    fake_output_tokens_spread: float = 0.25
+    fake_seed: int = 0
+    
+    # LLM HTTP Connection Pool (shared by all provider clients)
+    llm_request_timeout: float = 120.0
+    llm_connect_timeout: float = 10.0
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 30.0
+    
+    # Batch Completions (/api/llm/completions/batch)
+    batch_max_items: int = 500
+    batch_max_concurrency: int = 10
+    
+    # Request Shaping (local token counting against model context windows)
+    llm_min_output_tokens: int = 256
+    llm_context_safety_margin: int = 64
+    
+    # Model Routing (pick an economy or premium model per call)
+    enable_model_routing: bool = True
+    openai_economy_model: str = "gpt-3.5-turbo"
+    anthropic_economy_model: str = "claude-3-haiku-20240307"
+    llm_routing_rules: str = (
+        "lexi:dashboard_insights=economy,"
+        "mission_control:analyze_objective=economy,"
+        "lumi:*=premium"
+    )
+    llm_routing_economy_max_prompt_tokens: int = 6000
     
     # Pinecone Configuration
     pinecone_api_key: str
@@ -40,23 +83,165 @@ class Settings(BaseSettings):
     
     # Redis Configuration
     redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 20
+    
+    # Context Storage (msgpack encoding, zstd-compressed above the threshold; 0 disables)
+    context_compression_threshold_bytes: int = 1024
+    context_compression_level: int = 3
+    
+    # Context Cache (in-process LRU in front of context storage, kept coherent over pub/sub)
+    enable_context_cache: bool = True
+    context_cache_max_entries: int = 10000
+    context_cache_ttl_seconds: int = 300
+    
+    # Context Write Mode: "sync" saves before responding; "batched" waits for a coalesced,
+    # pipelined flush; "async" (write-behind) responds at once and flushes in the background
+    context_write_mode: str = "sync"
+    context_flush_interval_ms: int = 20
+    context_flush_batch_size: int = 200
+    context_write_max_pending: int = 5000  # async saves wait for their flush beyond this
+    context_drain_timeout_seconds: float = 10.0
+    
+    # Background Jobs (durable queue in Redis, processed by `python -m app.worker`)
+    job_worker_concurrency: int = 4
+    job_max_parallel_steps: int = 4
+    job_max_attempts: int = 3
+    job_heartbeat_seconds: float = 10.0
+    job_result_ttl_seconds: int = 86400
+    job_shutdown_grace_seconds: float = 30.0
     
     # Monitoring
     sentry_dsn: str = ""
     
-    # Rate Limiting
+    # Rate Limiting (client-side provider budgets per provider and model, shared via Redis)
+    # A limit of 0 disables that budget
+    enable_rate_limiting: bool = True
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
+    rate_limit_tokens_per_minute: int = 90000
+    rate_limit_max_wait_seconds: float = 10.0  # Also bounded by the request deadline
+    rate_limit_model_overrides: str = ""  # 'provider:model=rpm/tpm' pairs, comma-separated
+    
+    # Adaptive Concurrency (AIMD limit per provider with a bounded wait queue)
+    enable_concurrency_limit: bool = True
+    concurrency_initial_limit: int = 20
+    concurrency_min_limit: int = 2
+    concurrency_max_limit: int = 100
+    concurrency_max_queue: int = 200
+    concurrency_queue_timeout_seconds: float = 30.0
+    concurrency_backoff_ratio: float = 0.9
+    concurrency_latency_threshold_seconds: float = 45.0
     
     # Cost Tracking
     enable_cost_tracking: bool = True
     cost_alert_threshold: float = 100.0
+    cost_tracker_recent_requests: int = 100  # Size of the recent-requests ring buffer
+    
+    # Tenant Budgets (shared cost ledger in Redis, tenant from the X-Tenant-ID header;
+    # calls without one are accounted and budgeted as tenant "default")
+    tenant_budget_period: str = "month"  # hour, day or month
+    tenant_default_budget: float = 0.0  # USD per period; 0 disables budgets
+    tenant_budgets: str = ""  # 'tenant=budget' pairs, comma-separated
+    tenant_budget_action: str = "downgrade"  # downgrade (to economy models) or reject
+    
+    # Completion Cache (exact-match, in-process LRU + Redis)
+    enable_completion_cache: bool = True
+    completion_cache_max_entries: int = 1000
+    completion_cache_ttl_seconds: int = 3600
+    completion_cache_max_temperature: float = 0.2  # Sampled calls (e.g. chat at 0.3-0.8) are never cached
+    
+    # Semantic Cache (near-duplicate prompts via the vector service)
+    enable_semantic_cache: bool = False
+    semantic_cache_namespace: str = "llm-semantic-cache"
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_agent_thresholds: str = "lexi=0.92,mission_control=0.93"
+    semantic_cache_ttl_seconds: int = 86400
+    semantic_cache_sweep_interval_seconds: int = 600  # How often expired vectors are deleted
+    
+    # Request Coalescing (one provider call for identical in-flight requests)
+    enable_request_coalescing: bool = True
+    
+    # Hedged Requests (race a slow primary against the fallback provider)
+    enable_hedging: bool = False
+    hedge_latency_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    hedge_default_delay_seconds: float = 10.0
+    hedge_min_delay_seconds: float = 1.0
+    
+    # Request Deadlines (X-Request-Timeout header or timeout_seconds field)
+    request_default_timeout_seconds: float = 0.0  # Deadline when the caller sets none; 0 disables
+    request_max_timeout_seconds: float = 300.0
+    
+    # Auto-Continuation (resume completions cut off at max_tokens)
+    enable_auto_continuation: bool = True
+    continuation_max_rounds: int = 3  # Extra calls per completion
+    continuation_max_output_tokens: int = 8000  # No further rounds past this many output tokens
+    
+    # Retries (transient provider errors only, capped by a global retry budget)
+    enable_retries: bool = True
+    llm_max_retries: int = 2
+    retry_budget_ratio: float = 0.1  # Retries allowed per first attempt, across all providers
+    retry_budget_min_per_second: float = 0.5  # Retry allowance that accrues regardless of traffic
+    retry_budget_max_balance: float = 10.0  # Cap on banked retries
+    retry_base_delay_seconds: float = 0.5
+    retry_max_delay_seconds: float = 10.0  # Longer Retry-After waits fail over instead
+    
+    # Circuit Breaker (per provider and model)
+    enable_circuit_breaker: bool = True
+    circuit_breaker_window_size: int = 20
+    circuit_breaker_min_calls: int = 5
+    circuit_breaker_failure_rate: float = 0.5
+    circuit_breaker_slow_call_seconds: float = 60.0
+    circuit_breaker_slow_call_rate: float = 0.8
+    circuit_breaker_cooldown_seconds: float = 30.0
+    circuit_breaker_half_open_probes: int = 1
     
     @property
     def cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
     
+    @property
+    def semantic_cache_thresholds(self) -> Dict[str, float]:
+        """Parse per-agent semantic cache thresholds from 'agent=threshold' pairs"""
+        thresholds = {}
+        for pair in self.semantic_cache_agent_thresholds.split(","):
+            if "=" in pair:
+                agent_id, threshold = pair.split("=", 1)
+                thresholds[agent_id.strip()] = float(threshold)
+        return thresholds
+    
+    @property
+    def llm_routing_policy(self) -> Dict[str, str]:
+        """Parse model routing rules from 'agent:template=tier' pairs"""
+        rules = {}
+        for pair in self.llm_routing_rules.split(","):
+            if "=" in pair:
+                key, tier = pair.split("=", 1)
+                rules[key.strip()] = tier.strip()
+        return rules
+    
+    @property
+    def tenant_budget_overrides(self) -> Dict[str, float]:
+        """Parse per-tenant budgets from 'tenant=budget' pairs"""
+        budgets = {}
+        for pair in self.tenant_budgets.split(","):
+            if "=" in pair:
+                tenant_id, budget = pair.split("=", 1)
+                budgets[tenant_id.strip()] = float(budget)
+        return budgets
+    
+    @property
+    def rate_limit_overrides(self) -> Dict[str, Tuple[int, int]]:
+        """Parse per-model rate limits from 'provider:model=rpm/tpm' pairs"""
+        overrides = {}
+        for pair in self.rate_limit_model_overrides.split(","):
+            if "=" in pair:
+                key, limits = pair.split("=", 1)
+                rpm, tpm = limits.split("/", 1)
+                overrides[key.strip()] = (int(rpm), int(tpm))
+        return overrides
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production environment"""
@@ -1,6 +1,7 @@
 """Main FastAPI application entry point"""
 
 from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import structlog
@@ -8,7 +9,11 @@ import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
 from app.config import settings
-from app.middleware import RequestLoggingMiddleware, ErrorHandlingMiddleware
+from app.middleware import (
+    RequestLoggingMiddleware,
+    ErrorHandlingMiddleware,
+    TenantContextMiddleware
+)
 from app.routers import health
 
 # Configure structured logging
@@ -48,6 +53,14 @@ async def lifespan(app: FastAPI):
     await context_storage.connect()
     logger.info("context_storage_connected")
     
+    # Initialize shared Redis pool (optional: caches degrade to in-process)
+    from app.services.redis_client import redis_manager
+    await redis_manager.connect()
+    
+    # Load tokenizer encodings off the event loop before the first request
+    from app.services.llm_service import llm_service
+    await asyncio.to_thread(llm_service.token_counter.warm_up, [settings.openai_model])
+    
     # Initialize AI agents
     from app.agents import initialize_agents
     initialize_agents()
@@ -58,9 +71,17 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("application_shutting_down")
     
+    # Flush write-behind context saves before closing their connection
+    await context_storage.drain()
+    
     # Cleanup Redis connection
     await context_storage.disconnect()
     logger.info("context_storage_disconnected")
+    
+    await redis_manager.disconnect()
+    
+    # Close pooled LLM provider connections
+    await llm_service.close()
 
 
 # Create FastAPI application
@@ -83,6 +104,7 @@ app.add_middleware(
 )
 
 # Add custom middleware
+app.add_middleware(TenantContextMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 
@@ -90,11 +112,12 @@ app.add_middleware(RequestLoggingMiddleware)
 app.include_router(health.router, prefix="/api", tags=["health"])
 
 # Import and include other routers
-from app.routers import llm, vectors, agents
+from app.routers import llm, vectors, agents, jobs
 from app.routes import mission_control
 app.include_router(llm.router, prefix="/api/llm", tags=["llm"])
 app.include_router(vectors.router, prefix="/api/vectors", tags=["vectors"])
 app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(mission_control.router, tags=["mission-control"])
 
 
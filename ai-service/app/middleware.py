@@ -8,6 +8,8 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
 
+from app.services.call_context import current_tenant_id
+
 logger = structlog.get_logger()
 
 
@@ -63,6 +65,14 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 
+class TenantContextMiddleware(BaseHTTPMiddleware):
+    """Middleware to bind the calling tenant (X-Tenant-ID) for cost accounting and budgets"""
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        current_tenant_id.set(request.headers.get("X-Tenant-ID"))
+        return await call_next(request)
+
+
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     """Middleware to handle uncaught exceptions"""
     
@@ -31,6 +31,11 @@ class AgentProcessRequest(BaseModel):
         le=2.0,
         description="LLM temperature override"
     )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Deadline for the response in seconds (overrides the X-Request-Timeout header)"
+    )
 
 
 class AgentUsageInfo(BaseModel):
@@ -38,6 +43,8 @@ class AgentUsageInfo(BaseModel):
     input_tokens: int
     output_tokens: int
     total_tokens: int
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
 
 
 class AgentMetadata(BaseModel):
@@ -47,6 +54,7 @@ class AgentMetadata(BaseModel):
     usage: AgentUsageInfo
     personality: str
     context_length: int
+    cached: bool = False
 
 
 class AgentProcessResponse(BaseModel):
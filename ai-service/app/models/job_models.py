@@ -0,0 +1,92 @@
+"""Pydantic models for background jobs"""
+
+from enum import Enum
+from typing import Optional, List, Dict, Any, Type
+from pydantic import BaseModel, Field
+
+
+class JobType(str, Enum):
+    """Long-running generation jobs handled by the worker"""
+    MISSION_SYNTHESIS = "mission_synthesis"
+    LUMI_DOCUMENTS = "lumi_documents"
+    LEXI_BULK_INSIGHTS = "lexi_bulk_insights"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED}
+
+
+class MissionSynthesisPayload(BaseModel):
+    """Full mission run: analysis, agent contributions and synthesis"""
+    objective: str = Field(..., description="Mission objective")
+    context: Dict[str, Any] = Field(default_factory=dict, description="Business context")
+    agents: List[str] = Field(
+        default_factory=lambda: ["roxy", "echo", "blaze", "lumi", "vex", "lexi", "nova"],
+        min_length=1,
+        description="Agents contributing to the mission"
+    )
+    analysis: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Existing objective analysis; generated when omitted"
+    )
+
+
+class LumiDocumentSpec(BaseModel):
+    """A document for Lumi to draft"""
+    document_type: str
+    business_context: str
+    parties: str
+    key_terms: str
+    jurisdiction: str = "United States"
+
+
+class LumiDocumentsPayload(BaseModel):
+    """Batch of Lumi legal documents"""
+    documents: List[LumiDocumentSpec] = Field(..., min_length=1)
+
+
+class LexiInsightSpec(BaseModel):
+    """A dataset for Lexi to generate insights from"""
+    business_data: str
+    goals: str
+    challenges: str = "No specific challenges identified"
+
+
+class LexiBulkInsightsPayload(BaseModel):
+    """Batch of Lexi insight requests"""
+    datasets: List[LexiInsightSpec] = Field(..., min_length=1)
+
+
+JOB_PAYLOADS: Dict[JobType, Type[BaseModel]] = {
+    JobType.MISSION_SYNTHESIS: MissionSynthesisPayload,
+    JobType.LUMI_DOCUMENTS: LumiDocumentsPayload,
+    JobType.LEXI_BULK_INSIGHTS: LexiBulkInsightsPayload,
+}
+
+
+class JobSubmitRequest(BaseModel):
+    """Request model for submitting a background job"""
+    type: JobType = Field(..., description="Job type")
+    payload: Dict[str, Any] = Field(..., description="Job input; shape depends on the type")
+
+
+class JobInfo(BaseModel):
+    """State of a background job"""
+    job_id: str
+    type: JobType
+    status: JobStatus
+    tenant_id: Optional[str] = None
+    attempts: int = 0
+    steps_completed: int = Field(0, description="Checkpointed LLM steps finished so far")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
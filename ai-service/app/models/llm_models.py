@@ -15,7 +15,7 @@ class CompletionRequest(BaseModel):
     messages: List[Message] = Field(..., description="List of conversation messages")
     provider: Optional[str] = Field(
         default="openai",
-        description="LLM provider: openai or anthropic"
+        description="LLM provider: openai, anthropic or fake (when ENABLE_FAKE_PROVIDER is set)"
     )
     model: Optional[str] = Field(
         default=None,
@@ -36,6 +36,22 @@ class CompletionRequest(BaseModel):
         default=True,
         description="Enable automatic fallback to alternative provider"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Allow the response to be served from or stored in the completion cache"
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Deadline for the response in seconds (overrides the X-Request-Timeout header)"
+    )
+    auto_continue: Optional[bool] = Field(
+        default=None,
+        description=(
+            "Continue generation when the completion hits max_tokens "
+            "(default: only when max_tokens is not set)"
+        )
+    )
 
 
 class UsageInfo(BaseModel):
@@ -43,6 +59,8 @@ class UsageInfo(BaseModel):
     input_tokens: int
     output_tokens: int
     total_tokens: int
+    cached_input_tokens: int = Field(0, description="Prompt tokens read from the provider's prompt cache")
+    cache_write_tokens: int = Field(0, description="Prompt tokens written to the provider's prompt cache")
 
 
 class CompletionMetadata(BaseModel):
@@ -50,6 +68,15 @@ class CompletionMetadata(BaseModel):
     finish_reason: Optional[str] = None
     stop_reason: Optional[str] = None
     duration_ms: float
+    first_token_ms: Optional[float] = None
+    cached: bool = False
+    cache_tier: Optional[str] = None
+    cache_entry_id: Optional[str] = None
+    similarity: Optional[float] = None
+    coalesced: bool = False
+    continuations: int = Field(0, description="Follow-up calls that continued a completion cut off at max_tokens")
+    estimated_prompt_tokens: Optional[int] = None
+    estimated_max_cost: Optional[float] = None
 
 
 class CompletionResponse(BaseModel):
@@ -61,8 +88,86 @@ class CompletionResponse(BaseModel):
     metadata: CompletionMetadata = Field(..., description="Additional metadata")
 
 
+class BatchCompletionRequest(BaseModel):
+    """Request model for a batch of LLM completions"""
+    requests: List[CompletionRequest] = Field(
+        ...,
+        min_length=1,
+        description="Completion requests to run"
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum completions in flight at once (capped by the service limit)"
+    )
+    stream: bool = Field(
+        default=False,
+        description="Stream results as NDJSON in completion order instead of one ordered response"
+    )
+
+
+class BatchItemError(BaseModel):
+    """Error for a single batch item"""
+    status_code: int
+    message: str
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single batch item"""
+    index: int = Field(..., description="Position of the request in the batch")
+    success: bool
+    completion: Optional[CompletionResponse] = None
+    error: Optional[BatchItemError] = None
+
+
+class BatchCompletionResponse(BaseModel):
+    """Response model for a batch of LLM completions"""
+    results: List[BatchItemResult] = Field(..., description="Results in request order")
+    succeeded: int
+    failed: int
+
+
+class SemanticCacheFeedback(BaseModel):
+    """Report that a semantic cache hit returned an unsuitable answer"""
+    cache_entry_id: str = Field(..., description="cache_entry_id from the completion metadata")
+
+
+class ServiceMetrics(BaseModel):
+    """Performance metrics for LLM service components"""
+    completion_cache: Optional[Dict[str, Any]] = None
+    semantic_cache: Optional[Dict[str, Any]] = None
+    coalescing: Optional[Dict[str, Any]] = None
+    hedging: Optional[Dict[str, Any]] = None
+    retries: Optional[Dict[str, Any]] = None
+    circuit_breakers: Optional[Dict[str, Any]] = None
+    rate_limits: Optional[Dict[str, Any]] = None
+    concurrency: Optional[Dict[str, Any]] = None
+    routing: Optional[Dict[str, Any]] = None
+    cost_ledger: Optional[Dict[str, Any]] = None
+
+
 class CostStats(BaseModel):
     """Cost tracking statistics"""
     total_cost: float
     total_requests: int
+    cache_hits: int = 0
+    cached_input_tokens: int = 0
+    prompt_cache_savings: float = 0.0
     recent_requests: List[Dict[str, Any]]
+    by_model: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    by_provider: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    by_agent: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    shared: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Today's totals across all workers, from the shared cost ledger"
+    )
+
+
+class TenantUsage(BaseModel):
+    """A tenant's LLM spend in the current budget period"""
+    tenant_id: str
+    period: str
+    spent: float
+    budget: Optional[float] = None
+    remaining: Optional[float] = None
+    exhausted: bool = False
@@ -1,7 +1,8 @@
 """Agent API endpoints"""
 
 from typing import List
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 import structlog
 
 from app.models.agent_models import (
@@ -14,6 +15,9 @@ from app.models.agent_models import (
 )
 from app.agents.agent_registry import agent_registry
 from app.services.context_storage import context_storage
+from app.services.errors import LLMServiceUnavailableError
+from app.utils.deadlines import cancel_on_disconnect, request_deadline
+from app.utils.streaming import format_sse, SSE_HEADERS
 
 logger = structlog.get_logger()
 
@@ -61,8 +65,9 @@ async def get_agent_info(agent_id: str):
     summary="Process message with agent",
     description="Send a message to an AI agent and get a response"
 )
-async def process_message(request: AgentProcessRequest):
+async def process_message(request: AgentProcessRequest, http_request: Request):
     """Process a message with an agent"""
+    deadline = request_deadline(http_request, request.timeout_seconds)
     try:
         # Get agent
         agent = agent_registry.get(request.agent_id)
@@ -90,10 +95,14 @@ async def process_message(request: AgentProcessRequest):
         if request.temperature is not None:
             kwargs["temperature"] = request.temperature
         
-        result = await agent.process_message(
-            message=request.message,
-            context=context,
-            **kwargs
+        result = await cancel_on_disconnect(
+            http_request,
+            agent.process_message(
+                message=request.message,
+                context=context,
+                deadline=deadline,
+                **kwargs
+            )
         )
         
         # Save updated context to Redis
@@ -115,12 +124,20 @@ async def process_message(request: AgentProcessRequest):
                 provider=result["metadata"]["provider"],
                 usage=AgentUsageInfo(**result["metadata"]["usage"]),
                 personality=result["metadata"]["personality"],
-                context_length=result["metadata"]["context_length"]
+                context_length=result["metadata"]["context_length"],
+                cached=result["metadata"]["cached"]
             )
         )
         
     except HTTPException:
         raise
+    except LLMServiceUnavailableError as e:
+        logger.warning("message_processing_rejected", error=str(e))
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=e.headers
+        )
     except Exception as e:
         logger.error("message_processing_failed", error=str(e))
         raise HTTPException(
@@ -129,6 +146,88 @@ async def process_message(request: AgentProcessRequest):
         )
 
 
+@router.post(
+    "/process/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream message with agent",
+    description=(
+        "Send a message to an AI agent and stream the response as Server-Sent "
+        "Events. Emits `token` events followed by a final `done` event"
+    )
+)
+async def stream_message(request: AgentProcessRequest, http_request: Request):
+    """Stream a message response from an agent"""
+    deadline = request_deadline(http_request, request.timeout_seconds)
+    agent = agent_registry.get(request.agent_id)
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Agent '{request.agent_id}' not found"
+        )
+    
+    # Load or create context from Redis
+    context_id = request.context_id or "default"
+    context = await context_storage.load_context(request.agent_id, context_id)
+    
+    if not context:
+        context = agent.create_context(max_history=request.max_history)
+        logger.info(
+            "new_context_created",
+            agent_id=request.agent_id,
+            context_id=context_id
+        )
+    
+    kwargs = {}
+    if request.temperature is not None:
+        kwargs["temperature"] = request.temperature
+    
+    async def event_stream():
+        try:
+            async for event in agent.stream_message(
+                message=request.message,
+                context=context,
+                deadline=deadline,
+                **kwargs
+            ):
+                if event["type"] == "token":
+                    yield format_sse({"content": event["content"]}, event="token")
+                    continue
+                
+                # Only persist the context once the full response exists
+                await context_storage.save_context(
+                    request.agent_id,
+                    context_id,
+                    context
+                )
+                
+                result = event["response"]
+                response = AgentProcessResponse(
+                    agent_id=result["agent_id"],
+                    agent_name=result["agent_name"],
+                    role=result["role"],
+                    content=result["content"],
+                    timestamp=result["timestamp"],
+                    metadata=AgentMetadata(
+                        model=result["metadata"]["model"],
+                        provider=result["metadata"]["provider"],
+                        usage=AgentUsageInfo(**result["metadata"]["usage"]),
+                        personality=result["metadata"]["personality"],
+                        context_length=result["metadata"]["context_length"],
+                        cached=result["metadata"]["cached"]
+                    )
+                )
+                yield format_sse(response.model_dump(), event="done")
+        except Exception as e:
+            logger.error("message_streaming_failed", error=str(e))
+            yield format_sse({"message": "Failed to process message"}, event="error")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.delete(
     "/context/{agent_id}/{context_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -171,18 +270,32 @@ async def clear_all_contexts(agent_id: str = None):
     summary="Get agent contribution for Mission Control",
     description="Get an agent's expert contribution to a Mission Control objective"
 )
-async def get_agent_contribution(agent_id: str, request: dict):
+async def get_agent_contribution(agent_id: str, request: dict, http_request: Request):
     """Get agent contribution for Mission Control"""
     from app.services.mission_control_service import get_agent_contribution
     
+    deadline = request_deadline(http_request, request.get("timeout_seconds"))
     try:
-        contribution = await get_agent_contribution(
-            agent_id=agent_id,
-            objective=request.get("objective", ""),
-            context=request.get("context", {}),
-            analysis=request.get("analysis", {})
+        contribution = await cancel_on_disconnect(
+            http_request,
+            get_agent_contribution(
+                agent_id=agent_id,
+                objective=request.get("objective", ""),
+                context=request.get("context", {}),
+                analysis=request.get("analysis", {}),
+                deadline=deadline
+            )
         )
         return contribution
+    except HTTPException:
+        raise
+    except LLMServiceUnavailableError as e:
+        logger.warning("agent_contribution_rejected", agent_id=agent_id, error=str(e))
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=e.headers
+        )
     except Exception as e:
         logger.error("agent_contribution_failed", agent_id=agent_id, error=str(e))
         raise HTTPException(
@@ -6,6 +6,8 @@ from pydantic import BaseModel
 import structlog
 
 from app.config import settings
+from app.services.llm_service import llm_service
+from app.services.context_storage import context_storage
 
 logger = structlog.get_logger()
 
@@ -56,18 +58,29 @@ async def health_check():
 async def detailed_health_check():
     """Detailed health check endpoint with service status"""
     
+    provider_health = llm_service.get_provider_health()
+    
     services = {
         "api": "healthy",
-        "openai": "not_checked",
-        "anthropic": "not_checked",
+        **provider_health,
         "pinecone": "not_checked",
-        "redis": "not_checked"
+        "redis": "not_checked",
+        "circuit_breakers": (
+            llm_service.circuit_breakers.get_stats()
+            if llm_service.circuit_breakers else {}
+        ),
+        "context_storage": context_storage.get_stats()
     }
     
     # TODO: Add actual service health checks in future tasks
     
+    # Degraded while any provider is routing around an open circuit
+    overall = "healthy"
+    if any(state in ("degraded", "unavailable") for state in provider_health.values()):
+        overall = "degraded"
+    
     return DetailedHealthResponse(
-        status="healthy",
+        status=overall,
         timestamp=datetime.utcnow().isoformat(),
         environment=settings.environment,
         version="0.1.0",
@@ -0,0 +1,104 @@
+"""Background job API endpoints"""
+
+from typing import Any, Dict
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+import structlog
+
+from app.models.job_models import JOB_PAYLOADS, JobInfo, JobSubmitRequest
+from app.services.call_context import current_tenant_id
+from app.services.job_queue import job_queue
+from app.utils.streaming import format_sse, SSE_HEADERS
+
+logger = structlog.get_logger()
+
+router = APIRouter()
+
+
+def _require_queue():
+    """Reject job requests while Redis is unavailable"""
+    if not job_queue.active:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue is unavailable"
+        )
+
+
+async def _get_job(job_id: str) -> Dict[str, Any]:
+    """Load a job visible to the calling tenant"""
+    job = await job_queue.get(job_id)
+    tenant_id = current_tenant_id.get()
+    if not job or (tenant_id and job["tenant_id"] not in (None, tenant_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found"
+        )
+    return job
+
+
+@router.post(
+    "/",
+    response_model=JobInfo,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit background job",
+    description=(
+        "Queue long-running generation (mission synthesis, Lumi documents, "
+        "Lexi bulk insights) for the job workers. Poll or stream the job by id"
+    )
+)
+async def submit_job(request: JobSubmitRequest):
+    """Submit a background job"""
+    _require_queue()
+    try:
+        payload = JOB_PAYLOADS[request.type](**request.payload)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False)
+        )
+
+    job = await job_queue.submit(request.type, payload.model_dump(), current_tenant_id.get())
+    return JobInfo(**job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobInfo,
+    status_code=status.HTTP_200_OK,
+    summary="Get background job",
+    description="Get a job's status, progress and result"
+)
+async def get_job(job_id: str):
+    """Get a background job"""
+    _require_queue()
+    return JobInfo(**await _get_job(job_id))
+
+
+@router.get(
+    "/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream background job",
+    description=(
+        "Stream a job's state as Server-Sent Events. Emits a `status` event "
+        "whenever the job changes, ending with its completed or failed state"
+    )
+)
+async def stream_job(job_id: str):
+    """Stream background job updates"""
+    _require_queue()
+    await _get_job(job_id)
+
+    async def event_stream():
+        try:
+            async for job in job_queue.watch(job_id):
+                yield format_sse(JobInfo(**job).model_dump(mode="json"), event="status")
+        except Exception as e:
+            logger.error("job_stream_failed", job_id=job_id, error=str(e))
+            yield format_sse({"message": "Failed to stream job"}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,20 +1,90 @@
 """LLM API endpoints"""
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Any, Dict, Optional
+import json
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 import structlog
 
+from app.config import settings
 from app.models.llm_models import (
+    BatchCompletionRequest,
+    BatchCompletionResponse,
+    BatchItemError,
+    BatchItemResult,
     CompletionRequest,
     CompletionResponse,
-    CostStats
+    CostStats,
+    SemanticCacheFeedback,
+    ServiceMetrics,
+    TenantUsage
 )
 from app.services.llm_service import llm_service, LLMProvider
+from app.services.errors import LLMServiceUnavailableError
+from app.utils.deadlines import cancel_on_disconnect, request_deadline
+from app.utils.streaming import format_sse, SSE_HEADERS
 
 logger = structlog.get_logger()
 
 router = APIRouter()
 
 
+def _auto_continue(request: CompletionRequest) -> bool:
+    """Continue truncated completions unless the caller capped max_tokens themselves"""
+    if request.auto_continue is not None:
+        return request.auto_continue
+    return request.max_tokens is None
+
+
+def _completion_kwargs(
+    request: CompletionRequest,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Translate a completion request into ``generate_completion`` arguments
+    
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    return {
+        "messages": [msg.model_dump() for msg in request.messages],
+        "provider": LLMProvider(request.provider.lower()),
+        "fallback": request.fallback,
+        "model": request.model,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "use_cache": request.use_cache,
+        "deadline": deadline,
+        "auto_continue": _auto_continue(request)
+    }
+
+
+
+def _batch_item_result(index: int, outcome: Any) -> BatchItemResult:
+    """Wrap a batch item's completion or exception in a result"""
+    if not isinstance(outcome, Exception):
+        return BatchItemResult(
+            index=index,
+            success=True,
+            completion=CompletionResponse(**outcome)
+        )
+    
+    if isinstance(outcome, LLMServiceUnavailableError):
+        error = BatchItemError(status_code=outcome.status_code, message=str(outcome))
+    elif isinstance(outcome, HTTPException):
+        error = BatchItemError(status_code=outcome.status_code, message=str(outcome.detail))
+    elif isinstance(outcome, ValueError):
+        error = BatchItemError(status_code=status.HTTP_400_BAD_REQUEST, message=str(outcome))
+    else:
+        logger.error("batch_item_failed", index=index, error=str(outcome))
+        error = BatchItemError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            message="Failed to generate completion"
+        )
+    return BatchItemResult(index=index, success=False, error=error)
+
+
 @router.post(
     "/completions",
     response_model=CompletionResponse,
@@ -22,27 +92,26 @@ router = APIRouter()
     summary="Generate LLM completion",
     description="Generate text completion using OpenAI or Anthropic with automatic fallback"
 )
-async def create_completion(request: CompletionRequest):
+async def create_completion(request: CompletionRequest, http_request: Request):
     """Generate completion from LLM"""
+    deadline = request_deadline(http_request, request.timeout_seconds)
     try:
-        # Convert Pydantic messages to dict format
-        messages = [msg.model_dump() for msg in request.messages]
-        
-        # Determine provider
-        provider = LLMProvider(request.provider.lower())
-        
-        # Generate completion
-        result = await llm_service.generate_completion(
-            messages=messages,
-            provider=provider,
-            fallback=request.fallback,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
+        result = await cancel_on_disconnect(
+            http_request,
+            llm_service.generate_completion(**_completion_kwargs(request, deadline))
         )
         
         return CompletionResponse(**result)
         
+    except HTTPException:
+        raise
+    except LLMServiceUnavailableError as e:
+        logger.warning("completion_rejected", error=str(e))
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=e.headers
+        )
     except ValueError as e:
         logger.error("invalid_request", error=str(e))
         raise HTTPException(
@@ -57,6 +126,124 @@ async def create_completion(request: CompletionRequest):
         )
 
 
+@router.post(
+    "/completions/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream LLM completion",
+    description=(
+        "Stream completion tokens as Server-Sent Events. Emits `token` events "
+        "followed by a final `done` event with the full completion"
+    )
+)
+async def stream_completion(request: CompletionRequest, http_request: Request):
+    """Stream completion from LLM"""
+    deadline = request_deadline(http_request, request.timeout_seconds)
+    try:
+        messages = [msg.model_dump() for msg in request.messages]
+        provider = LLMProvider(request.provider.lower())
+    except ValueError as e:
+        logger.error("invalid_request", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    async def event_stream():
+        try:
+            async for event in llm_service.stream_completion(
+                messages=messages,
+                provider=provider,
+                fallback=request.fallback,
+                use_cache=request.use_cache,
+                model=request.model,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                deadline=deadline,
+                auto_continue=_auto_continue(request)
+            ):
+                if event["type"] == "token":
+                    yield format_sse({"content": event["content"]}, event="token")
+                else:
+                    completion = CompletionResponse(**event["completion"])
+                    yield format_sse(completion.model_dump(), event="done")
+        except Exception as e:
+            logger.error("completion_stream_failed", error=str(e))
+            yield format_sse({"message": "Failed to generate completion"}, event="error")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post(
+    "/completions/batch",
+    response_model=BatchCompletionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Generate LLM completions in batch",
+    description=(
+        "Run many completions with bounded parallelism. Returns results in "
+        "request order, or with `stream` set, one NDJSON line per result as "
+        "each completion finishes. Failures are reported per item"
+    )
+)
+async def create_completion_batch(request: BatchCompletionRequest, http_request: Request):
+    """Generate a batch of completions from LLM"""
+    if len(request.requests) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds the limit of {settings.batch_max_items} requests"
+        )
+    
+    max_concurrency = min(
+        request.max_concurrency or settings.batch_max_concurrency,
+        settings.batch_max_concurrency
+    )
+    
+    # Invalid items fail on their own instead of rejecting the whole batch
+    items = []
+    invalid: Dict[int, Exception] = {}
+    for index, item in enumerate(request.requests):
+        try:
+            deadline = request_deadline(http_request, item.timeout_seconds)
+            items.append((index, _completion_kwargs(item, deadline)))
+        except (HTTPException, ValueError) as e:
+            invalid[index] = e
+    
+    async def results():
+        for index, error in invalid.items():
+            yield _batch_item_result(index, error)
+        positions = [index for index, _ in items]
+        async for position, outcome in llm_service.generate_batch(
+            [kwargs for _, kwargs in items],
+            max_concurrency
+        ):
+            yield _batch_item_result(positions[position], outcome)
+    
+    logger.info(
+        "completion_batch_started",
+        items=len(request.requests),
+        max_concurrency=max_concurrency,
+        stream=request.stream
+    )
+    
+    if request.stream:
+        async def ndjson_stream():
+            async for result in results():
+                yield json.dumps(result.model_dump(mode="json")) + "\n"
+        
+        return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+    
+    ordered = sorted([result async for result in results()], key=lambda r: r.index)
+    succeeded = sum(1 for result in ordered if result.success)
+    return BatchCompletionResponse(
+        results=ordered,
+        succeeded=succeeded,
+        failed=len(ordered) - succeeded
+    )
+
+
 @router.get(
     "/costs",
     response_model=CostStats,
@@ -66,7 +253,7 @@ async def create_completion(request: CompletionRequest):
 )
 async def get_cost_stats():
     """Get cost tracking statistics"""
-    stats = llm_service.get_cost_stats()
+    stats = await llm_service.get_cost_stats()
     
     if stats is None:
         raise HTTPException(
@@ -75,3 +262,60 @@ async def get_cost_stats():
         )
     
     return CostStats(**stats)
+
+
+@router.get(
+    "/costs/tenants/{tenant_id}",
+    response_model=TenantUsage,
+    status_code=status.HTTP_200_OK,
+    summary="Get tenant budget usage",
+    description="Retrieve a tenant's LLM spend in the current budget period across all workers"
+)
+async def get_tenant_usage(tenant_id: str):
+    """Get a tenant's spend against its budget"""
+    usage = await llm_service.get_tenant_usage(tenant_id)
+    
+    if usage is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Shared cost accounting is not available"
+        )
+    
+    return TenantUsage(**usage)
+
+
+@router.get(
+    "/metrics",
+    response_model=ServiceMetrics,
+    status_code=status.HTTP_200_OK,
+    summary="Get service metrics",
+    description="Retrieve cache hit rates and other LLM service performance metrics"
+)
+async def get_metrics():
+    """Get LLM service performance metrics"""
+    return ServiceMetrics(**llm_service.get_metrics())
+
+
+@router.post(
+    "/semantic-cache/feedback",
+    status_code=status.HTTP_200_OK,
+    summary="Report a semantic cache false hit",
+    description="Report a semantic cache hit whose answer did not fit the prompt; the entry is evicted"
+)
+async def report_semantic_cache_false_hit(request: SemanticCacheFeedback):
+    """Record a semantic cache false hit"""
+    if not llm_service.semantic_cache:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic cache is not enabled"
+        )
+    
+    try:
+        await llm_service.semantic_cache.report_false_hit(request.cache_entry_id)
+        return {"reported": True, "cache_entry_id": request.cache_entry_id}
+    except Exception as e:
+        logger.error("semantic_cache_feedback_failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to record feedback"
+        )
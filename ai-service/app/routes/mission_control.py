@@ -4,16 +4,18 @@ Mission Control API Routes
 Handles AI orchestration for Mission Control feature
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
 
+from app.services.errors import LLMServiceUnavailableError
 from app.services.mission_control_service import (
     analyze_objective,
     get_agent_contribution,
     synthesize_mission_results
 )
+from app.utils.deadlines import cancel_on_disconnect, request_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +25,14 @@ router = APIRouter(prefix="/api/mission-control", tags=["mission-control"])
 class AnalyzeObjectiveRequest(BaseModel):
     objective: str
     context: Optional[Dict[str, Any]] = None
+    timeout_seconds: Optional[float] = None
 
 
 class AgentContributionRequest(BaseModel):
     objective: str
     context: Optional[Dict[str, Any]] = None
     analysis: Optional[Dict[str, Any]] = None
+    timeout_seconds: Optional[float] = None
 
 
 class SynthesizeRequest(BaseModel):
@@ -36,37 +40,58 @@ class SynthesizeRequest(BaseModel):
     context: Optional[Dict[str, Any]] = None
     analysis: Optional[Dict[str, Any]] = None
     contributions: List[Dict[str, Any]]
+    timeout_seconds: Optional[float] = None
 
 
 @router.post("/analyze")
-async def analyze_mission_objective(request: AnalyzeObjectiveRequest):
+async def analyze_mission_objective(request: AnalyzeObjectiveRequest, http_request: Request):
     """
     Analyze a mission objective to determine scope, complexity, and requirements
     """
+    deadline = request_deadline(http_request, request.timeout_seconds)
     try:
-        result = await analyze_objective(
-            objective=request.objective,
-            context=request.context or {}
+        result = await cancel_on_disconnect(
+            http_request,
+            analyze_objective(
+                objective=request.objective,
+                context=request.context or {},
+                deadline=deadline
+            )
         )
         return result
+    except HTTPException:
+        raise
+    except LLMServiceUnavailableError as e:
+        logger.warning(f"Objective analysis rejected: {str(e)}")
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         logger.error(f"Error analyzing objective: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/synthesize")
-async def synthesize_mission(request: SynthesizeRequest):
+async def synthesize_mission(request: SynthesizeRequest, http_request: Request):
     """
     Synthesize agent contributions into a comprehensive mission plan
     """
+    deadline = request_deadline(http_request, request.timeout_seconds)
     try:
-        result = await synthesize_mission_results(
-            objective=request.objective,
-            context=request.context or {},
-            analysis=request.analysis or {},
-            contributions=request.contributions
+        result = await cancel_on_disconnect(
+            http_request,
+            synthesize_mission_results(
+                objective=request.objective,
+                context=request.context or {},
+                analysis=request.analysis or {},
+                contributions=request.contributions,
+                deadline=deadline
+            )
         )
         return result
+    except HTTPException:
+        raise
+    except LLMServiceUnavailableError as e:
+        logger.warning(f"Mission synthesis rejected: {str(e)}")
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         logger.error(f"Error synthesizing mission results: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,28 @@
+"""Per-call context shared across the LLM pipeline
+
+The completion pipeline fans out into cache lookups, coalesced tasks,
+hedges and fallbacks. Values that describe the originating call (rather
+than the provider request) travel in context variables, which asyncio
+copies into every task the call spawns.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+import time
+
+# Agent the current LLM call is made for, used to attribute cost
+current_agent_id: ContextVar[Optional[str]] = ContextVar("current_agent_id", default=None)
+
+# Tenant (customer account) the current call is billed to, from the X-Tenant-ID header
+current_tenant_id: ContextVar[Optional[str]] = ContextVar("current_tenant_id", default=None)
+
+# Absolute deadline of the originating request, in ``time.monotonic()`` seconds
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current call's deadline, or None without one"""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
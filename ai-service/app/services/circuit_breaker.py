@@ -0,0 +1,196 @@
+"""Per-provider, per-model circuit breakers for LLM calls"""
+
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Any, Tuple
+import time
+import structlog
+
+from app.services.errors import CircuitOpenError
+
+logger = structlog.get_logger()
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a rolling window of call outcomes
+
+    - CLOSED: calls flow; the breaker trips when the failure rate or the
+      slow-call rate over the window crosses its threshold
+    - OPEN: calls are rejected immediately until the cool-down elapses
+    - HALF_OPEN: a limited number of probe calls are let through; a
+      successful probe closes the circuit, a failed one re-opens it
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int,
+        min_calls: int,
+        failure_rate_threshold: float,
+        slow_call_seconds: float,
+        slow_call_rate_threshold: float,
+        cooldown_seconds: float,
+        half_open_max_probes: int
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_probes = half_open_max_probes
+
+        self.state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+
+    def before_call(self):
+        """
+        Reserve permission for a call
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probes are taken
+        """
+        if self.state == CircuitState.OPEN:
+            remaining = self._opened_at + self.cooldown_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Circuit open for {self.name}",
+                    retry_after=remaining
+                )
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_probes:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Circuit half-open for {self.name}, probe in progress",
+                    retry_after=self.cooldown_seconds
+                )
+            self._probes_in_flight += 1
+
+    def record_success(self, latency: float):
+        """Record a successful call"""
+        self._latencies.append(latency)
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._outcomes.clear()
+            self._transition(CircuitState.CLOSED)
+            return
+
+        self._outcomes.append((False, latency >= self.slow_call_seconds))
+        self._evaluate()
+
+    def record_failure(self):
+        """Record a failed call"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._open()
+            return
+
+        self._outcomes.append((True, False))
+        self._evaluate()
+
+    def release(self):
+        """Release a reserved call that neither succeeded nor failed (cancelled)"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _evaluate(self):
+        """Trip the breaker if the window crosses a threshold"""
+        if self.state != CircuitState.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+
+        calls = len(self._outcomes)
+        failure_rate = sum(1 for failed, _ in self._outcomes if failed) / calls
+        slow_rate = sum(1 for _, slow in self._outcomes if slow) / calls
+
+        if (failure_rate >= self.failure_rate_threshold
+                or slow_rate >= self.slow_call_rate_threshold):
+            logger.warning(
+                "circuit_breaker_tripped",
+                circuit=self.name,
+                failure_rate=round(failure_rate, 3),
+                slow_call_rate=round(slow_rate, 3)
+            )
+            self._open()
+
+    def _open(self):
+        """Open the circuit and start the cool-down"""
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState):
+        """Move to a new state"""
+        if state != self.state:
+            logger.info(
+                "circuit_breaker_state_changed",
+                circuit=self.name,
+                from_state=self.state.value,
+                to_state=state.value
+            )
+            self.state = state
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and window statistics"""
+        calls = len(self._outcomes)
+        latencies = sorted(self._latencies)
+        return {
+            "state": self.state.value,
+            "window_calls": calls,
+            "failure_rate": (
+                round(sum(1 for failed, _ in self._outcomes if failed) / calls, 4)
+                if calls else 0.0
+            ),
+            "p95_latency_ms": (
+                round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2)
+                if latencies else None
+            ),
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by provider and model"""
+
+    def __init__(self, **breaker_options):
+        self._breaker_options = breaker_options
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a provider and model"""
+        key = (provider, model)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(name=f"{provider}:{model}", **self._breaker_options)
+            self._breakers[key] = breaker
+        return breaker
+
+    def provider_health(self, provider: str) -> str:
+        """Summarize a provider's breakers as healthy, degraded or unavailable"""
+        states = [
+            breaker.state for (name, _), breaker in self._breakers.items()
+            if name == provider
+        ]
+        if not states or all(state == CircuitState.CLOSED for state in states):
+            return "healthy"
+        if all(state == CircuitState.OPEN for state in states):
+            return "unavailable"
+        return "degraded"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics for every breaker"""
+        return {breaker.name: breaker.get_stats() for breaker in self._breakers.values()}
@@ -0,0 +1,141 @@
+"""Exact-match response cache for LLM completions"""
+
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+import copy
+import hashlib
+import json
+import time
+import structlog
+
+from app.config import settings
+from app.services.redis_client import redis_manager
+
+logger = structlog.get_logger()
+
+
+class CompletionCache:
+    """
+    Two-tier exact-match completion cache
+
+    Tiers:
+    - In-process LRU (fastest, per worker)
+    - Redis with TTL (shared across workers and replicas)
+
+    Keys are a canonical hash of the messages and every parameter that
+    changes the output (provider, model, temperature, max_tokens).
+    """
+
+    KEY_PREFIX = "llm:cache:"
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """Build a canonical cache key for a completion request"""
+        canonical = json.dumps(
+            {
+                "messages": [
+                    {"role": msg["role"], "content": msg["content"]}
+                    for msg in messages
+                ],
+                "provider": provider,
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_cacheable(temperature: Optional[float]) -> bool:
+        """
+        Only near-deterministic completions are repeatable enough to cache
+
+        Sampled calls must not replay one answer to every identical prompt,
+        so the default threshold sits below the agents' chat temperatures.
+        """
+        return (
+            temperature is not None
+            and temperature <= settings.completion_cache_max_temperature
+        )
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Look up a cached completion
+
+        Returns:
+            Tuple of (completion, tier) on a hit, None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(result), "memory"
+            del self._entries[key]
+
+        client = redis_manager.client
+        if client:
+            try:
+                data = await client.get(self.KEY_PREFIX + key)
+                if data:
+                    result = json.loads(data)
+                    self._store_local(key, result)
+                    self.redis_hits += 1
+                    return copy.deepcopy(result), "redis"
+            except Exception as e:
+                logger.warning("completion_cache_read_failed", error=str(e))
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        """Store a completion in both cache tiers"""
+        self._store_local(key, copy.deepcopy(result))
+
+        client = redis_manager.client
+        if client:
+            try:
+                await client.setex(
+                    self.KEY_PREFIX + key,
+                    self.ttl_seconds,
+                    json.dumps(result)
+                )
+            except Exception as e:
+                logger.warning("completion_cache_write_failed", error=str(e))
+
+    def _store_local(self, key: str, result: Dict[str, Any]):
+        """Insert into the in-process LRU, evicting the oldest entries"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit statistics"""
+        hits = self.memory_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
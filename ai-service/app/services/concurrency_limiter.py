@@ -0,0 +1,193 @@
+"""Adaptive per-provider concurrency limits with a bounded wait queue"""
+
+from collections import deque
+from typing import Deque, Dict, Any
+import asyncio
+import time
+import structlog
+
+from app.services.errors import ConcurrencyLimitExceededError
+
+logger = structlog.get_logger()
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for one provider
+
+    Calls beyond the current limit wait in a bounded FIFO queue. When the
+    queue is full, or a caller has waited longer than the queue timeout,
+    the call is rejected immediately instead of piling up coroutines.
+
+    The limit adapts to provider behaviour:
+    - additive increase: each fast, successful call raises it by 1/limit
+      (about +1 per round of calls)
+    - multiplicative decrease: failures and calls slower than the latency
+      threshold multiply it by the backoff ratio
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        backoff_ratio: float,
+        latency_threshold: float
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_latency = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_queue_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for a slot"""
+        return len(self._waiters)
+
+    async def acquire(self):
+        """
+        Wait for a concurrency slot
+
+        Raises:
+            ConcurrencyLimitExceededError: If the queue is full or the wait times out
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                "llm_concurrency_rejected",
+                provider=self.name,
+                limit=int(self.limit),
+                queue_depth=len(self._waiters)
+            )
+            raise ConcurrencyLimitExceededError(
+                f"Too many concurrent requests for {self.name}",
+                retry_after=self._retry_after()
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        start_time = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self.total_queue_wait += time.monotonic() - start_time
+            raise ConcurrencyLimitExceededError(
+                f"Timed out waiting for a {self.name} request slot",
+                retry_after=self._retry_after()
+            )
+        except asyncio.CancelledError:
+            # A slot granted just before cancellation must be handed on
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self.admitted += 1
+        self.total_queue_wait += time.monotonic() - start_time
+
+    def release(self, latency: float, overloaded: bool):
+        """
+        Release a slot and adapt the limit
+
+        Args:
+            latency: Duration of the call in seconds
+            overloaded: Whether the call failed in a way that signals overload
+        """
+        self.in_flight -= 1
+        self._avg_latency = (
+            latency if not self._avg_latency
+            else 0.9 * self._avg_latency + 0.1 * latency
+        )
+
+        if overloaded or latency >= self.latency_threshold:
+            new_limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            if int(new_limit) < int(self.limit):
+                logger.info(
+                    "llm_concurrency_limit_decreased",
+                    provider=self.name,
+                    limit=int(new_limit)
+                )
+            self.limit = new_limit
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake()
+
+    def cancel(self):
+        """Release a slot whose call was abandoned, without adapting the limit"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        """Hand free slots to queued callers in arrival order"""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _retry_after(self) -> float:
+        """Suggested client back-off: about one average call duration"""
+        return max(1.0, self._avg_latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limit, queue and rejection statistics"""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_queue_wait_ms": (
+                round(self.total_queue_wait / self.queued * 1000, 2) if self.queued else 0.0
+            )
+        }
+
+
+class ConcurrencyLimiterRegistry:
+    """Adaptive concurrency limiters keyed by provider"""
+
+    def __init__(self, **limiter_options):
+        self._limiter_options = limiter_options
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    def get(self, provider: str) -> AdaptiveConcurrencyLimiter:
+        """Get (or create) the limiter for a provider"""
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(name=provider, **self._limiter_options)
+            self._limiters[provider] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics for every limiter"""
+        return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
@@ -0,0 +1,82 @@
+"""In-process LRU of hot conversation contexts"""
+
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+import time
+
+from app.agents.base_agent import ConversationContext
+
+
+class ContextCache:
+    """
+    LRU of recently loaded and saved contexts, in front of Redis
+
+    Active chats load a context and save it back on every message, so
+    serving the load from memory skips a Redis round trip and a decode.
+    Entries are private snapshots: ``get`` and ``put`` copy, so callers
+    may mutate the contexts they hold.
+
+    ``ContextStorageService`` keeps the cache coherent across replicas by
+    invalidating keys that other instances write. ``generation`` advances
+    on every invalidation, so a read that raced with one is not cached.
+    Entries also expire after ``ttl_seconds`` to bound the staleness of
+    any invalidation that is missed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, ConversationContext]]" = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[ConversationContext]:
+        """Copy of a cached context, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, context = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return context.copy()
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, context: ConversationContext, generation: int):
+        """
+        Cache a copy of a context read or written at ``generation``
+
+        Skipped if an invalidation arrived since, because the context may
+        already be stale.
+        """
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, context.copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """Drop a context that changed elsewhere"""
+        self._entries.pop(key, None)
+        self.generation += 1
+        self.invalidations += 1
+
+    def clear(self):
+        """Drop every context, e.g. when invalidations may have been missed"""
+        self._entries.clear()
+        self.generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
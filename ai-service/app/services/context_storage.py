@@ -1,18 +1,41 @@
 """Production-ready conversation context storage service using Redis"""
 
-import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import timedelta
+import asyncio
+import uuid
 import structlog
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from app.config import settings
 from app.agents.base_agent import ConversationContext
+from app.agents.agent_registry import agent_registry
+from app.services.context_cache import ContextCache
+from app.services.context_write_behind import ContextWriteBehind
+from app.utils.serialization import encode_value, decode_value
 
 logger = structlog.get_logger()
 
 
+# Reads a whole context in one round trip: the message window from the list
+# and the metadata hash, or the JSON blob of a context saved before the list
+# layout (migrated on its next save)
+LOAD_CONTEXT_SCRIPT = """
+if redis.call('TYPE', KEYS[1])['ok'] == 'string' then
+    return {'blob', redis.call('GET', KEYS[1])}
+end
+local meta = redis.call('HGETALL', KEYS[2])
+if #meta == 0 then
+    return nil
+end
+return {'list', meta, redis.call('LRANGE', KEYS[1], 0, -1)}
+"""
+
+# Pub/sub channel announcing context writes, as "<instance id> <key>"
+INVALIDATION_CHANNEL = "context_invalidations"
+
+
 class ContextStorageService:
     """
     Production-ready context storage using Redis
@@ -23,12 +46,51 @@ class ContextStorageService:
     - Efficient serialization/deserialization
     - Connection pooling
     - Error handling and fallback
+    
+    Each context is a Redis list of its conversation messages, already
+    trimmed to ``max_history``, plus a hash holding metadata,
+    ``max_history``, a revision counter and the system messages, with an
+    agent's own system prompt kept as a reference rather than a copy. A
+    turn appends only its new messages, so saving costs the same at any
+    history length. Values are versioned msgpack, zstd-compressed when
+    large; JSON written by earlier releases still loads.
+    
+    Hot contexts are also kept in an in-process LRU. Every write publishes
+    the key on ``INVALIDATION_CHANNEL`` with this instance's id, and each
+    instance evicts keys written by the others. The cache is bypassed
+    while the invalidation subscription is down.
+    
+    With ``context_write_mode`` set to ``batched`` or ``async``, saves go
+    through a write-behind queue (``ContextWriteBehind``) that is drained
+    at shutdown.
     """
     
     def __init__(self):
         self._redis: Optional[Redis] = None
+        self._load_script = None
         self._default_ttl = timedelta(hours=24)  # Contexts expire after 24 hours
-        logger.info("context_storage_service_initialized")
+        self._instance_id = uuid.uuid4().hex
+        self._cache: Optional[ContextCache] = None
+        if settings.enable_context_cache:
+            self._cache = ContextCache(
+                max_entries=settings.context_cache_max_entries,
+                ttl_seconds=settings.context_cache_ttl_seconds
+            )
+        self._cache_coherent = False
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self._write_behind: Optional[ContextWriteBehind] = None
+        if settings.context_write_mode != "sync":
+            self._write_behind = ContextWriteBehind(
+                self,
+                mode=settings.context_write_mode,
+                flush_interval=settings.context_flush_interval_ms / 1000,
+                batch_size=settings.context_flush_batch_size,
+                max_pending=settings.context_write_max_pending
+            )
+        logger.info(
+            "context_storage_service_initialized",
+            write_mode=settings.context_write_mode
+        )
     
     async def connect(self):
         """Initialize Redis connection pool"""
@@ -36,7 +98,8 @@ class ContextStorageService:
             self._redis = await redis.from_url(
                 settings.redis_url,
                 encoding="utf-8",
-                decode_responses=True,
+                # Stored values are msgpack, so responses stay bytes
+                decode_responses=False,
                 max_connections=10
             )
             # Test connection
@@ -45,34 +108,310 @@ class ContextStorageService:
         except Exception as e:
             logger.error("redis_connection_failed", error=str(e))
             raise
+        
+        if self._cache:
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+        if self._write_behind:
+            self._write_behind.start()
+    
+    async def drain(self):
+        """Flush queued write-behind saves; later saves are written inline"""
+        if self._write_behind:
+            await self._write_behind.stop(settings.context_drain_timeout_seconds)
     
     async def disconnect(self):
         """Close Redis connection"""
+        await self.drain()
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            await asyncio.gather(self._invalidation_task, return_exceptions=True)
+            self._invalidation_task = None
         if self._redis:
             await self._redis.close()
             logger.info("redis_disconnected")
     
+    async def _listen_for_invalidations(self):
+        """Evict cached contexts that other instances write, resubscribing on failure"""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Writes made while unsubscribed were never seen
+                        self._cache.clear()
+                        self._cache_coherent = True
+                        logger.info("context_cache_invalidation_subscribed")
+                    elif message["type"] == "message":
+                        instance_id, _, key = message["data"].decode().partition(" ")
+                        if instance_id != self._instance_id:
+                            self._cache.invalidate(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("context_cache_invalidation_failed", error=str(e))
+            finally:
+                self._cache_coherent = False
+                await pubsub.aclose()
+            await asyncio.sleep(1)
+    
+    def _invalidation(self, key: str) -> str:
+        """Invalidation message announcing a write to ``key``"""
+        return f"{self._instance_id} {key}"
+    
     def _get_key(self, agent_id: str, context_id: str) -> str:
-        """Generate Redis key for context"""
+        """Generate Redis key for context messages"""
         return f"context:{agent_id}:{context_id}"
     
-    def _serialize_context(self, context: ConversationContext) -> str:
-        """Serialize context to JSON string"""
-        data = {
-            "messages": context.messages,
-            "metadata": context.metadata,
+    def _get_meta_key(self, agent_id: str, context_id: str) -> str:
+        """Generate Redis key for context metadata"""
+        return f"context_meta:{agent_id}:{context_id}"
+    
+    def _script(self):
+        """Load script registered with the current client"""
+        if self._load_script is None or self._load_script.registered_client is not self._redis:
+            self._load_script = self._redis.register_script(LOAD_CONTEXT_SCRIPT)
+        return self._load_script
+    
+    def _serialize_message(self, message: Dict[str, str]) -> bytes:
+        """Serialize one message to versioned msgpack"""
+        return encode_value(message)
+    
+    def _prompt_reference(
+        self,
+        agent_id: str,
+        system_msgs: List[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        """Reference to the agent's system prompt, if it is the context's only system message"""
+        agent = agent_registry.get(agent_id)
+        if not agent or len(system_msgs) != 1 or system_msgs[0]["content"] != agent.system_prompt:
+            return None
+        return {
+            "agent_id": agent_id,
+            "version": agent.prompt_version,
+            "timestamp": system_msgs[0].get("timestamp")
+        }
+    
+    def _rehydrate_prompt(
+        self,
+        reference: Dict[str, Any],
+        context_id: str
+    ) -> tuple[List[Dict[str, str]], bool]:
+        """
+        System messages for a stored prompt reference
+        
+        The agent's current prompt is used even if the context was started
+        with an earlier version, so prompt updates reach existing contexts.
+        
+        Returns:
+            Tuple of (system messages, whether the prompt version changed)
+        """
+        agent = agent_registry.get(reference["agent_id"])
+        if not agent:
+            logger.warning(
+                "context_prompt_agent_missing",
+                agent_id=reference["agent_id"],
+                context_id=context_id
+            )
+            return [], False
+        
+        version_changed = reference.get("version") != agent.prompt_version
+        if version_changed:
+            logger.info(
+                "context_prompt_version_changed",
+                agent_id=reference["agent_id"],
+                context_id=context_id,
+                stored_version=reference.get("version"),
+                current_version=agent.prompt_version
+            )
+        system_msg = {
+            "role": "system",
+            "content": agent.system_prompt,
+            "timestamp": reference.get("timestamp")
+        }
+        return [system_msg], version_changed
+    
+    def _serialize_meta(
+        self,
+        agent_id: str,
+        context: ConversationContext,
+        include_system: bool
+    ) -> Dict[str, Any]:
+        """
+        Serialize the metadata hash fields of a context
+        
+        An agent's system prompt is stored as a ``prompt`` reference
+        instead of a copy, so the prompt text is not repeated in every
+        context. Other system messages are stored in full as ``system``.
+        """
+        fields = {
+            "metadata": encode_value(context.metadata),
             "max_history": context.max_history
         }
-        return json.dumps(data)
+        if include_system:
+            system_msgs = [msg for msg in context.messages if msg["role"] == "system"]
+            reference = self._prompt_reference(agent_id, system_msgs)
+            if reference:
+                fields["prompt"] = encode_value(reference)
+            else:
+                fields["system"] = encode_value(system_msgs)
+        return fields
+    
+    def _deserialize_context(
+        self,
+        context_id: str,
+        meta: Dict[str, bytes],
+        messages: List[bytes]
+    ) -> ConversationContext:
+        """
+        Deserialize context from its metadata hash and message list
+        
+        Values may be versioned msgpack or JSON written by earlier releases.
+        """
+        context = ConversationContext(max_history=int(meta.get("max_history", 10)))
+        context.revision = int(meta.get("revision", 0))
+        version_changed = False
+        if meta.get("prompt"):
+            system_msgs, version_changed = self._rehydrate_prompt(
+                decode_value(meta["prompt"]), context_id
+            )
+        else:
+            system = meta.get("system")
+            system_msgs = decode_value(system) if system else []
+        context.messages = system_msgs + [decode_value(message) for message in messages]
+        metadata = meta.get("metadata")
+        context.metadata = decode_value(metadata) if metadata else {}
+        context.mark_saved()
+        if version_changed:
+            # The next save records the current prompt version
+            context.unsaved_messages.extend(system_msgs)
+        return context
     
-    def _deserialize_context(self, data: str) -> ConversationContext:
-        """Deserialize context from JSON string"""
-        parsed = json.loads(data)
+    def _deserialize_legacy_context(self, data: bytes) -> ConversationContext:
+        """Deserialize context from a JSON blob saved before the list layout"""
+        parsed = decode_value(data)
         context = ConversationContext(max_history=parsed.get("max_history", 10))
         context.messages = parsed.get("messages", [])
         context.metadata = parsed.get("metadata", {})
+        # needs_rewrite stays set, so the next save migrates it to the list layout
         return context
     
+    def _queue_save(
+        self,
+        pipe: Any,
+        agent_id: str,
+        context_id: str,
+        context: ConversationContext,
+        ttl_seconds: int
+    ) -> tuple[int, int]:
+        """
+        Add the commands that save one context to a pipeline
+        
+        Returns:
+            Tuple of (index of the revision reply, messages appended)
+        """
+        key = self._get_key(agent_id, context_id)
+        meta_key = self._get_meta_key(agent_id, context_id)
+        
+        rewrite = context.needs_rewrite
+        new_messages = context.messages if rewrite else context.unsaved_messages
+        appended = [
+            self._serialize_message(msg) for msg in new_messages if msg["role"] != "system"
+        ]
+        system_changed = rewrite or any(
+            msg["role"] == "system" for msg in context.unsaved_messages
+        )
+        
+        meta = self._serialize_meta(agent_id, context, system_changed)
+        if rewrite:
+            pipe.delete(key, meta_key)
+        elif system_changed:
+            # Drop whichever of the prompt reference or copy is stale
+            pipe.hdel(meta_key, "system" if "prompt" in meta else "prompt")
+        pipe.hset(meta_key, mapping=meta)
+        if appended:
+            pipe.rpush(key, *appended)
+            pipe.ltrim(key, -context.max_history, -1)
+        revision_index = len(pipe)
+        pipe.hincrby(meta_key, "revision", 1)
+        pipe.expire(key, ttl_seconds)
+        pipe.expire(meta_key, ttl_seconds)
+        pipe.publish(INVALIDATION_CHANNEL, self._invalidation(key))
+        return revision_index, len(appended)
+    
+    async def _write_contexts(
+        self,
+        saves: List[tuple[str, str, ConversationContext, int]]
+    ) -> List[bool]:
+        """
+        Save contexts in one atomic, pipelined round trip
+        
+        Each saved context is marked saved and, if no other write to its
+        key happened since it was loaded, cached.
+        
+        Args:
+            saves: Tuples of (agent_id, context_id, context, ttl_seconds)
+        
+        Returns:
+            Whether each context was saved
+        
+        Raises:
+            redis.RedisError: If the pipeline itself fails
+        """
+        cache = self._cache if self._cache_coherent else None
+        generation = cache.generation if cache else 0
+        
+        spans = []
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for agent_id, context_id, context, ttl_seconds in saves:
+                first = len(pipe)
+                revision_index, appended = self._queue_save(
+                    pipe, agent_id, context_id, context, ttl_seconds
+                )
+                spans.append((first, len(pipe), revision_index, appended))
+            results = await pipe.execute(raise_on_error=False)
+        
+        saved = []
+        for (agent_id, context_id, context, ttl_seconds), span in zip(saves, spans):
+            first, last, revision_index, appended = span
+            key = self._get_key(agent_id, context_id)
+            errors = [r for r in results[first:last] if isinstance(r, Exception)]
+            if errors:
+                logger.error(
+                    "context_save_failed",
+                    agent_id=agent_id,
+                    context_id=context_id,
+                    error=str(errors[0])
+                )
+                if self._cache:
+                    self._cache.invalidate(key)
+                saved.append(False)
+                continue
+            
+            rewrite = context.needs_rewrite
+            revision = results[revision_index]
+            exclusive = rewrite or revision == context.revision + 1
+            context.revision = revision
+            context.mark_saved()
+            
+            if cache:
+                if exclusive:
+                    cache.put(key, context, generation)
+                else:
+                    cache.invalidate(key)
+            
+            logger.info(
+                "context_saved",
+                agent_id=agent_id,
+                context_id=context_id,
+                message_count=len(context.messages),
+                appended=appended,
+                rewrite=rewrite,
+                ttl_hours=ttl_seconds / 3600
+            )
+            saved.append(True)
+        return saved
+    
     async def save_context(
         self,
         agent_id: str,
@@ -83,6 +422,18 @@ class ContextStorageService:
         """
         Save conversation context to Redis
         
+        Appends the messages added since the context was loaded, trims the
+        list to ``max_history`` and refreshes the TTL in one atomic
+        pipeline. A new context, or one loaded from the legacy layout or
+        cleared, replaces whatever is stored under its key.
+        
+        The saved context is cached only if no other write to the key
+        happened since it was loaded; otherwise the stored list holds
+        messages this copy lacks.
+        
+        In the ``batched`` and ``async`` write modes the context is queued
+        for the write-behind flusher instead (see ``ContextWriteBehind``).
+        
         Args:
             agent_id: Agent identifier
             context_id: Context identifier (e.g., user_id or session_id)
@@ -90,31 +441,27 @@ class ContextStorageService:
             ttl: Time to live (default: 24 hours)
         
         Returns:
-            True if saved successfully
+            True if saved (or, in ``async`` mode, queued) successfully
         """
         if not self._redis:
             logger.error("redis_not_connected")
             return False
         
-        try:
-            key = self._get_key(agent_id, context_id)
-            data = self._serialize_context(context)
-            ttl = ttl or self._default_ttl
-            
-            await self._redis.setex(
-                key,
-                int(ttl.total_seconds()),
-                data
-            )
-            
-            logger.info(
-                "context_saved",
-                agent_id=agent_id,
-                context_id=context_id,
-                message_count=len(context.messages),
-                ttl_hours=ttl.total_seconds() / 3600
+        ttl = ttl or self._default_ttl
+        ttl_seconds = int(ttl.total_seconds())
+        
+        if self._write_behind and self._write_behind.running:
+            return await self._write_behind.save(
+                agent_id,
+                context_id,
+                self._get_key(agent_id, context_id),
+                context,
+                ttl_seconds
             )
-            return True
+        
+        try:
+            saved, = await self._write_contexts([(agent_id, context_id, context, ttl_seconds)])
+            return saved
             
         except Exception as e:
             logger.error(
@@ -146,7 +493,25 @@ class ContextStorageService:
         
         try:
             key = self._get_key(agent_id, context_id)
-            data = await self._redis.get(key)
+            meta_key = self._get_meta_key(agent_id, context_id)
+            if self._write_behind:
+                pending = self._write_behind.latest(key)
+                if pending:
+                    return pending
+            
+            cache = self._cache if self._cache_coherent else None
+            if cache:
+                cached = cache.get(key)
+                if cached:
+                    logger.debug(
+                        "context_loaded_from_cache",
+                        agent_id=agent_id,
+                        context_id=context_id
+                    )
+                    return cached
+                generation = cache.generation
+            
+            data = await self._script()(keys=[key, meta_key], client=self._redis)
             
             if not data:
                 logger.debug(
@@ -156,7 +521,17 @@ class ContextStorageService:
                 )
                 return None
             
-            context = self._deserialize_context(data)
+            if data[0] == b"blob":
+                context = self._deserialize_legacy_context(data[1])
+            else:
+                meta = {
+                    field.decode(): value
+                    for field, value in zip(data[1][::2], data[1][1::2])
+                }
+                context = self._deserialize_context(context_id, meta, data[2])
+            
+            if cache:
+                cache.put(key, context, generation)
             
             logger.info(
                 "context_loaded",
@@ -196,7 +571,14 @@ class ContextStorageService:
         
         try:
             key = self._get_key(agent_id, context_id)
-            deleted = await self._redis.delete(key)
+            if self._write_behind:
+                self._write_behind.discard(agent_id, context_id)
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key, self._get_meta_key(agent_id, context_id))
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation(key))
+                deleted, _ = await pipe.execute()
+            if self._cache:
+                self._cache.invalidate(key)
             
             logger.info(
                 "context_deleted",
@@ -235,7 +617,12 @@ class ContextStorageService:
         
         try:
             key = self._get_key(agent_id, context_id)
-            return bool(await self._redis.exists(key))
+            if self._write_behind and self._write_behind.latest(key):
+                return True
+            return bool(await self._redis.exists(
+                key,
+                self._get_meta_key(agent_id, context_id)
+            ))
         except Exception as e:
             logger.error(
                 "context_exists_check_failed",
@@ -266,10 +653,13 @@ class ContextStorageService:
             return False
         
         try:
-            key = self._get_key(agent_id, context_id)
             ttl = ttl or self._default_ttl
+            ttl_seconds = int(ttl.total_seconds())
             
-            await self._redis.expire(key, int(ttl.total_seconds()))
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.expire(self._get_key(agent_id, context_id), ttl_seconds)
+                pipe.expire(self._get_meta_key(agent_id, context_id), ttl_seconds)
+                await pipe.execute()
             
             logger.info(
                 "context_ttl_extended",
@@ -288,6 +678,17 @@ class ContextStorageService:
             )
             return False
     
+    async def _scan_contexts(self, agent_id: Optional[str] = None) -> list[tuple[str, str]]:
+        """Find stored contexts by scanning message and metadata keys"""
+        suffix = f"{agent_id}:*" if agent_id else "*"
+        contexts = {}
+        for prefix in ("context", "context_meta"):
+            async for key in self._redis.scan_iter(match=f"{prefix}:{suffix}", count=100):
+                parts = key.decode().split(":")
+                if len(parts) >= 3:
+                    contexts[(parts[1], parts[2])] = None
+        return list(contexts)
+    
     async def list_contexts(
         self,
         agent_id: Optional[str] = None
@@ -305,21 +706,14 @@ class ContextStorageService:
             return []
         
         try:
-            pattern = f"context:{agent_id}:*" if agent_id else "context:*"
-            keys = []
-            
-            async for key in self._redis.scan_iter(match=pattern, count=100):
-                keys.append(key)
-            
-            contexts = []
-            for key in keys:
-                parts = key.split(":")
-                if len(parts) >= 3:
-                    contexts.append({
-                        "agent_id": parts[1],
-                        "context_id": parts[2],
-                        "key": key
-                    })
+            contexts = [
+                {
+                    "agent_id": found_agent_id,
+                    "context_id": context_id,
+                    "key": self._get_key(found_agent_id, context_id)
+                }
+                for found_agent_id, context_id in await self._scan_contexts(agent_id)
+            ]
             
             logger.info(
                 "contexts_listed",
@@ -350,16 +744,19 @@ class ContextStorageService:
             return 0
         
         try:
-            pattern = f"context:{agent_id}:*" if agent_id else "context:*"
-            keys = []
-            
-            async for key in self._redis.scan_iter(match=pattern, count=100):
-                keys.append(key)
-            
-            if keys:
-                deleted = await self._redis.delete(*keys)
-            else:
-                deleted = 0
+            if self._write_behind:
+                self._write_behind.discard(agent_id)
+            contexts = await self._scan_contexts(agent_id)
+            if contexts:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    for found_agent_id, context_id in contexts:
+                        key = self._get_key(found_agent_id, context_id)
+                        pipe.delete(key, self._get_meta_key(found_agent_id, context_id))
+                        pipe.publish(INVALIDATION_CHANNEL, self._invalidation(key))
+                    await pipe.execute()
+            if self._cache:
+                self._cache.clear()
+            deleted = len(contexts)
             
             logger.info(
                 "contexts_cleared",
@@ -375,6 +772,21 @@ class ContextStorageService:
                 error=str(e)
             )
             return 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get context cache and write-behind statistics"""
+        cache: Dict[str, Any] = {"enabled": False}
+        if self._cache:
+            cache = {
+                "enabled": True,
+                "coherent": self._cache_coherent,
+                **self._cache.get_stats()
+            }
+        return {
+            "write_mode": settings.context_write_mode,
+            "cache": cache,
+            "write_behind": self._write_behind.get_stats() if self._write_behind else None
+        }
 
 
 # Global context storage service instance
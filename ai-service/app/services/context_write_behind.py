@@ -0,0 +1,360 @@
+"""Write-behind queue for conversation context saves"""
+
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
+import asyncio
+import time
+import structlog
+
+from app.agents.base_agent import ConversationContext
+
+if TYPE_CHECKING:
+    from app.services.context_storage import ContextStorageService
+
+logger = structlog.get_logger()
+
+
+WRITE_MODES = ("sync", "batched", "async")
+
+# Pause before retrying a batch that failed to reach Redis
+RETRY_DELAY_SECONDS = 1.0
+
+
+class PendingSave:
+    """A context snapshot waiting to be flushed"""
+
+    def __init__(
+        self,
+        agent_id: str,
+        context_id: str,
+        context: ConversationContext,
+        ttl_seconds: int
+    ):
+        self.agent_id = agent_id
+        self.context_id = context_id
+        self.context = context
+        self.ttl_seconds = ttl_seconds
+        self.enqueued_at = time.monotonic()
+        self.waiters: List[asyncio.Future] = []
+
+    def resolve(self, saved: bool):
+        """Wake the callers waiting for this save"""
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(saved)
+        self.waiters = []
+
+
+class ContextWriteBehind:
+    """
+    Coalescing write-behind queue in front of ``ContextStorageService``
+
+    Saves are snapshotted and queued instead of written inline. A
+    background flusher writes queued contexts in pipelined batches of up
+    to ``batch_size``, ``flush_interval`` after the first arrives. Repeated
+    saves of a queued context are coalesced into one write that appends
+    the messages of all of them, in order, as the inline saves would have.
+
+    Loads see queued and in-flight snapshots first, so a chat reads its
+    own writes. The copy a load returns counts as saved: its next save
+    queues only the messages added to it, behind the snapshot it came from.
+
+    Durability by mode:
+    - ``batched``: ``save`` returns once its batch is in Redis, so a
+      response still implies a durable context; writes are only
+      coalesced and pipelined
+    - ``async``: ``save`` returns at once and a crash loses up to one
+      flush interval plus flush lag of writes. A batch that fails to
+      reach Redis is retried, and a clean shutdown drains the queue.
+      Beyond ``max_pending`` queued saves, callers wait for their flush.
+    """
+
+    def __init__(
+        self,
+        storage: "ContextStorageService",
+        mode: str,
+        flush_interval: float,
+        batch_size: int,
+        max_pending: int
+    ):
+        if mode not in WRITE_MODES[1:]:
+            raise ValueError(
+                f"Unknown context write-behind mode '{mode}', "
+                f"expected one of {', '.join(WRITE_MODES[1:])}"
+            )
+        self.storage = storage
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[str, List[PendingSave]]" = OrderedDict()
+        self._pending_count = 0
+        # Newest snapshot per context in the batch being written
+        self._inflight: Dict[str, PendingSave] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.flushes = 0
+        self.flushed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.retried = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._total_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the flusher is accepting saves"""
+        return self._task is not None and not self._stopping
+
+    def start(self):
+        """Start the background flusher"""
+        if not self._task:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            logger.info("context_write_behind_started", mode=self.mode)
+
+    async def stop(self, timeout: float):
+        """
+        Stop accepting saves and drain the queue
+
+        Saves made while draining are written inline by the storage
+        service. Whatever is still queued after ``timeout`` is dropped.
+
+        Args:
+            timeout: Seconds to keep flushing (and retrying) queued saves
+        """
+        if not self._task:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            # Shielded so a batch is not interrupted half-written
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        dropped = self._pending_count
+        for entries in self._pending.values():
+            for entry in entries:
+                entry.resolve(False)
+        self._pending.clear()
+        self._pending_count = 0
+        if dropped:
+            logger.error("context_write_behind_drain_incomplete", dropped=dropped)
+        else:
+            logger.info("context_write_behind_drained")
+
+    @staticmethod
+    def _coalesce(old: ConversationContext, new: ConversationContext) -> bool:
+        """
+        Fold a queued snapshot into a newer one of the same context
+
+        On success ``new`` alone writes everything both would: the
+        messages ``old`` appends come first. Fails only when ``old``
+        replaces the stored history and ``new`` did not start from it.
+
+        Returns:
+            True if ``new`` now covers ``old``
+        """
+        if new.needs_rewrite:
+            return True
+        # A newer snapshot taken from ``old`` still holds its last message
+        anchor = old.messages if old.needs_rewrite else old.unsaved_messages
+        derived = not anchor or anchor[-1] in new.messages
+        if old.needs_rewrite:
+            if not derived:
+                return False
+            new.needs_rewrite = True
+            return True
+        new.unsaved_messages = old.unsaved_messages + new.unsaved_messages
+        # Unless it started from ``old``, ``new`` lacks its messages, so saving
+        # must not cache it as the stored state
+        new.revision = old.revision if derived else -1
+        return True
+
+    async def save(
+        self,
+        agent_id: str,
+        context_id: str,
+        key: str,
+        context: ConversationContext,
+        ttl_seconds: int
+    ) -> bool:
+        """
+        Queue a snapshot of a context for the next flush
+
+        Returns:
+            True once queued (``async``) or written (``batched``)
+        """
+        snapshot = context.copy()
+        entries = self._pending.get(key)
+        if entries and self._coalesce(entries[-1].context, snapshot):
+            # Keeps the original enqueue time, so lag counts from the first unflushed write
+            entry = entries[-1]
+            entry.context = snapshot
+            entry.ttl_seconds = ttl_seconds
+            self.coalesced += 1
+        else:
+            entry = PendingSave(agent_id, context_id, snapshot, ttl_seconds)
+            self._pending.setdefault(key, []).append(entry)
+            self._pending_count += 1
+        self._wakeup.set()
+
+        if self.mode == "batched" or self._pending_count > self.max_pending:
+            waiter = asyncio.get_running_loop().create_future()
+            entry.waiters.append(waiter)
+            saved = await waiter
+        else:
+            saved = True
+        if saved:
+            context.mark_saved()
+        return saved
+
+    def latest(self, key: str) -> Optional[ConversationContext]:
+        """
+        Copy of the newest queued or in-flight snapshot of a context, if any
+
+        The copy is marked saved, since the snapshot will write its
+        messages; saving the copy queues only what is added to it.
+        """
+        entries = self._pending.get(key)
+        if entries:
+            entry = entries[-1]
+        else:
+            entry = self._inflight.get(key)
+        if not entry:
+            return None
+        context = entry.context.copy()
+        context.mark_saved()
+        return context
+
+    def discard(self, agent_id: Optional[str] = None, context_id: Optional[str] = None):
+        """Drop queued saves of deleted contexts, optionally filtered by agent and context"""
+        for key, entries in list(self._pending.items()):
+            entry = entries[0]
+            if agent_id is not None and entry.agent_id != agent_id:
+                continue
+            if context_id is not None and entry.context_id != context_id:
+                continue
+            del self._pending[key]
+            self._pending_count -= len(entries)
+            for entry in entries:
+                entry.resolve(True)
+        for key, entry in list(self._inflight.items()):
+            if agent_id is not None and entry.agent_id != agent_id:
+                continue
+            if context_id is not None and entry.context_id != context_id:
+                continue
+            del self._inflight[key]
+
+    async def _run(self):
+        """Flush queued saves, a short interval after the first one arrives"""
+        while True:
+            await self._wakeup.wait()
+            if not self._stopping:
+                await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            while self._pending:
+                if not await self._flush_batch():
+                    await asyncio.sleep(RETRY_DELAY_SECONDS)
+            if self._stopping:
+                return
+
+    def _requeue(self, key: str, entry: PendingSave):
+        """Put a save that failed to flush back ahead of newer saves of its context"""
+        self._pending.setdefault(key, []).insert(0, entry)
+        self._pending.move_to_end(key, last=False)
+        self._pending_count += 1
+
+    async def _flush_batch(self) -> bool:
+        """
+        Write up to ``batch_size`` queued saves in one pipeline
+
+        All queued snapshots of a context go in the same batch, so they are
+        written in order.
+
+        Returns:
+            False if the batch could not reach Redis and was requeued
+        """
+        batch: List[tuple[str, PendingSave]] = []
+        while self._pending and len(batch) < self.batch_size:
+            key, entries = self._pending.popitem(last=False)
+            batch.extend((key, entry) for entry in entries)
+            self._inflight[key] = entries[-1]
+        self._pending_count -= len(batch)
+
+        try:
+            results = await self.storage._write_contexts([
+                (entry.agent_id, entry.context_id, entry.context, entry.ttl_seconds)
+                for _, entry in batch
+            ])
+        except Exception as e:
+            logger.warning(
+                "context_write_behind_flush_failed",
+                contexts=len(batch),
+                error=str(e)
+            )
+            for key, _ in batch:
+                self._inflight.pop(key, None)
+            if self.mode == "batched":
+                # Callers are waiting, so fail them as an inline save would
+                for _, entry in batch:
+                    entry.resolve(False)
+                self.failed += len(batch)
+                return False
+            for key, entry in reversed(batch):
+                # Callers held back by max_pending stop waiting; the save is retried
+                entry.resolve(False)
+                self._requeue(key, entry)
+            self.retried += len(batch)
+            return False
+
+        now = time.monotonic()
+        for (key, entry), saved in zip(batch, results):
+            if self._inflight.get(key) is entry:
+                del self._inflight[key]
+            lag = now - entry.enqueued_at
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            self._total_lag += lag
+            if saved:
+                self.flushed += 1
+            else:
+                self.failed += 1
+            entry.resolve(saved)
+        self.flushes += 1
+
+        logger.debug(
+            "context_write_behind_flushed",
+            contexts=len(batch),
+            lag_ms=round(self._last_lag * 1000, 2)
+        )
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, flush counts and flush lag"""
+        oldest = None
+        if self._pending:
+            oldest = next(iter(self._pending.values()))[0].enqueued_at
+        written = self.flushed + self.failed
+        return {
+            "mode": self.mode,
+            "pending": self._pending_count,
+            "oldest_pending_ms": (
+                round((time.monotonic() - oldest) * 1000, 2) if oldest is not None else 0.0
+            ),
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "retried": self.retried,
+            "flush_lag_ms": {
+                "last": round(self._last_lag * 1000, 2),
+                "avg": round(self._total_lag / written * 1000, 2) if written else 0.0,
+                "max": round(self._max_lag * 1000, 2)
+            }
+        }
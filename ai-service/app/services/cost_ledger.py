@@ -0,0 +1,294 @@
+"""Shared cost accounting and per-tenant budgets in Redis"""
+
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional, Dict, Any, Set, Tuple
+import asyncio
+import structlog
+
+from app.services.redis_client import redis_manager
+
+logger = structlog.get_logger()
+
+
+class BudgetAction(str, Enum):
+    """Pre-flight budget decision for a call"""
+    ALLOW = "allow"
+    DOWNGRADE = "downgrade"
+    REJECT = "reject"
+
+
+# Time bucket granularities: (key format, retention)
+BUCKETS = {
+    "hour": ("%Y%m%d%H", timedelta(hours=48)),
+    "day": ("%Y%m%d", timedelta(days=35)),
+    "month": ("%Y%m", timedelta(days=400)),
+}
+
+DIMENSIONS = ("tenant", "agent", "model", "provider")
+
+# Tenant that calls without an X-Tenant-ID header are accounted and budgeted as
+DEFAULT_TENANT_ID = "default"
+
+
+class CostLedger:
+    """
+    Cost accounting shared by every worker and replica
+
+    Each tracked call is written with one pipelined round trip of atomic
+    increments into hourly, daily and monthly buckets:
+
+    - ``llm:cost:{period}:{bucket}:totals`` hash with cost, requests,
+      tokens (including prompt-cache reads) and cache hits
+    - ``llm:cost:{period}:{bucket}:{dimension}`` hashes of cost per tenant,
+      agent, model and provider
+
+    Writes run as background tasks so accounting never adds latency to a
+    completion. Without Redis the ledger is inactive and the in-process
+    ``CostTracker`` remains the only record.
+    """
+
+    KEY_PREFIX = "llm:cost:"
+    BUDGETS_KEY = "llm:budgets"
+
+    def __init__(
+        self,
+        alert_threshold: float,
+        budget_period: str,
+        default_budget: float,
+        tenant_budgets: Dict[str, float],
+        budget_action: BudgetAction
+    ):
+        self.alert_threshold = alert_threshold
+        self.budget_period = budget_period
+        self.default_budget = default_budget
+        self.tenant_budgets = tenant_budgets
+        self.budget_action = budget_action
+        self._pending: Set[asyncio.Task] = set()
+        self.write_failures = 0
+        self.budget_downgrades = 0
+        self.budget_rejections = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether costs are being recorded in Redis"""
+        return redis_manager.client is not None
+
+    def _key(self, period: str, now: datetime, suffix: str) -> str:
+        """Redis key for a period's bucket"""
+        return f"{self.KEY_PREFIX}{period}:{now.strftime(BUCKETS[period][0])}:{suffix}"
+
+    def record(
+        self,
+        tenant_id: Optional[str],
+        agent_id: Optional[str],
+        model: str,
+        provider: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost: float,
+        cached: bool,
+        cached_input_tokens: int = 0
+    ):
+        """Schedule a cost record; returns immediately"""
+        if not self.active:
+            return
+        task = asyncio.create_task(self._write(
+            tenant_id, agent_id, model, provider, input_tokens, output_tokens, cost, cached,
+            cached_input_tokens
+        ))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _write(
+        self,
+        tenant_id: Optional[str],
+        agent_id: Optional[str],
+        model: str,
+        provider: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost: float,
+        cached: bool,
+        cached_input_tokens: int
+    ):
+        """Increment every bucket in one pipelined round trip"""
+        client = redis_manager.client
+        if not client:
+            return
+
+        now = datetime.utcnow()
+        members = {
+            "tenant": tenant_id or DEFAULT_TENANT_ID,
+            "agent": agent_id or "unattributed",
+            "model": model,
+            "provider": provider
+        }
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for period, (_, retention) in BUCKETS.items():
+                totals = self._key(period, now, "totals")
+                pipe.hincrbyfloat(totals, "cost", cost)
+                pipe.hincrby(totals, "requests", 1)
+                pipe.hincrby(totals, "input_tokens", input_tokens)
+                pipe.hincrby(totals, "cached_input_tokens", cached_input_tokens)
+                pipe.hincrby(totals, "output_tokens", output_tokens)
+                pipe.hincrby(totals, "cache_hits", int(cached))
+                pipe.expire(totals, retention)
+                for dimension, member in members.items():
+                    key = self._key(period, now, dimension)
+                    pipe.hincrbyfloat(key, member, cost)
+                    pipe.expire(key, retention)
+            results = await pipe.execute()
+        except Exception as e:
+            self.write_failures += 1
+            logger.warning("cost_ledger_write_failed", error=str(e))
+            return
+
+        # Alert on the call that takes the day's total across the
+        # threshold, so exactly one worker fires
+        ops_per_bucket = 7 + 2 * len(members)
+        day_total = float(results[list(BUCKETS).index("day") * ops_per_bucket])
+        if day_total >= self.alert_threshold > day_total - cost:
+            logger.warning(
+                "cost_threshold_exceeded",
+                period="day",
+                total_cost=round(day_total, 4),
+                threshold=self.alert_threshold
+            )
+
+    def _budget_for(self, tenant_id: str, override: Optional[str]) -> float:
+        """A tenant's budget: Redis override, then configured, then the default"""
+        if override is not None:
+            return float(override)
+        return self.tenant_budgets.get(tenant_id, self.default_budget)
+
+    async def check_budget(self, tenant_id: Optional[str]) -> Tuple[BudgetAction, float]:
+        """
+        Pre-flight budget check for a tenant
+
+        Calls without a tenant are checked against ``DEFAULT_TENANT_ID``'s
+        budget, the tenant they are accounted under.
+
+        Returns:
+            Tuple of (action, seconds until the budget period resets)
+        """
+        client = redis_manager.client
+        if not client:
+            return BudgetAction.ALLOW, 0.0
+        tenant_id = tenant_id or DEFAULT_TENANT_ID
+
+        now = datetime.utcnow()
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hget(self._key(self.budget_period, now, "tenant"), tenant_id)
+            pipe.hget(self.BUDGETS_KEY, tenant_id)
+            spent, override = await pipe.execute()
+        except Exception as e:
+            # Accounting outages must not take completions down with them
+            logger.warning("cost_ledger_budget_check_failed", error=str(e))
+            return BudgetAction.ALLOW, 0.0
+
+        budget = self._budget_for(tenant_id, override)
+        if budget <= 0 or float(spent or 0.0) < budget:
+            return BudgetAction.ALLOW, 0.0
+
+        if self.budget_action == BudgetAction.REJECT:
+            self.budget_rejections += 1
+        else:
+            self.budget_downgrades += 1
+        logger.warning(
+            "tenant_budget_exhausted",
+            tenant_id=tenant_id,
+            spent=round(float(spent), 4),
+            budget=budget,
+            action=self.budget_action.value
+        )
+        return self.budget_action, self._seconds_until_reset(now)
+
+    def _seconds_until_reset(self, now: datetime) -> float:
+        """Seconds until the budget period's bucket rolls over"""
+        if self.budget_period == "hour":
+            reset = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        elif self.budget_period == "day":
+            reset = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        else:
+            first = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            reset = (first + timedelta(days=32)).replace(day=1)
+        return (reset - now).total_seconds()
+
+    async def get_period_stats(self, period: str = "day") -> Optional[Dict[str, Any]]:
+        """Totals and per-dimension costs for the current bucket of a period"""
+        client = redis_manager.client
+        if not client:
+            return None
+
+        now = datetime.utcnow()
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hgetall(self._key(period, now, "totals"))
+            for dimension in DIMENSIONS:
+                pipe.hgetall(self._key(period, now, dimension))
+            totals, *dimensions = await pipe.execute()
+        except Exception as e:
+            logger.warning("cost_ledger_read_failed", error=str(e))
+            return None
+
+        stats: Dict[str, Any] = {
+            "period": period,
+            "bucket": now.strftime(BUCKETS[period][0]),
+            "total_cost": round(float(totals.get("cost", 0.0)), 4),
+            "total_requests": int(totals.get("requests", 0)),
+            "input_tokens": int(totals.get("input_tokens", 0)),
+            "cached_input_tokens": int(totals.get("cached_input_tokens", 0)),
+            "output_tokens": int(totals.get("output_tokens", 0)),
+            "cache_hits": int(totals.get("cache_hits", 0)),
+        }
+        for dimension, values in zip(DIMENSIONS, dimensions):
+            stats[f"by_{dimension}"] = {
+                member: round(float(cost), 4) for member, cost in values.items()
+            }
+        return stats
+
+    async def get_tenant_usage(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """A tenant's spend in the current budget period and its budget"""
+        client = redis_manager.client
+        if not client:
+            return None
+
+        now = datetime.utcnow()
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hget(self._key(self.budget_period, now, "tenant"), tenant_id)
+            pipe.hget(self.BUDGETS_KEY, tenant_id)
+            spent, override = await pipe.execute()
+        except Exception as e:
+            logger.warning("cost_ledger_read_failed", error=str(e))
+            return None
+
+        budget = self._budget_for(tenant_id, override)
+        spent = float(spent or 0.0)
+        return {
+            "tenant_id": tenant_id,
+            "period": self.budget_period,
+            "spent": round(spent, 4),
+            "budget": budget if budget > 0 else None,
+            "remaining": round(max(0.0, budget - spent), 4) if budget > 0 else None,
+            "exhausted": budget > 0 and spent >= budget
+        }
+
+    async def drain(self):
+        """Wait for scheduled writes to finish"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ledger statistics"""
+        return {
+            "active": self.active,
+            "pending_writes": len(self._pending),
+            "write_failures": self.write_failures,
+            "budget_downgrades": self.budget_downgrades,
+            "budget_rejections": self.budget_rejections
+        }
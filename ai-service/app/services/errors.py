@@ -0,0 +1,57 @@
+"""Errors raised when the service rejects an LLM call before reaching a provider"""
+
+from typing import Dict, Optional
+
+
+class LLMServiceUnavailableError(Exception):
+    """
+    Base error for calls rejected locally (open circuits, exhausted limits)
+
+    Routers translate it into an HTTP response using ``status_code`` and a
+    ``Retry-After`` header when ``retry_after`` is known.
+    """
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> Optional[Dict[str, str]]:
+        """HTTP headers describing when the caller may retry"""
+        if self.retry_after is None:
+            return None
+        return {"Retry-After": str(max(1, round(self.retry_after)))}
+
+
+class CircuitOpenError(LLMServiceUnavailableError):
+    """Raised when a provider's circuit breaker is open"""
+
+
+class RateLimitExceededError(LLMServiceUnavailableError):
+    """Raised when a provider's request or token budget cannot be met in time"""
+
+    status_code = 429
+
+
+class ConcurrencyLimitExceededError(LLMServiceUnavailableError):
+    """Raised when a provider's concurrency queue is full or the wait times out"""
+
+
+class PromptTooLargeError(LLMServiceUnavailableError):
+    """Raised when a prompt cannot be fitted into the model's context window"""
+
+    status_code = 413
+
+
+class BudgetExceededError(LLMServiceUnavailableError):
+    """Raised when a tenant has exhausted its LLM budget for the current period"""
+
+    status_code = 402
+
+
+class DeadlineExceededError(LLMServiceUnavailableError):
+    """Raised when the caller's deadline passes before a completion is ready"""
+
+    status_code = 504
@@ -0,0 +1,81 @@
+"""Latency tracking and hedged-request policy for LLM providers"""
+
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per provider"""
+
+    def __init__(self, window_size: int = 200):
+        self.window_size = window_size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, seconds: float):
+        """Record a successful call latency"""
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = deque(maxlen=self.window_size)
+            self._samples[provider] = samples
+        samples.append(seconds)
+
+    def percentile(self, provider: str, percentile: float) -> Optional[float]:
+        """Get a latency percentile, or None if no samples exist"""
+        samples = self._samples.get(provider)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def sample_count(self, provider: str) -> int:
+        """Number of samples recorded for a provider"""
+        return len(self._samples.get(provider, ()))
+
+
+class HedgingPolicy:
+    """
+    Decide when to hedge a slow primary call and track the outcome
+
+    The hedge delay is the primary provider's observed latency percentile
+    (p95 by default). Until enough samples exist a configured default is
+    used. The delay never drops below a floor, so ordinary variance does
+    not double provider traffic.
+    """
+
+    def __init__(
+        self,
+        latency_tracker: LatencyTracker,
+        percentile: float,
+        min_samples: int,
+        default_delay: float,
+        min_delay: float
+    ):
+        self.latency_tracker = latency_tracker
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.eligible = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.hedge_wins = 0
+        self.both_failed = 0
+
+    def delay_for(self, provider: str) -> float:
+        """Seconds to wait on the primary before sending the hedge"""
+        if self.latency_tracker.sample_count(provider) < self.min_samples:
+            return self.default_delay
+        observed = self.latency_tracker.percentile(provider, self.percentile)
+        return max(self.min_delay, observed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedge rate and win statistics"""
+        return {
+            "eligible_requests": self.eligible,
+            "hedged_requests": self.hedged,
+            "hedge_rate": round(self.hedged / self.eligible, 4) if self.eligible else 0.0,
+            "primary_wins": self.primary_wins,
+            "hedge_wins": self.hedge_wins,
+            "both_failed": self.both_failed
+        }
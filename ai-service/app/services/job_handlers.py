@@ -0,0 +1,73 @@
+"""Background job handlers: long, non-interactive generation work"""
+
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+from app.agents.agent_registry import agent_registry
+from app.models.job_models import (
+    JobType,
+    LexiBulkInsightsPayload,
+    LumiDocumentsPayload,
+    MissionSynthesisPayload
+)
+from app.services.job_queue import JobCheckpoint
+from app.services.mission_control_service import (
+    analyze_objective,
+    get_agent_contribution,
+    synthesize_mission_results
+)
+
+
+async def run_mission_synthesis(payload: Dict[str, Any], checkpoint: JobCheckpoint) -> Dict[str, Any]:
+    """Analyze the objective, gather agent contributions and synthesize a plan"""
+    job = MissionSynthesisPayload(**payload)
+
+    analysis = job.analysis or await checkpoint.step(
+        "analysis",
+        partial(analyze_objective, job.objective, job.context)
+    )
+    contributions = await asyncio.gather(*(
+        checkpoint.step(
+            f"contribution:{agent_id}",
+            partial(get_agent_contribution, agent_id, job.objective, job.context, analysis)
+        )
+        for agent_id in job.agents
+    ))
+    return await checkpoint.step(
+        "synthesis",
+        partial(synthesize_mission_results, job.objective, job.context, analysis, list(contributions))
+    )
+
+
+async def run_lumi_documents(payload: Dict[str, Any], checkpoint: JobCheckpoint) -> Dict[str, Any]:
+    """Draft each requested legal document with Lumi"""
+    job = LumiDocumentsPayload(**payload)
+    lumi = agent_registry.get("lumi")
+
+    documents = await asyncio.gather(*(
+        checkpoint.step(f"document:{index}", partial(lumi.generate_document, **spec.model_dump()))
+        for index, spec in enumerate(job.documents)
+    ))
+    return {"documents": list(documents)}
+
+
+async def run_lexi_bulk_insights(payload: Dict[str, Any], checkpoint: JobCheckpoint) -> Dict[str, Any]:
+    """Generate Lexi insights for each dataset"""
+    job = LexiBulkInsightsPayload(**payload)
+    lexi = agent_registry.get("lexi")
+
+    insights = await asyncio.gather(*(
+        checkpoint.step(f"insights:{index}", partial(lexi.generate_insights, **spec.model_dump()))
+        for index, spec in enumerate(job.datasets)
+    ))
+    return {"insights": list(insights)}
+
+
+JobHandler = Callable[[Dict[str, Any], JobCheckpoint], Awaitable[Dict[str, Any]]]
+
+JOB_HANDLERS: Dict[JobType, JobHandler] = {
+    JobType.MISSION_SYNTHESIS: run_mission_synthesis,
+    JobType.LUMI_DOCUMENTS: run_lumi_documents,
+    JobType.LEXI_BULK_INSIGHTS: run_lexi_bulk_insights,
+}
@@ -0,0 +1,369 @@
+"""Durable background job queue in Redis with checkpointed steps"""
+
+from datetime import datetime
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable
+import asyncio
+import json
+import uuid
+import structlog
+
+from app.config import settings
+from app.models.job_models import JobStatus, JobType, TERMINAL_STATUSES
+from app.services.redis_client import redis_manager
+
+logger = structlog.get_logger()
+
+
+class JobCheckpoint:
+    """
+    Step results of a running job, saved to Redis as each step finishes
+
+    When a job runs again after a worker crash or a retryable failure,
+    finished steps return their saved result instead of repeating the
+    LLM call. Steps run at most ``max_parallel`` at a time per job.
+    """
+
+    def __init__(
+        self,
+        queue: "JobQueue",
+        job_id: str,
+        completed: Dict[str, str],
+        max_parallel: int
+    ):
+        self.queue = queue
+        self.job_id = job_id
+        self._completed = completed
+        self._parallel = asyncio.Semaphore(max_parallel)
+        self.reused = 0
+
+    @property
+    def steps_completed(self) -> int:
+        """Number of finished steps"""
+        return len(self._completed)
+
+    async def step(self, name: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a named step once per job
+
+        Args:
+            name: Step name, unique within the job
+            run: Zero-argument coroutine function producing a JSON-serializable result
+
+        Returns:
+            The step result, from Redis when the step already finished
+        """
+        if name in self._completed:
+            self.reused += 1
+            return json.loads(self._completed[name])
+
+        async with self._parallel:
+            result = await run()
+
+        encoded = json.dumps(result)
+        self._completed[name] = encoded
+        await self.queue.save_step(self.job_id, name, encoded, self.steps_completed)
+        return result
+
+
+class JobQueue:
+    """
+    Reliable job queue shared by API replicas and workers
+
+    Keys:
+    - ``llm:jobs:pending`` list of queued job ids (pushed left, claimed right)
+    - ``llm:jobs:processing:{worker}`` ids a worker has claimed; jobs are
+      atomically moved here when claimed, so a crashed worker's jobs are
+      never lost
+    - ``llm:jobs:worker:{worker}`` heartbeat key with a TTL; when it
+      expires the worker's claimed jobs are moved back to the queue
+    - ``llm:jobs:job:{id}`` hash with the job's state, payload and result
+    - ``llm:jobs:job:{id}:steps`` hash of checkpointed step results
+
+    Every state change is published on ``llm:jobs:events:{id}`` so
+    streaming clients are notified without polling.
+    """
+
+    KEY_PREFIX = "llm:jobs:"
+    PENDING_KEY = "llm:jobs:pending"
+
+    def __init__(
+        self,
+        max_attempts: int,
+        heartbeat_seconds: float,
+        result_ttl_seconds: int,
+        max_parallel_steps: int
+    ):
+        self.max_attempts = max_attempts
+        self.heartbeat_seconds = heartbeat_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_parallel_steps = max_parallel_steps
+
+    @property
+    def active(self) -> bool:
+        """Whether the queue's Redis connection is available"""
+        return redis_manager.client is not None
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}job:{job_id}"
+
+    def _steps_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}job:{job_id}:steps"
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.KEY_PREFIX}processing:{worker_id}"
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self.KEY_PREFIX}worker:{worker_id}"
+
+    def _events_channel(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}events:{job_id}"
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.utcnow().isoformat()
+
+    @staticmethod
+    def _parse(job_id: str, fields: Dict[str, str]) -> Dict[str, Any]:
+        """Decode a job hash into a job info dictionary"""
+        return {
+            "job_id": job_id,
+            "type": fields["type"],
+            "status": fields["status"],
+            "tenant_id": fields.get("tenant_id") or None,
+            "attempts": int(fields.get("attempts", 0)),
+            "steps_completed": int(fields.get("steps_completed", 0)),
+            "created_at": fields["created_at"],
+            "started_at": fields.get("started_at"),
+            "finished_at": fields.get("finished_at"),
+            "result": json.loads(fields["result"]) if fields.get("result") else None,
+            "error": fields.get("error"),
+            "payload": json.loads(fields["payload"])
+        }
+
+    async def submit(
+        self,
+        job_type: JobType,
+        payload: Dict[str, Any],
+        tenant_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Queue a job
+
+        Args:
+            job_type: Job type
+            payload: Validated job input
+            tenant_id: Tenant the job's LLM usage is accounted to
+
+        Returns:
+            Job info for the queued job
+        """
+        client = redis_manager.client
+        job_id = uuid.uuid4().hex
+        fields = {
+            "type": job_type.value,
+            "status": JobStatus.QUEUED.value,
+            "tenant_id": tenant_id or "",
+            "attempts": 0,
+            "steps_completed": 0,
+            "created_at": self._now(),
+            "payload": json.dumps(payload)
+        }
+
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(self._job_key(job_id), mapping=fields)
+        pipe.lpush(self.PENDING_KEY, job_id)
+        await pipe.execute()
+
+        logger.info("job_submitted", job_id=job_id, job_type=job_type.value, tenant_id=tenant_id)
+        return self._parse(job_id, {k: str(v) for k, v in fields.items()})
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job info, or None if the job does not exist or has expired"""
+        fields = await redis_manager.client.hgetall(self._job_key(job_id))
+        if not fields:
+            return None
+        return self._parse(job_id, fields)
+
+    async def claim(self, worker_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next queued job for a worker
+
+        Args:
+            worker_id: Claiming worker
+            timeout: Seconds to block waiting for a job
+
+        Returns:
+            Job info for the claimed job, or None if none arrived in time
+        """
+        client = redis_manager.client
+        processing_key = self._processing_key(worker_id)
+        job_id = await client.blmove(self.PENDING_KEY, processing_key, timeout, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+
+        pipe = client.pipeline(transaction=True)
+        pipe.hincrby(self._job_key(job_id), "attempts", 1)
+        pipe.hset(self._job_key(job_id), mapping={
+            "status": JobStatus.RUNNING.value,
+            "started_at": self._now()
+        })
+        pipe.hgetall(self._job_key(job_id))
+        attempts, _, fields = await pipe.execute()
+
+        if "type" not in fields:
+            # Expired or deleted while queued
+            await client.delete(self._job_key(job_id))
+            await client.lrem(processing_key, 1, job_id)
+            return None
+
+        await client.publish(self._events_channel(job_id), JobStatus.RUNNING.value)
+        job = self._parse(job_id, fields)
+        if attempts > self.max_attempts:
+            await self.finish(worker_id, job_id, error="Job exceeded its retry attempts")
+            return None
+        return job
+
+    async def checkpoint(self, job_id: str) -> JobCheckpoint:
+        """Load a job's finished steps"""
+        completed = await redis_manager.client.hgetall(self._steps_key(job_id))
+        if completed:
+            logger.info("job_resumed", job_id=job_id, steps_completed=len(completed))
+        return JobCheckpoint(self, job_id, completed, self.max_parallel_steps)
+
+    async def save_step(self, job_id: str, name: str, result: str, steps_completed: int):
+        """Persist a finished step's result"""
+        client = redis_manager.client
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(self._steps_key(job_id), name, result)
+        pipe.hset(self._job_key(job_id), "steps_completed", steps_completed)
+        pipe.publish(self._events_channel(job_id), "step")
+        await pipe.execute()
+
+    async def finish(
+        self,
+        worker_id: str,
+        job_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        """Record a job's result or failure and release it from the worker"""
+        client = redis_manager.client
+        status = JobStatus.FAILED if error is not None else JobStatus.COMPLETED
+        fields = {"status": status.value, "finished_at": self._now()}
+        if error is not None:
+            fields["error"] = error
+        else:
+            fields["result"] = json.dumps(result)
+
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(self._job_key(job_id), mapping=fields)
+        pipe.expire(self._job_key(job_id), self.result_ttl_seconds)
+        pipe.expire(self._steps_key(job_id), self.result_ttl_seconds)
+        pipe.lrem(self._processing_key(worker_id), 1, job_id)
+        pipe.publish(self._events_channel(job_id), status.value)
+        await pipe.execute()
+
+        logger.info("job_finished", job_id=job_id, status=status.value, error=error)
+
+    async def requeue(self, worker_id: str, job_id: str, front: bool = False):
+        """
+        Return a claimed job to the queue
+
+        Args:
+            worker_id: Worker holding the job
+            job_id: Job to requeue
+            front: Run it next (interrupted jobs) rather than after queued ones (retries)
+        """
+        client = redis_manager.client
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(self._job_key(job_id), "status", JobStatus.QUEUED.value)
+        pipe.lrem(self._processing_key(worker_id), 1, job_id)
+        if front:
+            pipe.rpush(self.PENDING_KEY, job_id)
+        else:
+            pipe.lpush(self.PENDING_KEY, job_id)
+        pipe.publish(self._events_channel(job_id), JobStatus.QUEUED.value)
+        await pipe.execute()
+
+    async def heartbeat(self, worker_id: str):
+        """Mark a worker alive for three heartbeat intervals"""
+        await redis_manager.client.set(
+            self._worker_key(worker_id),
+            self._now(),
+            ex=max(1, int(self.heartbeat_seconds * 3))
+        )
+
+    async def stop_heartbeat(self, worker_id: str):
+        """Remove a worker's heartbeat after it has released its jobs"""
+        await redis_manager.client.delete(self._worker_key(worker_id))
+
+    async def recover_orphans(self) -> int:
+        """
+        Move jobs claimed by dead workers back to the queue
+
+        Returns:
+            Number of jobs recovered
+        """
+        client = redis_manager.client
+        recovered = 0
+        async for processing_key in client.scan_iter(match=f"{self.KEY_PREFIX}processing:*"):
+            worker_id = processing_key[len(f"{self.KEY_PREFIX}processing:"):]
+            if await client.exists(self._worker_key(worker_id)):
+                continue
+            # LMOVE is atomic, so concurrent recoveries never duplicate a job
+            while (job_id := await client.lmove(processing_key, self.PENDING_KEY, "LEFT", "RIGHT")):
+                await client.hset(self._job_key(job_id), "status", JobStatus.QUEUED.value)
+                await client.publish(self._events_channel(job_id), JobStatus.QUEUED.value)
+                recovered += 1
+                logger.warning("job_recovered", job_id=job_id, dead_worker=worker_id)
+        return recovered
+
+    async def watch(self, job_id: str, keepalive_seconds: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a job's info each time it changes, until it finishes
+
+        Change notifications arrive over pub/sub; the job is also re-read
+        every ``keepalive_seconds`` so missed notifications only delay an
+        update. Ends early if the job disappears.
+        """
+        pubsub = redis_manager.client.pubsub()
+        await pubsub.subscribe(self._events_channel(job_id))
+        try:
+            last = None
+            while True:
+                job = await self.get(job_id)
+                if job is None:
+                    return
+                state = (job["status"], job["steps_completed"], job["attempts"])
+                if state != last:
+                    last = state
+                    yield job
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive_seconds)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and jobs claimed per worker"""
+        client = redis_manager.client
+        if not client:
+            return {"active": False}
+        processing = {}
+        async for processing_key in client.scan_iter(match=f"{self.KEY_PREFIX}processing:*"):
+            processing[processing_key[len(f"{self.KEY_PREFIX}processing:"):]] = await client.llen(processing_key)
+        return {
+            "active": True,
+            "pending": await client.llen(self.PENDING_KEY),
+            "processing": processing
+        }
+
+
+# Global job queue instance
+job_queue = JobQueue(
+    max_attempts=settings.job_max_attempts,
+    heartbeat_seconds=settings.job_heartbeat_seconds,
+    result_ttl_seconds=settings.job_result_ttl_seconds,
+    max_parallel_steps=settings.job_max_parallel_steps
+)
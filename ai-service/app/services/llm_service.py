@@ -1,20 +1,50 @@
-"""LLM service for OpenAI and Anthropic integration"""
+"""LLM service for OpenAI, Anthropic and pluggable provider integration"""
 
-from typing import Optional, Dict, Any, List
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Deque, Set, Tuple
 from enum import Enum
+import asyncio
+import copy
+import hashlib
+import json
 import time
 from datetime import datetime
+import httpx
 import structlog
-from openai import OpenAI, OpenAIError
-from anthropic import Anthropic, AnthropicError
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type
-)
 
 from app.config import settings
+from app.services.call_context import (
+    current_agent_id,
+    current_tenant_id,
+    current_deadline,
+    time_remaining
+)
+from app.services.cost_ledger import CostLedger, BudgetAction, DEFAULT_TENANT_ID
+from app.services.errors import (
+    BudgetExceededError,
+    DeadlineExceededError,
+    LLMServiceUnavailableError
+)
+from app.services.completion_cache import CompletionCache
+from app.services.semantic_cache import SemanticCache
+from app.services.singleflight import SingleFlight
+from app.services.hedging import LatencyTracker, HedgingPolicy
+from app.services.retry_budget import RetryBudget, RetryPolicy
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from app.services.rate_limiter import ProviderRateLimiter
+from app.services.token_counter import TokenCounter
+from app.services.model_router import ModelRouter, ModelTier
+from app.services.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry
+)
+from app.services.providers import (
+    CompletionProvider,
+    OpenAIProvider,
+    AnthropicProvider,
+    FakeProvider
+)
 
 logger = structlog.get_logger()
 
@@ -23,10 +53,18 @@ class LLMProvider(str, Enum):
     """Supported LLM providers"""
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
+    FAKE = "fake"
 
 
 class CostTracker:
-    """Track LLM API costs"""
+    """
+    Track LLM API costs in bounded memory
+    
+    Totals are kept as running counters aggregated per model, provider and
+    agent; only the most recent requests are kept individually, in a ring
+    buffer. Memory and ``get_stats`` cost stay constant however long the
+    process runs.
+    """
     
     # Pricing per 1K tokens (as of 2024)
     PRICING = {
@@ -36,55 +74,136 @@ class CostTracker:
         "claude-3-opus": {"input": 0.015, "output": 0.075},
         "claude-3-sonnet": {"input": 0.003, "output": 0.015},
         "claude-3-haiku": {"input": 0.00025, "output": 0.00125},
+        "fake": {"input": 0.0, "output": 0.0},
     }
+    DEFAULT_PRICING = {"input": 0.01, "output": 0.03}
     
-    def __init__(self):
+    # Prompt caching prices relative to the input price: Anthropic bills
+    # cache writes at 1.25x and reads at 0.1x; OpenAI bills cached reads
+    # at 0.5x and nothing extra for writes
+    CACHE_READ_MULTIPLIER = {"claude": 0.1, "gpt": 0.5}
+    CACHE_WRITE_MULTIPLIER = 1.25
+    
+    def __init__(self, recent_requests: int = 100, ledger: Optional[CostLedger] = None):
+        self.ledger = ledger
         self.total_cost = 0.0
-        self.requests = []
+        self.total_requests = 0
+        self.cache_hits = 0
+        self.cached_input_tokens = 0
+        self.prompt_cache_savings = 0.0
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=recent_requests)
+        self.by_model: Dict[str, Dict[str, float]] = {}
+        self.by_provider: Dict[str, Dict[str, float]] = {}
+        self.by_agent: Dict[str, Dict[str, float]] = {}
     
     def track_usage(
         self,
         model: str,
         input_tokens: int,
         output_tokens: int,
-        provider: LLMProvider
+        provider: LLMProvider,
+        cached: bool = False,
+        agent_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        cached_input_tokens: int = 0,
+        cache_write_tokens: int = 0
     ) -> float:
-        """Calculate and track cost for a request"""
-        # Normalize model name for pricing lookup
-        model_key = model.lower()
-        for key in self.PRICING.keys():
-            if key in model_key:
-                model_key = key
-                break
-        
-        pricing = self.PRICING.get(model_key, {"input": 0.01, "output": 0.03})
+        """
+        Calculate and track cost for a request
         
-        input_cost = (input_tokens / 1000) * pricing["input"]
-        output_cost = (output_tokens / 1000) * pricing["output"]
-        total_cost = input_cost + output_cost
+        ``input_tokens`` is the whole prompt; ``cached_input_tokens`` and
+        ``cache_write_tokens`` are the parts read from and written to the
+        provider's prompt cache.
+        """
+        # Served from the completion cache: no provider tokens were billed
+        if cached:
+            total_cost = 0.0
+            cached_input_tokens = cache_write_tokens = 0
+        else:
+            total_cost = self.estimate_cost(
+                model, input_tokens, output_tokens, cached_input_tokens, cache_write_tokens
+            )
+            self.prompt_cache_savings += (
+                self.estimate_cost(model, input_tokens, output_tokens) - total_cost
+            )
         
+        self.total_requests += 1
         self.total_cost += total_cost
+        self.cached_input_tokens += cached_input_tokens
+        if cached:
+            self.cache_hits += 1
+        
+        for totals, key in (
+            (self.by_model, model),
+            (self.by_provider, provider.value),
+            (self.by_agent, agent_id or "unattributed")
+        ):
+            bucket = totals.get(key)
+            if bucket is None:
+                bucket = totals[key] = {
+                    "requests": 0,
+                    "cache_hits": 0,
+                    "input_tokens": 0,
+                    "cached_input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost": 0.0
+                }
+            bucket["requests"] += 1
+            bucket["cache_hits"] += int(cached)
+            bucket["input_tokens"] += input_tokens
+            bucket["cached_input_tokens"] += cached_input_tokens
+            bucket["output_tokens"] += output_tokens
+            bucket["cost"] += total_cost
+        
         self.requests.append({
             "timestamp": datetime.utcnow().isoformat(),
             "model": model,
             "provider": provider.value,
+            "agent_id": agent_id,
             "input_tokens": input_tokens,
+            "cached_input_tokens": cached_input_tokens,
             "output_tokens": output_tokens,
-            "cost": total_cost
+            "cost": total_cost,
+            "cached": cached
         })
         
+        if self.ledger:
+            self.ledger.record(
+                tenant_id=tenant_id,
+                agent_id=agent_id,
+                model=model,
+                provider=provider.value,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost=total_cost,
+                cached=cached,
+                cached_input_tokens=cached_input_tokens
+            )
+        
+        if cached:
+            logger.info(
+                "llm_cache_hit_tracked",
+                model=model,
+                provider=provider.value
+            )
+            return 0.0
+        
         logger.info(
             "llm_cost_tracked",
             model=model,
             provider=provider.value,
+            agent_id=agent_id,
             input_tokens=input_tokens,
+            cached_input_tokens=cached_input_tokens,
+            cache_write_tokens=cache_write_tokens,
             output_tokens=output_tokens,
             cost=round(total_cost, 4),
             total_cost=round(self.total_cost, 4)
         )
         
-        # Alert if threshold exceeded
-        if (settings.enable_cost_tracking and 
+        # Alert if threshold exceeded (the ledger alerts on shared totals instead)
+        if (settings.enable_cost_tracking and
+            not (self.ledger and self.ledger.active) and
             self.total_cost > settings.cost_alert_threshold):
             logger.warning(
                 "cost_threshold_exceeded",
@@ -94,12 +213,65 @@ class CostTracker:
         
         return total_cost
     
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def pricing_for(model: str) -> Tuple[float, float]:
+        """(input, output) price per 1K tokens, resolved once per model name"""
+        # Normalize model name for pricing lookup; the longest matching key
+        # wins so "gpt-4-turbo-preview" is not priced as "gpt-4"
+        model_key = model.lower()
+        for key in sorted(CostTracker.PRICING, key=len, reverse=True):
+            if key in model_key:
+                pricing = CostTracker.PRICING[key]
+                break
+        else:
+            pricing = CostTracker.DEFAULT_PRICING
+        return pricing["input"], pricing["output"]
+    
+    @classmethod
+    def estimate_cost(
+        cls,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_input_tokens: int = 0,
+        cache_write_tokens: int = 0
+    ) -> float:
+        """Cost of a request with the given token counts"""
+        input_price, output_price = cls.pricing_for(model)
+        read_multiplier = next(
+            (value for key, value in cls.CACHE_READ_MULTIPLIER.items() if key in model.lower()),
+            1.0
+        )
+        uncached_tokens = input_tokens - cached_input_tokens - cache_write_tokens
+        billed_input_tokens = (
+            uncached_tokens
+            + cached_input_tokens * read_multiplier
+            + cache_write_tokens * cls.CACHE_WRITE_MULTIPLIER
+        )
+        return (billed_input_tokens / 1000) * input_price + (output_tokens / 1000) * output_price
+    
+    @staticmethod
+    def _rounded(totals: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """Aggregates with costs rounded for reporting"""
+        return {
+            key: {**bucket, "cost": round(bucket["cost"], 4)}
+            for key, bucket in totals.items()
+        }
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cost tracking statistics"""
+        recent = list(self.requests)
         return {
             "total_cost": round(self.total_cost, 4),
-            "total_requests": len(self.requests),
-            "recent_requests": self.requests[-10:]  # Last 10 requests
+            "total_requests": self.total_requests,
+            "cache_hits": self.cache_hits,
+            "cached_input_tokens": self.cached_input_tokens,
+            "prompt_cache_savings": round(self.prompt_cache_savings, 4),
+            "recent_requests": recent[-10:],  # Last 10 requests
+            "by_model": self._rounded(self.by_model),
+            "by_provider": self._rounded(self.by_provider),
+            "by_agent": self._rounded(self.by_agent)
         }
 
 
@@ -107,209 +279,770 @@ class LLMService:
     """Service for interacting with LLM providers"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
-        self.anthropic_client = Anthropic(api_key=settings.anthropic_api_key)
-        self.cost_tracker = CostTracker() if settings.enable_cost_tracking else None
-        
-        logger.info("llm_service_initialized")
-    
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((OpenAIError, AnthropicError)),
-        reraise=True
-    )
-    async def generate_completion_openai(
-        self,
-        messages: List[Dict[str, str]],
-        model: Optional[str] = None,
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-        **kwargs
-    ) -> Dict[str, Any]:
-        """Generate completion using OpenAI"""
-        start_time = time.time()
-        
-        model = model or settings.openai_model
-        temperature = temperature if temperature is not None else settings.openai_temperature
-        max_tokens = max_tokens or settings.openai_max_tokens
-        
-        try:
-            logger.info(
-                "openai_request_started",
-                model=model,
-                message_count=len(messages)
-            )
-            
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
+        # Shared keep-alive connection pool for all provider clients so
+        # concurrent completions reuse warm TLS connections
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(
+                settings.llm_request_timeout,
+                connect=settings.llm_connect_timeout
             )
-            
-            duration = time.time() - start_time
-            
-            # Extract response data
-            completion = response.choices[0].message.content
-            usage = response.usage
-            
-            # Track costs
-            if self.cost_tracker and usage:
-                self.cost_tracker.track_usage(
-                    model=model,
-                    input_tokens=usage.prompt_tokens,
-                    output_tokens=usage.completion_tokens,
-                    provider=LLMProvider.OPENAI
-                )
-            
-            logger.info(
-                "openai_request_completed",
-                model=model,
-                duration_ms=round(duration * 1000, 2),
-                input_tokens=usage.prompt_tokens if usage else 0,
-                output_tokens=usage.completion_tokens if usage else 0
+        )
+        self.providers: Dict[str, CompletionProvider] = {}
+        self.register_provider(OpenAIProvider(self.http_client))
+        self.register_provider(AnthropicProvider(self.http_client))
+        if settings.enable_fake_provider:
+            self.register_provider(FakeProvider(
+                model=settings.fake_model,
+                economy_model=settings.fake_economy_model,
+                latency_distribution=settings.fake_latency_distribution,
+                latency_ms=settings.fake_latency_ms,
+                latency_spread=settings.fake_latency_spread,
+                first_token_ratio=settings.fake_first_token_ratio,
+                error_rate=settings.fake_error_rate,
+                output_tokens=settings.fake_output_tokens,
+                output_tokens_spread=settings.fake_output_tokens_spread,
+                seed=settings.fake_seed
+            ))
+        self.cost_tracker = CostTracker(
+            recent_requests=settings.cost_tracker_recent_requests,
+            ledger=CostLedger(
+                alert_threshold=settings.cost_alert_threshold,
+                budget_period=settings.tenant_budget_period,
+                default_budget=settings.tenant_default_budget,
+                tenant_budgets=settings.tenant_budget_overrides,
+                budget_action=BudgetAction(settings.tenant_budget_action)
             )
-            
-            return {
-                "content": completion,
-                "model": model,
-                "provider": LLMProvider.OPENAI.value,
-                "usage": {
-                    "input_tokens": usage.prompt_tokens if usage else 0,
-                    "output_tokens": usage.completion_tokens if usage else 0,
-                    "total_tokens": usage.total_tokens if usage else 0
+        ) if settings.enable_cost_tracking else None
+        self.cache = CompletionCache(
+            max_entries=settings.completion_cache_max_entries,
+            ttl_seconds=settings.completion_cache_ttl_seconds
+        ) if settings.enable_completion_cache else None
+        self.semantic_cache = SemanticCache(
+            namespace=settings.semantic_cache_namespace,
+            default_threshold=settings.semantic_cache_threshold,
+            agent_thresholds=settings.semantic_cache_thresholds,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+            sweep_interval=settings.semantic_cache_sweep_interval_seconds
+        ) if settings.enable_semantic_cache else None
+        self.singleflight = SingleFlight() if settings.enable_request_coalescing else None
+        self.latency_tracker = LatencyTracker()
+        self.hedging = HedgingPolicy(
+            latency_tracker=self.latency_tracker,
+            percentile=settings.hedge_latency_percentile,
+            min_samples=settings.hedge_min_samples,
+            default_delay=settings.hedge_default_delay_seconds,
+            min_delay=settings.hedge_min_delay_seconds
+        ) if settings.enable_hedging else None
+        self.retry_policy = RetryPolicy(
+            budget=RetryBudget(
+                ratio=settings.retry_budget_ratio,
+                min_per_second=settings.retry_budget_min_per_second,
+                max_balance=settings.retry_budget_max_balance
+            ),
+            max_retries=settings.llm_max_retries,
+            base_delay=settings.retry_base_delay_seconds,
+            max_delay=settings.retry_max_delay_seconds
+        ) if settings.enable_retries else None
+        self.circuit_breakers = CircuitBreakerRegistry(
+            window_size=settings.circuit_breaker_window_size,
+            min_calls=settings.circuit_breaker_min_calls,
+            failure_rate_threshold=settings.circuit_breaker_failure_rate,
+            slow_call_seconds=settings.circuit_breaker_slow_call_seconds,
+            slow_call_rate_threshold=settings.circuit_breaker_slow_call_rate,
+            cooldown_seconds=settings.circuit_breaker_cooldown_seconds,
+            half_open_max_probes=settings.circuit_breaker_half_open_probes
+        ) if settings.enable_circuit_breaker else None
+        self.rate_limiter = ProviderRateLimiter(
+            requests_per_minute=settings.rate_limit_per_minute,
+            requests_per_hour=settings.rate_limit_per_hour,
+            tokens_per_minute=settings.rate_limit_tokens_per_minute,
+            max_wait_seconds=settings.rate_limit_max_wait_seconds,
+            overrides=settings.rate_limit_overrides
+        ) if settings.enable_rate_limiting else None
+        self.concurrency_limiters = ConcurrencyLimiterRegistry(
+            initial_limit=settings.concurrency_initial_limit,
+            min_limit=settings.concurrency_min_limit,
+            max_limit=settings.concurrency_max_limit,
+            max_queue=settings.concurrency_max_queue,
+            queue_timeout=settings.concurrency_queue_timeout_seconds,
+            backoff_ratio=settings.concurrency_backoff_ratio,
+            latency_threshold=settings.concurrency_latency_threshold_seconds
+        ) if settings.enable_concurrency_limit else None
+        self.token_counter = TokenCounter(
+            min_output_tokens=settings.llm_min_output_tokens,
+            safety_margin=settings.llm_context_safety_margin
+        )
+        self.model_router = ModelRouter(
+            tier_models={
+                ModelTier.ECONOMY: {
+                    name: provider.economy_model for name, provider in self.providers.items()
                 },
-                "metadata": {
-                    "finish_reason": response.choices[0].finish_reason,
-                    "duration_ms": round(duration * 1000, 2)
+                ModelTier.PREMIUM: {
+                    name: provider.default_model for name, provider in self.providers.items()
                 }
-            }
-            
-        except OpenAIError as e:
-            logger.error(
-                "openai_request_failed",
-                error=str(e),
-                model=model
-            )
-            raise
+            },
+            rules={
+                key: ModelTier(tier) for key, tier in settings.llm_routing_policy.items()
+            },
+            economy_max_prompt_tokens=settings.llm_routing_economy_max_prompt_tokens
+        ) if settings.enable_model_routing else None
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        logger.info(
+            "llm_service_initialized",
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections
+        )
+    
+    def register_provider(self, provider: CompletionProvider):
+        """
+        Add a provider or replace the one registered under its name
+        
+        Args:
+            provider: Provider implementation; its name must be an ``LLMProvider`` value
+        """
+        self.providers[provider.name] = provider
+        model_router = getattr(self, "model_router", None)
+        if model_router:
+            model_router.tier_models[ModelTier.ECONOMY][provider.name] = provider.economy_model
+            model_router.tier_models[ModelTier.PREMIUM][provider.name] = provider.default_model
+        logger.info("llm_provider_registered", provider=provider.name)
+    
+    def _provider(self, provider: LLMProvider) -> CompletionProvider:
+        """
+        Implementation of a provider
+        
+        Raises:
+            ValueError: If the provider is not registered (e.g. fake while disabled)
+        """
+        implementation = self.providers.get(provider.value)
+        if implementation is None:
+            raise ValueError(f"LLM provider '{provider.value}' is not enabled")
+        return implementation
+    
+    @staticmethod
+    def _effective_provider(provider: LLMProvider) -> LLMProvider:
+        """The requested provider, unless every call is overridden (e.g. to fake)"""
+        if settings.llm_provider_override:
+            return LLMProvider(settings.llm_provider_override)
+        return provider
+    
+    def _track_usage(self, result: Dict[str, Any]):
+        """Record a provider completion's cost"""
+        if not self.cost_tracker:
+            return
+        usage = result["usage"]
+        self.cost_tracker.track_usage(
+            model=result["model"],
+            input_tokens=usage["input_tokens"],
+            output_tokens=usage["output_tokens"],
+            provider=LLMProvider(result["provider"]),
+            agent_id=current_agent_id.get(),
+            tenant_id=current_tenant_id.get(),
+            cached_input_tokens=usage.get("cached_input_tokens", 0),
+            cache_write_tokens=usage.get("cache_write_tokens", 0)
+        )
+    
+    async def close(self):
+        """Finish background cache and ledger writes and close provider connections"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self.cost_tracker and self.cost_tracker.ledger:
+            await self.cost_tracker.ledger.drain()
+        for provider in self.providers.values():
+            await provider.close()
+        await self.http_client.aclose()
+        logger.info("llm_service_closed")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(AnthropicError),
-        reraise=True
-    )
-    async def generate_completion_anthropic(
+    def _cache_params(
+        self,
+        provider: LLMProvider,
+        kwargs: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve the parameters that identify a cacheable request, or None"""
+        # Extra provider arguments (tools, stop sequences, ...) are not part
+        # of the key, so such requests are never cached
+        if set(kwargs) - {"model", "temperature", "max_tokens"}:
+            return None
+        
+        model = self._resolve_model(provider, kwargs)
+        temperature = kwargs.get("temperature")
+        if temperature is None:
+            temperature = self._provider(provider).default_temperature
+        max_tokens = self._resolve_max_tokens(provider, kwargs)
+        
+        if not CompletionCache.is_cacheable(temperature):
+            return None
+        
+        return {
+            "provider": provider.value,
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    
+    async def _lookup_cache(
         self,
         messages: List[Dict[str, str]],
-        model: Optional[str] = None,
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-        system: Optional[str] = None,
-        **kwargs
-    ) -> Dict[str, Any]:
-        """Generate completion using Anthropic Claude"""
+        provider: LLMProvider,
+        agent_id: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Check the exact-match and semantic caches
+        
+        Returns:
+            Tuple of (cached completion, cache entry). On a miss the cache
+            entry holds what ``_store_cache`` needs to store the result.
+        """
+        if not (self.cache or self.semantic_cache):
+            return None, None
+        
+        params = self._cache_params(provider, kwargs)
+        if not params:
+            return None, None
+        
         start_time = time.time()
+        cache_entry: Dict[str, Any] = {}
         
-        model = model or settings.anthropic_model
-        max_tokens = max_tokens or settings.anthropic_max_tokens
+        if self.cache:
+            cache_entry["key"] = self.cache.make_key(messages, **params)
+            cached = await self.cache.get(cache_entry["key"])
+            if cached:
+                result, tier = cached
+                result["metadata"]["cached"] = True
+                result["metadata"]["cache_tier"] = tier
+                return self._record_cache_hit(result, start_time), None
         
-        try:
-            logger.info(
-                "anthropic_request_started",
-                model=model,
-                message_count=len(messages)
-            )
-            
-            # Anthropic requires system message separately
-            api_messages = [msg for msg in messages if msg["role"] != "system"]
-            if not system:
-                system_msgs = [msg["content"] for msg in messages if msg["role"] == "system"]
-                system = system_msgs[0] if system_msgs else None
-            
-            response = self.anthropic_client.messages.create(
-                model=model,
-                messages=api_messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system,
-                **kwargs
-            )
-            
-            duration = time.time() - start_time
-            
-            # Extract response data
-            completion = response.content[0].text
-            
-            # Track costs
-            if self.cost_tracker:
-                self.cost_tracker.track_usage(
-                    model=model,
-                    input_tokens=response.usage.input_tokens,
-                    output_tokens=response.usage.output_tokens,
-                    provider=LLMProvider.ANTHROPIC
-                )
-            
-            logger.info(
-                "anthropic_request_completed",
-                model=model,
-                duration_ms=round(duration * 1000, 2),
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens
-            )
-            
-            return {
-                "content": completion,
-                "model": model,
-                "provider": LLMProvider.ANTHROPIC.value,
-                "usage": {
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                },
-                "metadata": {
-                    "stop_reason": response.stop_reason,
-                    "duration_ms": round(duration * 1000, 2)
+        if self.semantic_cache and messages and messages[-1]["role"] == "user":
+            # Only the final prompt may be paraphrased; everything before it
+            # must match exactly
+            prompt = messages[-1]["content"]
+            scope = CompletionCache.make_key(messages[:-1], **params)
+            tenant_id = current_tenant_id.get()
+            result, embedding = await self.semantic_cache.lookup(prompt, scope, agent_id, tenant_id)
+            if result:
+                return self._record_cache_hit(result, start_time), None
+            if embedding:
+                cache_entry["semantic"] = {
+                    "prompt": prompt,
+                    "embedding": embedding,
+                    "scope": scope,
+                    "agent_id": agent_id,
+                    "tenant_id": tenant_id
                 }
-            }
-            
-        except AnthropicError as e:
-            logger.error(
-                "anthropic_request_failed",
-                error=str(e),
-                model=model
+        
+        return None, cache_entry
+    
+    def _record_cache_hit(self, result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """Record a cache hit as a zero-cost request"""
+        result["metadata"]["duration_ms"] = round((time.time() - start_time) * 1000, 2)
+        
+        if self.cost_tracker:
+            self.cost_tracker.track_usage(
+                model=result["model"],
+                input_tokens=result["usage"]["input_tokens"],
+                output_tokens=result["usage"]["output_tokens"],
+                provider=LLMProvider(result["provider"]),
+                cached=True,
+                agent_id=current_agent_id.get(),
+                tenant_id=current_tenant_id.get()
             )
-            raise
+        
+        logger.info(
+            "llm_cache_hit",
+            model=result["model"],
+            provider=result["provider"],
+            tier=result["metadata"]["cache_tier"]
+        )
+        return result
+    
+    async def _store_cache(self, cache_entry: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        """Store a fresh completion in the caches that missed"""
+        if not cache_entry:
+            return
+        
+        if "key" in cache_entry:
+            await self.cache.set(cache_entry["key"], result)
+        
+        if "semantic" in cache_entry:
+            # Vector upserts are slow; keep them off the response path
+            task = asyncio.create_task(
+                self.semantic_cache.store(result=result, **cache_entry["semantic"])
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
     
     async def generate_completion(
         self,
         messages: List[Dict[str, str]],
         provider: LLMProvider = LLMProvider.OPENAI,
         fallback: bool = True,
+        use_cache: bool = True,
+        agent_id: Optional[str] = None,
+        template: Optional[str] = None,
+        complexity: Optional[str] = None,
+        cacheable_prefix: Optional[str] = None,
+        deadline: Optional[float] = None,
+        auto_continue: bool = True,
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Generate completion with automatic fallback
+        Generate completion with response caching and automatic fallback
         
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             provider: Primary LLM provider to use
             fallback: Whether to fallback to alternative provider on failure
+            use_cache: Whether the response caches may serve or store this call
+            agent_id: Calling agent, used for cache thresholds and model routing
+            template: Prompt template the request was built from, used for model routing
+            complexity: Optional routing hint ("low" or "high")
+            cacheable_prefix: Fixed preamble of the latest user message, cached
+                by the provider along with the system prompt
+            deadline: Absolute ``time.monotonic()`` deadline; bounds provider
+                timeouts and retries
+            auto_continue: Whether a completion cut off at max_tokens is
+                continued with follow-up calls and merged into one
             **kwargs: Additional arguments passed to the provider
         
         Returns:
             Dictionary containing completion and metadata
+        
+        Raises:
+            DeadlineExceededError: If the deadline passes first
+        """
+        current_agent_id.set(agent_id)
+        if deadline is not None:
+            current_deadline.set(deadline)
+        provider = self._effective_provider(provider)
+        downgrade = await self._check_budget()
+        kwargs = self._route_model(
+            messages, provider, agent_id, template, complexity, downgrade, kwargs
+        )
+        
+        cache_entry = None
+        if use_cache:
+            cached, cache_entry = await self._lookup_cache(messages, provider, agent_id, kwargs)
+            if cached:
+                return cached
+        
+        if cacheable_prefix:
+            kwargs = {**kwargs, "cacheable_prefix": cacheable_prefix}
+        
+        async def generate() -> Dict[str, Any]:
+            result = await self._generate_with_fallback(messages, provider, fallback, **kwargs)
+            if auto_continue:
+                result = await self._continue_completion(messages, result, kwargs)
+            await self._store_cache(cache_entry, result)
+            return result
+        
+        if not self.singleflight:
+            return await self._within_deadline(generate())
+        
+        async def shared_generate() -> Dict[str, Any]:
+            # The shared call outlives any one caller's deadline: each caller
+            # stops waiting at its own, and the call is cancelled once all have
+            current_deadline.set(None)
+            return await generate()
+        
+        # Identical concurrent requests share a single provider call
+        key = self._flight_key(messages, provider, fallback, kwargs)
+        result, shared = await self._within_deadline(self.singleflight.do(key, shared_generate))
+        result = copy.deepcopy(result)
+        result["metadata"]["coalesced"] = shared
+        return result
+    
+    @staticmethod
+    async def _within_deadline(awaitable: Awaitable[Any]) -> Any:
+        """
+        Await generation, cancelling it when the current deadline passes
+        
+        Raises:
+            DeadlineExceededError: If the deadline passes first
         """
+        remaining = time_remaining()
+        if remaining is None:
+            return await awaitable
         try:
-            if provider == LLMProvider.OPENAI:
-                return await self.generate_completion_openai(messages, **kwargs)
-            else:
-                return await self.generate_completion_anthropic(messages, **kwargs)
+            return await asyncio.wait_for(awaitable, max(remaining, 0))
+        except asyncio.TimeoutError:
+            if time_remaining() > 0:
+                raise
+            raise DeadlineExceededError("Request deadline exceeded")
+    
+    @staticmethod
+    def _deadline_kwargs(provider: LLMProvider, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Provider arguments with the time left before the deadline as the request timeout
+        
+        Raises:
+            DeadlineExceededError: If the deadline has already passed
+        """
+        remaining = time_remaining()
+        if remaining is None:
+            return kwargs
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                f"Request deadline exceeded before calling {provider.value}"
+            )
+        return {**kwargs, "timeout": remaining}
+    
+    @staticmethod
+    def _flight_key(
+        messages: List[Dict[str, str]],
+        provider: LLMProvider,
+        fallback: bool,
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Key identifying byte-identical requests for coalescing
+
+        Only calls billed to the same tenant and agent are merged, since the
+        shared provider call's usage is recorded once, for the caller that
+        started it.
+        """
+        canonical = json.dumps(
+            {
+                "tenant_id": current_tenant_id.get(),
+                "agent_id": current_agent_id.get(),
+                "messages": messages,
+                "provider": provider.value,
+                "fallback": fallback,
+                "kwargs": kwargs
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _alternate_provider(provider: LLMProvider) -> LLMProvider:
+        """The provider used for fallback and hedging (other providers back themselves up)"""
+        alternates = {
+            LLMProvider.OPENAI: LLMProvider.ANTHROPIC,
+            LLMProvider.ANTHROPIC: LLMProvider.OPENAI
+        }
+        return alternates.get(provider, provider)
+    
+    def _alternate_kwargs(self, provider: LLMProvider, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Arguments for the alternate provider: the same model tier, else its default model"""
+        alternate_kwargs = {key: value for key, value in kwargs.items() if key != "model"}
+        model = kwargs.get("model")
+        if not model:
+            return alternate_kwargs
+        alternate = self._alternate_provider(provider)
+        if self.model_router:
+            model = self.model_router.equivalent_model(model, provider.value, alternate.value)
+            if model:
+                alternate_kwargs["model"] = model
+        elif model == self._provider(provider).economy_model:
+            # Budget downgrades pin the economy model even without routing
+            alternate_kwargs["model"] = self._provider(alternate).economy_model
+        return alternate_kwargs
+    
+    async def _check_budget(self) -> bool:
+        """
+        Pre-flight check of the calling tenant's budget
+        
+        Returns:
+            True if the call must be downgraded to economy models
+        
+        Raises:
+            BudgetExceededError: If the budget is exhausted and the action is reject
+        """
+        if not self.cost_tracker or not self.cost_tracker.ledger:
+            return False
+        tenant_id = current_tenant_id.get() or DEFAULT_TENANT_ID
+        action, reset_in = await self.cost_tracker.ledger.check_budget(tenant_id)
+        if action == BudgetAction.REJECT:
+            raise BudgetExceededError(
+                f"LLM budget exhausted for tenant {tenant_id}",
+                retry_after=reset_in
+            )
+        return action == BudgetAction.DOWNGRADE
+    
+    def _route_model(
+        self,
+        messages: List[Dict[str, str]],
+        provider: LLMProvider,
+        agent_id: Optional[str],
+        template: Optional[str],
+        complexity: Optional[str],
+        downgrade: bool,
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Choose the model for a call unless the caller pinned one"""
+        if downgrade:
+            # Over-budget tenants get economy models, even when one was pinned
+            model = self._provider(provider).economy_model
+            logger.info("llm_model_downgraded", agent_id=agent_id, model=model)
+            return {**kwargs, "model": model}
+        
+        if not self.model_router or kwargs.get("model"):
+            return kwargs
+        
+        prompt_tokens = self.token_counter.count_messages(
+            messages,
+            provider.value,
+            self._resolve_model(provider, kwargs)
+        )
+        tier, reason = self.model_router.route(agent_id, template, complexity, prompt_tokens)
+        model = self.model_router.model_for(tier, provider.value)
+        
+        logger.info(
+            "llm_model_routed",
+            agent_id=agent_id,
+            template=template,
+            tier=tier.value,
+            reason=reason,
+            model=model,
+            prompt_tokens=prompt_tokens
+        )
+        return {**kwargs, "model": model}
+    
+    def _resolve_model(self, provider: LLMProvider, kwargs: Dict[str, Any]) -> str:
+        """The model a provider call will use"""
+        return kwargs.get("model") or self._provider(provider).default_model
+    
+    def _resolve_max_tokens(self, provider: LLMProvider, kwargs: Dict[str, Any]) -> int:
+        """The completion budget a provider call will request"""
+        return kwargs.get("max_tokens") or self._provider(provider).default_max_tokens
+    
+    def _shape_request(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any], Dict[str, Any]]:
+        """
+        Fit a request into the model's context window and estimate its cost
+        
+        Returns:
+            Tuple of (messages, kwargs with max_tokens set, estimate metadata)
+        
+        Raises:
+            PromptTooLargeError: If the prompt cannot fit the context window
+        """
+        model = self._resolve_model(provider, kwargs)
+        messages, prompt_tokens, max_tokens = self.token_counter.fit_request(
+            messages,
+            provider.value,
+            model,
+            self._resolve_max_tokens(provider, kwargs)
+        )
+        estimated_cost = CostTracker.estimate_cost(model, prompt_tokens, max_tokens)
+        
+        logger.info(
+            "llm_request_estimated",
+            provider=provider.value,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            max_tokens=max_tokens,
+            estimated_max_cost=round(estimated_cost, 4)
+        )
+        
+        estimate = {
+            "estimated_prompt_tokens": prompt_tokens,
+            "estimated_max_cost": round(estimated_cost, 6)
+        }
+        return messages, {**kwargs, "max_tokens": max_tokens}, estimate
+    
+    async def _acquire_rate_limit(
+        self,
+        provider: LLMProvider,
+        kwargs: Dict[str, Any],
+        estimate: Dict[str, Any]
+    ):
+        """
+        Wait for room in the provider/model request and token budgets
+        
+        Raises:
+            RateLimitExceededError: If the budget cannot be met within the maximum wait
+        """
+        if not self.rate_limiter:
+            return
+        await self.rate_limiter.acquire(
+            provider.value,
+            self._resolve_model(provider, kwargs),
+            estimate["estimated_prompt_tokens"] + kwargs["max_tokens"]
+        )
+    
+    def _reserve_breaker(
+        self,
+        provider: LLMProvider,
+        kwargs: Dict[str, Any]
+    ) -> Optional[CircuitBreaker]:
+        """
+        Get permission from the provider/model circuit breaker
+        
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.circuit_breakers:
+            return None
+        breaker = self.circuit_breakers.get(
+            provider.value,
+            self._resolve_model(provider, kwargs)
+        )
+        breaker.before_call()
+        return breaker
+    
+    async def _acquire_concurrency(
+        self,
+        provider: LLMProvider
+    ) -> Optional[AdaptiveConcurrencyLimiter]:
+        """
+        Wait for a slot under the provider's adaptive concurrency limit
+        
+        Raises:
+            ConcurrencyLimitExceededError: If the wait queue is full or the wait times out
+        """
+        if not self.concurrency_limiters:
+            return None
+        limiter = self.concurrency_limiters.get(provider.value)
+        await limiter.acquire()
+        return limiter
+    
+    async def _call_provider(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Call a single provider, retrying transient failures within the retry budget
+        
+        Each retry goes through the rate, concurrency and circuit limits
+        again. Local rejections (open circuit, exhausted rate limit) and
+        non-retryable provider errors such as bad requests fail at once, as
+        do retries that could not finish before the deadline.
+        """
+        implementation = self._provider(provider)
+        if self.retry_policy:
+            self.retry_policy.budget.record_request(provider.value)
+        
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt_provider(provider, messages, **kwargs)
+            except LLMServiceUnavailableError:
+                raise
+            except Exception as e:
+                if not self.retry_policy:
+                    raise
+                delay = self.retry_policy.next_delay(
+                    provider.value,
+                    e,
+                    attempt,
+                    implementation.is_retryable(e),
+                    remaining=time_remaining()
+                )
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.warning(
+                    "llm_retry_scheduled",
+                    provider=provider.value,
+                    attempt=attempt,
+                    delay_seconds=round(delay, 2),
+                    error=str(e)
+                )
+                await asyncio.sleep(delay)
+    
+    async def _attempt_provider(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Call a single provider once through its rate, concurrency and circuit limits, recording latency"""
+        messages, kwargs, estimate = self._shape_request(provider, messages, kwargs)
+        await self._acquire_rate_limit(provider, kwargs, estimate)
+        limiter = await self._acquire_concurrency(provider)
+        try:
+            kwargs = self._deadline_kwargs(provider, kwargs)
+            breaker = self._reserve_breaker(provider, kwargs)
+        except Exception:
+            if limiter:
+                limiter.cancel()
+            raise
+        implementation = self._provider(provider)
+        start_time = time.time()
+        
+        try:
+            result = await implementation.complete(messages, **kwargs)
+        except asyncio.CancelledError:
+            # Cancelled hedges and abandoned calls say nothing about health
+            if breaker:
+                breaker.release()
+            if limiter:
+                limiter.cancel()
+            raise
+        except Exception as e:
+            remaining = time_remaining()
+            if remaining is not None and remaining <= 0:
+                # Cut short by the caller's deadline, which says nothing about health
+                if breaker:
+                    breaker.release()
+                if limiter:
+                    limiter.cancel()
+                raise DeadlineExceededError("Request deadline exceeded") from e
+            if breaker:
+                self._record_breaker_failure(breaker, implementation, e)
+            if limiter:
+                limiter.release(
+                    time.time() - start_time,
+                    isinstance(e, implementation.overload_errors)
+                )
+            raise
+        
+        self._track_usage(result)
+        latency = time.time() - start_time
+        if breaker:
+            breaker.record_success(latency)
+        if limiter:
+            limiter.release(latency, False)
+        self.latency_tracker.record(provider.value, latency)
+        result["metadata"].update(estimate)
+        return result
+    
+    @staticmethod
+    def _record_breaker_failure(
+        breaker: CircuitBreaker,
+        implementation: CompletionProvider,
+        error: Exception
+    ):
+        """Count a failed call against the breaker unless the request itself was at fault"""
+        if implementation.is_retryable(error) or isinstance(error, implementation.overload_errors):
+            breaker.record_failure()
+        else:
+            # Bad requests, context overflows and auth errors say nothing about
+            # provider health, and one caller's must not cut it off for everyone
+            breaker.release()
+    
+    async def _generate_with_fallback(
+        self,
+        messages: List[Dict[str, str]],
+        provider: LLMProvider,
+        fallback: bool,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Generate completion with the primary provider, falling back on failure"""
+        if fallback and self.hedging:
+            return await self._generate_hedged(messages, provider, **kwargs)
+        
+        try:
+            return await self._call_provider(provider, messages, **kwargs)
                 
         except Exception as e:
-            if fallback:
+            if fallback and not isinstance(e, DeadlineExceededError):
                 logger.warning(
                     "llm_fallback_triggered",
                     primary_provider=provider.value,
@@ -317,16 +1050,14 @@ class LLMService:
                 )
                 
                 # Try alternative provider
-                fallback_provider = (
-                    LLMProvider.ANTHROPIC if provider == LLMProvider.OPENAI
-                    else LLMProvider.OPENAI
-                )
+                fallback_provider = self._alternate_provider(provider)
                 
                 try:
-                    if fallback_provider == LLMProvider.OPENAI:
-                        return await self.generate_completion_openai(messages, **kwargs)
-                    else:
-                        return await self.generate_completion_anthropic(messages, **kwargs)
+                    return await self._call_provider(
+                        fallback_provider,
+                        messages,
+                        **self._alternate_kwargs(provider, kwargs)
+                    )
                 except Exception as fallback_error:
                     logger.error(
                         "llm_fallback_failed",
@@ -337,11 +1068,456 @@ class LLMService:
             else:
                 raise
     
-    def get_cost_stats(self) -> Optional[Dict[str, Any]]:
-        """Get cost tracking statistics"""
-        if self.cost_tracker:
-            return self.cost_tracker.get_stats()
-        return None
+    async def _generate_hedged(
+        self,
+        messages: List[Dict[str, str]],
+        provider: LLMProvider,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Race the primary against a delayed hedge on the alternate provider
+        
+        If the primary has not answered within its adaptive hedge delay, the
+        same request is also sent to the alternate provider. The first
+        successful response wins and the other call is cancelled. A primary
+        that fails outright falls back immediately, as without hedging.
+        """
+        hedge_provider = self._alternate_provider(provider)
+        delay = self.hedging.delay_for(provider.value)
+        self.hedging.eligible += 1
+        
+        primary = asyncio.create_task(self._call_provider(provider, messages, **kwargs))
+        tasks = {primary: provider}
+        
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done and not primary.exception():
+                return primary.result()
+            
+            if done:
+                logger.warning(
+                    "llm_fallback_triggered",
+                    primary_provider=provider.value,
+                    error=str(primary.exception())
+                )
+            else:
+                self.hedging.hedged += 1
+                logger.info(
+                    "llm_hedge_triggered",
+                    primary_provider=provider.value,
+                    hedge_provider=hedge_provider.value,
+                    delay_ms=round(delay * 1000, 2)
+                )
+            
+            hedge = asyncio.create_task(
+                self._call_provider(
+                    hedge_provider,
+                    messages,
+                    **self._alternate_kwargs(provider, kwargs)
+                )
+            )
+            tasks[hedge] = hedge_provider
+            
+            pending = {task for task in tasks if not task.done()}
+            last_error = primary.exception() if primary.done() else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        last_error = task.exception()
+                        logger.warning(
+                            "llm_hedged_call_failed",
+                            provider=tasks[task].value,
+                            error=str(last_error)
+                        )
+                        continue
+                    
+                    if task is primary:
+                        self.hedging.primary_wins += 1
+                    else:
+                        self.hedging.hedge_wins += 1
+                    logger.info("llm_hedge_won", provider=tasks[task].value)
+                    return task.result()
+            
+            self.hedging.both_failed += 1
+            logger.error(
+                "llm_fallback_failed",
+                fallback_provider=hedge_provider.value,
+                error=str(last_error)
+            )
+            raise last_error
+        
+        finally:
+            # Cancel the losing (or abandoned) call
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        provider: LLMProvider = LLMProvider.OPENAI,
+        fallback: bool = True,
+        use_cache: bool = True,
+        agent_id: Optional[str] = None,
+        template: Optional[str] = None,
+        complexity: Optional[str] = None,
+        cacheable_prefix: Optional[str] = None,
+        deadline: Optional[float] = None,
+        auto_continue: bool = True,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion with automatic fallback
+        
+        Yields ``{"type": "token", "content": ...}`` events as tokens arrive,
+        followed by a single ``{"type": "done", "completion": ...}`` event
+        whose completion has the same shape as ``generate_completion``.
+        Fallback only happens if the primary fails before its first token.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            provider: Primary LLM provider to use
+            fallback: Whether to fallback to alternative provider on failure
+            use_cache: Whether the response caches may serve or store this call
+            agent_id: Calling agent, used for cache thresholds and model routing
+            template: Prompt template the request was built from, used for model routing
+            complexity: Optional routing hint ("low" or "high")
+            cacheable_prefix: Fixed preamble of the latest user message, cached
+                by the provider along with the system prompt
+            deadline: Absolute ``time.monotonic()`` deadline; bounds provider
+                timeouts before the first token
+            auto_continue: Whether a completion cut off at max_tokens is
+                continued, streaming the follow-up tokens
+            **kwargs: Additional arguments passed to the provider
+        """
+        current_agent_id.set(agent_id)
+        if deadline is not None:
+            current_deadline.set(deadline)
+        provider = self._effective_provider(provider)
+        downgrade = await self._check_budget()
+        kwargs = self._route_model(
+            messages, provider, agent_id, template, complexity, downgrade, kwargs
+        )
+        
+        cache_entry = None
+        if use_cache:
+            cached, cache_entry = await self._lookup_cache(messages, provider, agent_id, kwargs)
+            if cached:
+                yield {"type": "token", "content": cached["content"]}
+                yield {"type": "done", "completion": cached}
+                return
+        
+        if cacheable_prefix:
+            kwargs = {**kwargs, "cacheable_prefix": cacheable_prefix}
+        
+        providers = [(provider, kwargs)]
+        if fallback:
+            providers.append(
+                (self._alternate_provider(provider), self._alternate_kwargs(provider, kwargs))
+            )
+        
+        for index, (current, current_kwargs) in enumerate(providers):
+            started = False
+            try:
+                async for event in self._stream_provider(current, messages, current_kwargs):
+                    started = True
+                    if event["type"] == "done":
+                        completion = event["completion"]
+                        if auto_continue and self._is_truncated(completion):
+                            async for continued in self._stream_continuation(
+                                messages, completion, current_kwargs
+                            ):
+                                if continued["type"] == "token":
+                                    yield continued
+                                else:
+                                    completion = continued["completion"]
+                        await self._store_cache(cache_entry, completion)
+                        event = {"type": "done", "completion": completion}
+                    yield event
+                return
+            except Exception as e:
+                logger.error(
+                    "llm_stream_failed",
+                    provider=current.value,
+                    started=started,
+                    error=str(e)
+                )
+                if started or index == len(providers) - 1:
+                    raise
+                
+                logger.warning(
+                    "llm_fallback_triggered",
+                    primary_provider=current.value,
+                    error=str(e)
+                )
+    
+    async def _stream_provider(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        kwargs: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream from a single provider through its rate, concurrency and circuit limits"""
+        breaker = None
+        limiter = None
+        start_time = None
+        try:
+            messages, kwargs, estimate = self._shape_request(provider, messages, kwargs)
+            await self._acquire_rate_limit(provider, kwargs, estimate)
+            limiter = await self._acquire_concurrency(provider)
+            kwargs = self._deadline_kwargs(provider, kwargs)
+            breaker = self._reserve_breaker(provider, kwargs)
+            if self.retry_policy:
+                self.retry_policy.budget.record_request(provider.value)
+            start_time = time.time()
+            
+            async for event in self._provider(provider).stream(messages, **kwargs):
+                if event["type"] == "done":
+                    self._track_usage(event["completion"])
+                    latency = time.time() - start_time
+                    if breaker:
+                        breaker.record_success(latency)
+                        breaker = None
+                    if limiter:
+                        limiter.release(latency, False)
+                        limiter = None
+                    event["completion"]["metadata"].update(estimate)
+                yield event
+        except Exception as e:
+            if breaker:
+                self._record_breaker_failure(breaker, self._provider(provider), e)
+                breaker = None
+            if limiter and start_time is not None:
+                limiter.release(
+                    time.time() - start_time,
+                    isinstance(e, self._provider(provider).overload_errors)
+                )
+                limiter = None
+            raise
+        finally:
+            # Consumer stopped reading before the stream finished
+            if breaker:
+                breaker.release()
+            if limiter:
+                limiter.cancel()
+    
+    @staticmethod
+    def _is_truncated(completion: Dict[str, Any]) -> bool:
+        """Whether a completion was cut off at max_tokens and is worth continuing"""
+        if not settings.enable_auto_continuation:
+            return False
+        metadata = completion["metadata"]
+        truncated = (
+            metadata.get("finish_reason") == "length"
+            or metadata.get("stop_reason") == "max_tokens"
+        )
+        return (
+            truncated
+            and metadata.get("continuations", 0) < settings.continuation_max_rounds
+            and completion["usage"]["output_tokens"] < settings.continuation_max_output_tokens
+        )
+    
+    def _continuation_request(
+        self,
+        messages: List[Dict[str, str]],
+        completion: Dict[str, Any],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[LLMProvider, List[Dict[str, str]], str, Dict[str, Any]]:
+        """
+        Follow-up request for a truncated completion, on the provider and model that produced it
+        
+        Returns:
+            Tuple of (provider, messages, text the continuation follows, provider arguments)
+        """
+        provider = LLMProvider(completion["provider"])
+        continuation_messages, prefix = self._provider(provider).continuation_messages(
+            messages, completion["content"]
+        )
+        return provider, continuation_messages, prefix, {**kwargs, "model": completion["model"]}
+    
+    @staticmethod
+    def _merge_continuation(
+        completion: Dict[str, Any],
+        prefix: str,
+        continuation: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Join a completion and its continuation into one, summing usage"""
+        metadata = {
+            **completion["metadata"],
+            "duration_ms": round(
+                completion["metadata"].get("duration_ms", 0)
+                + continuation["metadata"].get("duration_ms", 0),
+                2
+            ),
+            "continuations": completion["metadata"].get("continuations", 0) + 1
+        }
+        for key in ("finish_reason", "stop_reason"):
+            if key in continuation["metadata"]:
+                metadata[key] = continuation["metadata"][key]
+        return {
+            **completion,
+            "content": prefix + continuation["content"],
+            "usage": {
+                key: value + continuation["usage"].get(key, 0)
+                for key, value in completion["usage"].items()
+            },
+            "metadata": metadata
+        }
+    
+    async def _continue_completion(
+        self,
+        messages: List[Dict[str, str]],
+        completion: Dict[str, Any],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Continue a completion cut off at max_tokens until it finishes
+        
+        Stops after ``continuation_max_rounds`` follow-up calls or
+        ``continuation_max_output_tokens`` output tokens. A failed follow-up
+        returns what was generated so far rather than discarding it.
+        """
+        while self._is_truncated(completion):
+            provider, continuation_messages, prefix, continuation_kwargs = (
+                self._continuation_request(messages, completion, kwargs)
+            )
+            try:
+                continuation = await self._call_provider(
+                    provider, continuation_messages, **continuation_kwargs
+                )
+            except Exception as e:
+                logger.warning("llm_continuation_failed", provider=provider.value, error=str(e))
+                break
+            completion = self._merge_continuation(completion, prefix, continuation)
+            logger.info(
+                "llm_completion_continued",
+                provider=provider.value,
+                continuations=completion["metadata"]["continuations"],
+                output_tokens=completion["usage"]["output_tokens"]
+            )
+        return completion
+    
+    async def _stream_continuation(
+        self,
+        messages: List[Dict[str, str]],
+        completion: Dict[str, Any],
+        kwargs: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the continuation of a completion cut off at max_tokens
+        
+        Yields the follow-up tokens, then one ``done`` event with the
+        merged completion. Stops like ``_continue_completion``.
+        """
+        while self._is_truncated(completion):
+            provider, continuation_messages, prefix, continuation_kwargs = (
+                self._continuation_request(messages, completion, kwargs)
+            )
+            partial = completion
+            try:
+                async for event in self._stream_provider(
+                    provider, continuation_messages, continuation_kwargs
+                ):
+                    if event["type"] == "token":
+                        yield event
+                    else:
+                        completion = self._merge_continuation(completion, prefix, event["completion"])
+            except Exception as e:
+                logger.warning("llm_continuation_failed", provider=provider.value, error=str(e))
+                break
+            if completion is partial:
+                break
+        yield {"type": "done", "completion": completion}
+    
+    async def generate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: int
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Run many completions with bounded parallelism
+        
+        Yields ``(index, result)`` pairs as each completion finishes, where
+        result is the completion or the exception it raised. Completions
+        still running when the consumer stops are cancelled.
+        
+        Args:
+            items: Keyword arguments for ``generate_completion``, one per completion
+            max_concurrency: Maximum completions in flight at once
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(index: int, item: Dict[str, Any]) -> Tuple[int, Any]:
+            async with semaphore:
+                try:
+                    return index, await self.generate_completion(**item)
+                except Exception as e:
+                    return index, e
+        
+        tasks = [asyncio.create_task(run(index, item)) for index, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def get_cost_stats(self) -> Optional[Dict[str, Any]]:
+        """Get cost tracking statistics for this process and, with Redis, all workers"""
+        if not self.cost_tracker:
+            return None
+        stats = self.cost_tracker.get_stats()
+        if self.cost_tracker.ledger:
+            stats["shared"] = await self.cost_tracker.ledger.get_period_stats("day")
+        return stats
+    
+    async def get_tenant_usage(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Get a tenant's spend against its budget, or None without the shared ledger"""
+        if not self.cost_tracker or not self.cost_tracker.ledger:
+            return None
+        return await self.cost_tracker.ledger.get_tenant_usage(tenant_id)
+    
+    def _get_hedging_metrics(self) -> Optional[Dict[str, Any]]:
+        """Hedging stats with the current per-provider hedge delays"""
+        if not self.hedging:
+            return None
+        stats = self.hedging.get_stats()
+        stats["hedge_delay_ms"] = {
+            name: round(self.hedging.delay_for(name) * 1000, 2)
+            for name in self.providers
+        }
+        return stats
+    
+    def get_provider_health(self) -> Dict[str, str]:
+        """Provider health derived from circuit breaker state"""
+        if not self.circuit_breakers:
+            return {name: "not_checked" for name in self.providers}
+        return {
+            name: self.circuit_breakers.provider_health(name)
+            for name in self.providers
+        }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get performance metrics for the service's components"""
+        return {
+            "completion_cache": self.cache.get_stats() if self.cache else None,
+            "semantic_cache": self.semantic_cache.get_stats() if self.semantic_cache else None,
+            "coalescing": self.singleflight.get_stats() if self.singleflight else None,
+            "hedging": self._get_hedging_metrics(),
+            "retries": self.retry_policy.get_stats() if self.retry_policy else None,
+            "circuit_breakers": self.circuit_breakers.get_stats() if self.circuit_breakers else None,
+            "rate_limits": self.rate_limiter.get_stats() if self.rate_limiter else None,
+            "concurrency": (
+                self.concurrency_limiters.get_stats() if self.concurrency_limiters else None
+            ),
+            "routing": self.model_router.get_stats() if self.model_router else None,
+            "cost_ledger": (
+                self.cost_tracker.ledger.get_stats()
+                if self.cost_tracker and self.cost_tracker.ledger else None
+            )
+        }
 
 
 # Global LLM service instance
@@ -4,18 +4,19 @@ Mission Control Service
 Handles AI orchestration and coordination for Mission Control feature
 """
 
-import os
 import logging
-from typing import Dict, Any, List
-from openai import AsyncOpenAI
+from typing import Dict, Any, List, Optional
 
-logger = logging.getLogger(__name__)
+from app.services.llm_service import llm_service, LLMProvider
 
-# Initialize OpenAI client
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
 
 
-async def analyze_objective(objective: str, context: Dict[str, Any]) -> Dict[str, Any]:
+async def analyze_objective(
+    objective: str,
+    context: Dict[str, Any],
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Analyze a mission objective to determine scope, complexity, and requirements
     """
@@ -37,8 +38,7 @@ Provide your analysis in the following format:
 
 Be specific and actionable."""
 
-        response = await client.chat.completions.create(
-            model="gpt-4",
+        response = await llm_service.generate_completion(
             messages=[
                 {
                     "role": "system",
@@ -49,11 +49,16 @@ Be specific and actionable."""
                     "content": prompt
                 }
             ],
+            provider=LLMProvider.OPENAI,
+            fallback=False,
+            deadline=deadline,
+            agent_id="mission_control",
+            template="analyze_objective",
             temperature=0.7,
             max_tokens=500
         )
 
-        analysis_text = response.choices[0].message.content
+        analysis_text = response["content"]
 
         # Parse the response into structured format
         return {
@@ -73,7 +78,8 @@ async def get_agent_contribution(
     agent_id: str,
     objective: str,
     context: Dict[str, Any],
-    analysis: Dict[str, Any]
+    analysis: Dict[str, Any],
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Get a specific agent's contribution to the mission
@@ -107,8 +113,7 @@ Provide:
 
 Be specific and practical."""
 
-        response = await client.chat.completions.create(
-            model="gpt-4",
+        response = await llm_service.generate_completion(
             messages=[
                 {
                     "role": "system",
@@ -119,11 +124,17 @@ Be specific and practical."""
                     "content": prompt
                 }
             ],
+            provider=LLMProvider.OPENAI,
+            fallback=False,
+            deadline=deadline,
+            agent_id=agent_id,
+            template="mission_contribution",
+            complexity=analysis.get("complexity"),
             temperature=0.7,
             max_tokens=800
         )
 
-        contribution_text = response.choices[0].message.content
+        contribution_text = response["content"]
 
         return {
             "agentId": agent_id,
@@ -142,7 +153,8 @@ async def synthesize_mission_results(
     objective: str,
     context: Dict[str, Any],
     analysis: Dict[str, Any],
-    contributions: List[Dict[str, Any]]
+    contributions: List[Dict[str, Any]],
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Synthesize all agent contributions into a comprehensive mission plan
@@ -176,8 +188,7 @@ Create a structured plan with:
 
 Be specific, actionable, and realistic."""
 
-        response = await client.chat.completions.create(
-            model="gpt-4",
+        response = await llm_service.generate_completion(
             messages=[
                 {
                     "role": "system",
@@ -188,11 +199,17 @@ Be specific, actionable, and realistic."""
                     "content": prompt
                 }
             ],
+            provider=LLMProvider.OPENAI,
+            fallback=False,
+            deadline=deadline,
+            agent_id="mission_control",
+            template="synthesize_results",
+            complexity="high",
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=1000
         )
 
-        plan_text = response.choices[0].message.content
+        plan_text = response["content"]
 
         # Parse into structured format
         return {
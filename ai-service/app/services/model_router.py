@@ -0,0 +1,106 @@
+"""Cost- and latency-aware model selection per LLM call"""
+
+from enum import Enum
+from typing import Optional, Dict, Any, Tuple
+
+
+class ModelTier(str, Enum):
+    """Model tiers a call can be routed to"""
+    ECONOMY = "economy"
+    PREMIUM = "premium"
+
+
+class ModelRouter:
+    """
+    Pick a model tier for each call from a configurable policy
+
+    Decision order:
+    1. A "high" complexity hint always gets the premium tier
+    2. Rules keyed by ``agent:template`` (``*`` matches any agent or template)
+    3. A "low" complexity hint gets the economy tier
+    4. Otherwise the premium tier (the provider's default model)
+
+    Economy routes are escalated to premium when the prompt is larger than
+    ``economy_max_prompt_tokens``: long prompts tend to be complex, and the
+    cheaper models have smaller context windows.
+    """
+
+    def __init__(
+        self,
+        tier_models: Dict[ModelTier, Dict[str, str]],
+        rules: Dict[str, ModelTier],
+        economy_max_prompt_tokens: int
+    ):
+        self.tier_models = tier_models
+        self.rules = rules
+        self.economy_max_prompt_tokens = economy_max_prompt_tokens
+        self.decisions: Dict[str, int] = {}
+
+    def route(
+        self,
+        agent_id: Optional[str],
+        template: Optional[str],
+        complexity: Optional[str],
+        prompt_tokens: int
+    ) -> Tuple[ModelTier, str]:
+        """
+        Choose the tier for a call
+
+        Args:
+            agent_id: Calling agent
+            template: Prompt template the request was built from
+            complexity: Optional caller hint ("low" or "high")
+            prompt_tokens: Estimated prompt tokens
+
+        Returns:
+            Tuple of (tier, reason)
+        """
+        if complexity == "high":
+            tier, reason = ModelTier.PREMIUM, "complexity"
+        else:
+            tier, reason = self._match_rule(agent_id, template)
+            if tier is None:
+                if complexity == "low":
+                    tier, reason = ModelTier.ECONOMY, "complexity"
+                else:
+                    tier, reason = ModelTier.PREMIUM, "default"
+
+        if tier == ModelTier.ECONOMY and prompt_tokens > self.economy_max_prompt_tokens:
+            tier, reason = ModelTier.PREMIUM, "prompt_size"
+
+        decision = f"{tier.value}:{reason}"
+        self.decisions[decision] = self.decisions.get(decision, 0) + 1
+        return tier, reason
+
+    def _match_rule(
+        self,
+        agent_id: Optional[str],
+        template: Optional[str]
+    ) -> Tuple[Optional[ModelTier], str]:
+        """Most specific rule matching the agent and template"""
+        agent_id = agent_id or "*"
+        template = template or "*"
+        for key in (f"{agent_id}:{template}", f"{agent_id}:*", f"*:{template}"):
+            if key in self.rules:
+                return self.rules[key], "rule"
+        return None, ""
+
+    def model_for(self, tier: ModelTier, provider: str) -> str:
+        """Model serving a tier on a provider"""
+        return self.tier_models[tier][provider]
+
+    def equivalent_model(self, model: str, provider: str, target: str) -> Optional[str]:
+        """The target provider's model in the same tier as ``model``, if it is a tier model"""
+        for models in self.tier_models.values():
+            if models.get(provider) == model:
+                return models.get(target)
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Routing decisions by tier and reason"""
+        return {
+            "tiers": {
+                tier.value: models for tier, models in self.tier_models.items()
+            },
+            "decisions": dict(self.decisions)
+        }
@@ -0,0 +1,14 @@
+"""LLM provider plugins"""
+
+from app.services.providers.base import CompletionProvider
+from app.services.providers.openai_provider import OpenAIProvider
+from app.services.providers.anthropic_provider import AnthropicProvider
+from app.services.providers.fake_provider import FakeProvider, FakeProviderError
+
+__all__ = [
+    "CompletionProvider",
+    "OpenAIProvider",
+    "AnthropicProvider",
+    "FakeProvider",
+    "FakeProviderError",
+]
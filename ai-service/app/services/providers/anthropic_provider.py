@@ -0,0 +1,301 @@
+"""Anthropic messages provider"""
+
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+import time
+import httpx
+import structlog
+import anthropic
+from anthropic import AsyncAnthropic, AnthropicError, NOT_GIVEN
+
+from app.config import settings
+from app.services.providers.base import CompletionProvider
+
+logger = structlog.get_logger()
+
+
+# Prompt cache breakpoint (5-minute cache, refreshed on each hit)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+class AnthropicProvider(CompletionProvider):
+    """
+    Anthropic Claude messages
+
+    The system prompt and ``cacheable_prefix`` (a fixed preamble the
+    latest user message starts with) are marked for prompt caching.
+    """
+
+    name = "anthropic"
+    overload_errors = (
+        anthropic.RateLimitError,
+        anthropic.APIConnectionError,
+        anthropic.InternalServerError,
+        httpx.TimeoutException
+    )
+
+    def __init__(self, http_client: httpx.AsyncClient):
+        self.client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+            http_client=http_client,
+            # LLMService retries within its retry budget
+            max_retries=0
+        )
+
+    @property
+    def default_model(self) -> str:
+        return settings.anthropic_model
+
+    @property
+    def economy_model(self) -> str:
+        return settings.anthropic_economy_model
+
+    @property
+    def default_max_tokens(self) -> int:
+        return settings.anthropic_max_tokens
+
+    def continuation_messages(
+        self,
+        messages: List[Dict[str, str]],
+        partial: str
+    ) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Prefill the partial answer so Claude resumes it mid-turn
+
+        A trailing assistant message is continued in place, which keeps the
+        original prompt (and its cache breakpoints) unchanged. The API
+        rejects prefills ending in whitespace, so it is stripped.
+        """
+        prefill = partial.rstrip()
+        return messages + [{"role": "assistant", "content": prefill}], prefill
+
+    @staticmethod
+    def _prompt(
+        messages: List[Dict[str, str]],
+        system: Optional[str],
+        cacheable_prefix: Optional[str]
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        Split out the system prompt and mark stable prefixes for prompt caching
+
+        Cache breakpoints go after the system prompt and after
+        ``cacheable_prefix`` in the latest user message that starts with it.
+        Prefixes shorter than the model's minimum cacheable length are
+        simply not cached by the API.
+
+        Returns:
+            Tuple of (system parameter, messages without system messages)
+        """
+        api_messages: List[Dict[str, Any]] = [msg for msg in messages if msg["role"] != "system"]
+        if not system:
+            system_msgs = [msg["content"] for msg in messages if msg["role"] == "system"]
+            system = system_msgs[0] if system_msgs else None
+
+        if not settings.anthropic_prompt_caching:
+            return system or NOT_GIVEN, api_messages
+
+        user_turns = [index for index, msg in enumerate(api_messages) if msg["role"] == "user"]
+        if cacheable_prefix and user_turns:
+            content = api_messages[user_turns[-1]]["content"]
+            if content.startswith(cacheable_prefix) and len(content) > len(cacheable_prefix):
+                api_messages[user_turns[-1]] = {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": cacheable_prefix, "cache_control": CACHE_CONTROL},
+                        {"type": "text", "text": content[len(cacheable_prefix):]}
+                    ]
+                }
+
+        if not system:
+            return NOT_GIVEN, api_messages
+        return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}], api_messages
+
+    @staticmethod
+    def _input_tokens(usage: Any) -> Tuple[int, int, int]:
+        """
+        Prompt tokens of a response
+
+        Anthropic reports cache reads and writes separately from
+        ``input_tokens``; they are added back so ``input_tokens`` always
+        counts the whole prompt, as it does for OpenAI.
+
+        Returns:
+            Tuple of (input tokens, cache read tokens, cache write tokens)
+        """
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return usage.input_tokens + cache_read + cache_write, cache_read, cache_write
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Generate completion using Anthropic Claude"""
+        start_time = time.time()
+
+        model = model or self.default_model
+        max_tokens = max_tokens or self.default_max_tokens
+
+        try:
+            logger.info(
+                "anthropic_request_started",
+                model=model,
+                message_count=len(messages)
+            )
+
+            # Anthropic requires system message separately
+            system, api_messages = self._prompt(messages, system, cacheable_prefix)
+
+            response = await self.client.messages.create(
+                model=model,
+                messages=api_messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system,
+                **kwargs
+            )
+
+            duration = time.time() - start_time
+
+            # Extract response data
+            completion = response.content[0].text
+            input_tokens, cached_input_tokens, cache_write_tokens = (
+                self._input_tokens(response.usage)
+            )
+            output_tokens = response.usage.output_tokens
+
+            logger.info(
+                "anthropic_request_completed",
+                model=model,
+                duration_ms=round(duration * 1000, 2),
+                input_tokens=input_tokens,
+                cached_input_tokens=cached_input_tokens,
+                cache_write_tokens=cache_write_tokens,
+                output_tokens=output_tokens
+            )
+
+            return {
+                "content": completion,
+                "model": model,
+                "provider": self.name,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                    "cached_input_tokens": cached_input_tokens,
+                    "cache_write_tokens": cache_write_tokens
+                },
+                "metadata": {
+                    "stop_reason": response.stop_reason,
+                    "duration_ms": round(duration * 1000, 2)
+                }
+            }
+
+        except AnthropicError as e:
+            logger.error(
+                "anthropic_request_failed",
+                error=str(e),
+                model=model
+            )
+            raise
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream completion tokens from Anthropic Claude"""
+        start_time = time.time()
+
+        model = model or self.default_model
+        max_tokens = max_tokens or self.default_max_tokens
+
+        logger.info(
+            "anthropic_stream_started",
+            model=model,
+            message_count=len(messages)
+        )
+
+        # Anthropic requires system message separately
+        system, api_messages = self._prompt(messages, system, cacheable_prefix)
+
+        stream = await self.client.messages.create(
+            model=model,
+            messages=api_messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system,
+            stream=True,
+            **kwargs
+        )
+
+        chunks: List[str] = []
+        stop_reason = None
+        input_tokens = 0
+        cached_input_tokens = 0
+        cache_write_tokens = 0
+        output_tokens = 0
+        first_token_ms = None
+
+        try:
+            async for event in stream:
+                if event.type == "message_start":
+                    input_tokens, cached_input_tokens, cache_write_tokens = (
+                        self._input_tokens(event.message.usage)
+                    )
+                elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    if first_token_ms is None:
+                        first_token_ms = round((time.time() - start_time) * 1000, 2)
+                    chunks.append(event.delta.text)
+                    yield {"type": "token", "content": event.delta.text}
+                elif event.type == "message_delta":
+                    stop_reason = event.delta.stop_reason
+                    output_tokens = event.usage.output_tokens
+        finally:
+            # Release the pooled connection if the consumer stops early
+            await stream.close()
+
+        duration = time.time() - start_time
+
+        logger.info(
+            "anthropic_stream_completed",
+            model=model,
+            duration_ms=round(duration * 1000, 2),
+            first_token_ms=first_token_ms,
+            input_tokens=input_tokens,
+            cached_input_tokens=cached_input_tokens,
+            cache_write_tokens=cache_write_tokens,
+            output_tokens=output_tokens
+        )
+
+        yield {
+            "type": "done",
+            "completion": {
+                "content": "".join(chunks),
+                "model": model,
+                "provider": self.name,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                    "cached_input_tokens": cached_input_tokens,
+                    "cache_write_tokens": cache_write_tokens
+                },
+                "metadata": {
+                    "stop_reason": stop_reason,
+                    "duration_ms": round(duration * 1000, 2),
+                    "first_token_ms": first_token_ms
+                }
+            }
+        }
@@ -0,0 +1,147 @@
+"""Interface implemented by every LLM provider"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple, Type
+
+
+# Statuses worth repeating: timeouts, conflicts, rate limits (5xx also retry)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Follow-up turn asking for the rest of a completion cut off at max_tokens
+CONTINUE_PROMPT = (
+    "Continue exactly where your previous message stopped. "
+    "Do not repeat anything and do not add a preamble."
+)
+
+class CompletionProvider(ABC):
+    """
+    A backend that can generate chat completions
+
+    ``LLMService`` owns everything around the call (caching, routing,
+    limits, breakers, hedging, fallback and cost tracking); a provider
+    only translates a request into its API and normalizes the response.
+
+    Completions returned by ``complete`` (and carried by the final
+    ``stream`` event) have the shape::
+
+        {
+            "content": str,
+            "model": str,
+            "provider": str,
+            "usage": {"input_tokens", "output_tokens", "total_tokens",
+                      "cached_input_tokens", "cache_write_tokens"},
+            "metadata": {"duration_ms", ...provider-specific fields}
+        }
+
+    ``input_tokens`` counts the whole prompt, including tokens served from
+    a provider-side prompt cache.
+    """
+
+    #: Provider name used in requests, metrics and limiter keys
+    name: str
+
+    #: Exceptions that signal provider overload and shrink the concurrency limit
+    overload_errors: Tuple[Type[BaseException], ...] = ()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Whether a failed call may succeed if repeated
+
+        HTTP errors are classified by status: 408, 409, 429 and 5xx are
+        transient, other 4xx (bad requests, context length, auth) are not.
+        Errors without a status are transient if they signal overload.
+        """
+        status_code = getattr(error, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+        return isinstance(error, self.overload_errors)
+
+    def continuation_messages(
+        self,
+        messages: List[Dict[str, str]],
+        partial: str
+    ) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Prompt for the rest of a completion that was cut off at max_tokens
+
+        Replays the partial answer as an assistant turn and asks for the
+        remainder in a new user turn.
+
+        Args:
+            messages: Messages of the original request
+            partial: Content generated so far
+
+        Returns:
+            Tuple of (messages, text the continuation's content follows)
+        """
+        return messages + [
+            {"role": "assistant", "content": partial},
+            {"role": "user", "content": CONTINUE_PROMPT}
+        ], partial
+
+    @property
+    @abstractmethod
+    def default_model(self) -> str:
+        """Model used when the caller does not pick one (the premium tier)"""
+
+    @property
+    @abstractmethod
+    def economy_model(self) -> str:
+        """Cheaper model for the economy tier"""
+
+    @property
+    @abstractmethod
+    def default_max_tokens(self) -> int:
+        """Completion budget used when the caller does not set one"""
+
+    @property
+    def default_temperature(self) -> Optional[float]:
+        """Temperature used when the caller does not set one (None: provider default)"""
+        return None
+
+    @abstractmethod
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model override
+            temperature: Temperature override
+            max_tokens: Completion budget override
+            cacheable_prefix: Fixed preamble of the latest user message that
+                the provider may cache along with the system prompt
+            **kwargs: Provider-specific arguments
+
+        Returns:
+            Normalized completion dictionary
+        """
+
+    @abstractmethod
+    def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion
+
+        Yields ``{"type": "token", "content": ...}`` events followed by one
+        ``{"type": "done", "completion": ...}`` event with the normalized
+        completion.
+        """
+
+    async def close(self):
+        """Release provider resources"""
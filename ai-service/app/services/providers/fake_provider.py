@@ -0,0 +1,237 @@
+"""Deterministic local provider for offline load tests and benchmarks"""
+
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import structlog
+
+from app.services.providers.base import CompletionProvider
+
+logger = structlog.get_logger()
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+# Vocabulary for generated text; each word counts as one output token
+WORDS = (
+    "revenue", "growth", "customer", "pipeline", "launch", "strategy", "market",
+    "pricing", "funnel", "retention", "product", "roadmap", "team", "budget",
+    "campaign", "metric", "insight", "risk", "plan", "priority", "week", "focus",
+    "the", "a", "to", "and", "of", "for", "with", "your", "next", "on", "by"
+)
+
+
+class FakeProviderError(Exception):
+    """Failure injected by the fake provider"""
+
+
+class FakeProvider(CompletionProvider):
+    """
+    Simulated LLM backend that never leaves the process
+
+    Responses cost nothing and can be tuned to look like a real provider:
+
+    - latency is drawn per call from a fixed, uniform, normal or lognormal
+      distribution around ``latency_ms`` (``latency_spread`` is the
+      relative spread, or sigma for lognormal)
+    - ``error_rate`` of calls fail with ``FakeProviderError``, which counts
+      as overload for the concurrency limiter and circuit breaker
+    - output length is drawn around ``output_tokens`` and truncated at the
+      request's ``max_tokens`` with a ``length`` finish reason
+    - calls slower than the request ``timeout`` fail with
+      ``FakeProviderError`` once it elapses, like an SDK timeout
+
+    Text is a deterministic function of the request, so identical prompts
+    get identical completions. Latency, failures and lengths come from an
+    RNG seeded with ``seed``, so a sequential run is reproducible.
+    """
+
+    name = "fake"
+    overload_errors = (FakeProviderError,)
+
+    def __init__(
+        self,
+        model: str,
+        economy_model: str,
+        latency_distribution: str,
+        latency_ms: float,
+        latency_spread: float,
+        first_token_ratio: float,
+        error_rate: float,
+        output_tokens: int,
+        output_tokens_spread: float,
+        seed: int
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}', "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.model = model
+        self._economy_model = economy_model
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.first_token_ratio = first_token_ratio
+        self.error_rate = error_rate
+        self.output_tokens = output_tokens
+        self.output_tokens_spread = output_tokens_spread
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    @property
+    def default_model(self) -> str:
+        return self.model
+
+    @property
+    def economy_model(self) -> str:
+        return self._economy_model
+
+    @property
+    def default_max_tokens(self) -> int:
+        return max(1, int(self.output_tokens * (1 + 3 * self.output_tokens_spread)))
+
+    def _sample_latency(self) -> float:
+        """Seconds the next call takes"""
+        median = self.latency_ms / 1000
+        if self.latency_distribution == "fixed":
+            latency = median
+        elif self.latency_distribution == "uniform":
+            latency = median * self._random.uniform(1 - self.latency_spread, 1 + self.latency_spread)
+        elif self.latency_distribution == "normal":
+            latency = self._random.gauss(median, median * self.latency_spread)
+        else:
+            latency = median * math.exp(self._random.gauss(0, self.latency_spread))
+        return max(0.0, latency)
+
+    def _sample_output_tokens(self, max_tokens: int) -> Tuple[int, str]:
+        """Output length of the next call and its finish reason"""
+        tokens = max(1, round(self._random.gauss(
+            self.output_tokens,
+            self.output_tokens * self.output_tokens_spread
+        )))
+        if tokens > max_tokens:
+            return max_tokens, "length"
+        return tokens, "stop"
+
+    def _words(self, messages: List[Dict[str, str]], model: str, tokens: int) -> List[str]:
+        """Deterministic completion text for a request"""
+        digest = hashlib.sha256(
+            json.dumps([self.seed, model, messages], sort_keys=True).encode("utf-8")
+        ).digest()
+        rng = random.Random(digest)
+        return [rng.choice(WORDS) for _ in range(tokens)]
+
+    @staticmethod
+    def _prompt_tokens(messages: List[Dict[str, str]]) -> int:
+        """Rough prompt size: about four characters per token"""
+        return sum(3 + len(msg.get("content") or "") // 4 for msg in messages) + 3
+
+    def _start_call(self, max_tokens: Optional[int]) -> Tuple[float, bool, int, str]:
+        """Draw a call's latency, failure and output length"""
+        latency = self._sample_latency()
+        failed = self._random.random() < self.error_rate
+        tokens, finish_reason = self._sample_output_tokens(max_tokens or self.default_max_tokens)
+        return latency, failed, tokens, finish_reason
+
+    def _completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        words: List[str],
+        finish_reason: str,
+        duration: float,
+        first_token_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Normalized completion"""
+        input_tokens = self._prompt_tokens(messages)
+        metadata: Dict[str, Any] = {
+            "finish_reason": finish_reason,
+            "duration_ms": round(duration * 1000, 2)
+        }
+        if first_token_ms is not None:
+            metadata["first_token_ms"] = first_token_ms
+        return {
+            "content": " ".join(words),
+            "model": model,
+            "provider": self.name,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": len(words),
+                "total_tokens": input_tokens + len(words),
+                "cached_input_tokens": 0,
+                "cache_write_tokens": 0
+            },
+            "metadata": metadata
+        }
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Generate a simulated completion"""
+        start_time = time.time()
+        model = model or self.default_model
+        latency, failed, tokens, finish_reason = self._start_call(max_tokens)
+
+        if failed:
+            # Failures surface part-way through a call, like real timeouts and 5xx
+            await asyncio.sleep(latency * self.first_token_ratio)
+            raise FakeProviderError("Injected fake provider failure")
+
+        if timeout is not None and latency > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeProviderError("Fake provider request timed out")
+
+        await asyncio.sleep(latency)
+        words = self._words(messages, model, tokens)
+        return self._completion(messages, model, words, finish_reason, time.time() - start_time)
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a simulated completion, spreading tokens over the sampled latency"""
+        start_time = time.time()
+        model = model or self.default_model
+        latency, failed, tokens, finish_reason = self._start_call(max_tokens)
+
+        first_token = latency * self.first_token_ratio
+        if timeout is not None and first_token > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeProviderError("Fake provider request timed out")
+
+        await asyncio.sleep(first_token)
+        if failed:
+            raise FakeProviderError("Injected fake provider failure")
+
+        words = self._words(messages, model, tokens)
+        first_token_ms = round((time.time() - start_time) * 1000, 2)
+        interval = latency * (1 - self.first_token_ratio) / len(words)
+        for index, word in enumerate(words):
+            if index:
+                await asyncio.sleep(interval)
+            yield {"type": "token", "content": word if index == 0 else f" {word}"}
+
+        yield {
+            "type": "done",
+            "completion": self._completion(
+                messages, model, words, finish_reason, time.time() - start_time, first_token_ms
+            )
+        }
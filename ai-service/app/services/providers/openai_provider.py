@@ -0,0 +1,228 @@
+"""OpenAI chat completions provider"""
+
+from typing import Optional, Dict, Any, List, AsyncIterator
+import time
+import httpx
+import structlog
+import openai
+from openai import AsyncOpenAI, OpenAIError
+
+from app.config import settings
+from app.services.providers.base import CompletionProvider
+
+logger = structlog.get_logger()
+
+
+class OpenAIProvider(CompletionProvider):
+    """
+    OpenAI chat completions
+
+    OpenAI caches long prompt prefixes automatically, so
+    ``cacheable_prefix`` needs no request changes; cached prompt tokens are
+    reported in usage.
+    """
+
+    name = "openai"
+    overload_errors = (
+        openai.RateLimitError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        httpx.TimeoutException
+    )
+
+    def __init__(self, http_client: httpx.AsyncClient):
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+            http_client=http_client,
+            # LLMService retries within its retry budget
+            max_retries=0
+        )
+
+    @property
+    def default_model(self) -> str:
+        return settings.openai_model
+
+    @property
+    def economy_model(self) -> str:
+        return settings.openai_economy_model
+
+    @property
+    def default_max_tokens(self) -> int:
+        return settings.openai_max_tokens
+
+    @property
+    def default_temperature(self) -> Optional[float]:
+        return settings.openai_temperature
+
+    @staticmethod
+    def _cached_tokens(usage: Any) -> int:
+        """Prompt tokens OpenAI served from its automatic prompt cache"""
+        details = getattr(usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            return details.get("cached_tokens") or 0
+        return getattr(details, "cached_tokens", None) or 0
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Generate completion using OpenAI"""
+        start_time = time.time()
+
+        model = model or self.default_model
+        temperature = temperature if temperature is not None else self.default_temperature
+        max_tokens = max_tokens or self.default_max_tokens
+
+        try:
+            logger.info(
+                "openai_request_started",
+                model=model,
+                message_count=len(messages)
+            )
+
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+
+            duration = time.time() - start_time
+
+            # Extract response data
+            completion = response.choices[0].message.content
+            usage = response.usage
+            cached_input_tokens = self._cached_tokens(usage)
+
+            logger.info(
+                "openai_request_completed",
+                model=model,
+                duration_ms=round(duration * 1000, 2),
+                input_tokens=usage.prompt_tokens if usage else 0,
+                cached_input_tokens=cached_input_tokens,
+                output_tokens=usage.completion_tokens if usage else 0
+            )
+
+            return {
+                "content": completion,
+                "model": model,
+                "provider": self.name,
+                "usage": {
+                    "input_tokens": usage.prompt_tokens if usage else 0,
+                    "output_tokens": usage.completion_tokens if usage else 0,
+                    "total_tokens": usage.total_tokens if usage else 0,
+                    "cached_input_tokens": cached_input_tokens,
+                    "cache_write_tokens": 0
+                },
+                "metadata": {
+                    "finish_reason": response.choices[0].finish_reason,
+                    "duration_ms": round(duration * 1000, 2)
+                }
+            }
+
+        except OpenAIError as e:
+            logger.error(
+                "openai_request_failed",
+                error=str(e),
+                model=model
+            )
+            raise
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream completion tokens from OpenAI"""
+        start_time = time.time()
+
+        model = model or self.default_model
+        temperature = temperature if temperature is not None else self.default_temperature
+        max_tokens = max_tokens or self.default_max_tokens
+
+        logger.info(
+            "openai_stream_started",
+            model=model,
+            message_count=len(messages)
+        )
+
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+
+        chunks: List[str] = []
+        finish_reason = None
+        usage = None
+        first_token_ms = None
+
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                if choice.delta and choice.delta.content:
+                    if first_token_ms is None:
+                        first_token_ms = round((time.time() - start_time) * 1000, 2)
+                    chunks.append(choice.delta.content)
+                    yield {"type": "token", "content": choice.delta.content}
+        finally:
+            # Release the pooled connection if the consumer stops early
+            await stream.close()
+
+        duration = time.time() - start_time
+        input_tokens = usage.prompt_tokens if usage else 0
+        output_tokens = usage.completion_tokens if usage else 0
+        cached_input_tokens = self._cached_tokens(usage)
+
+        logger.info(
+            "openai_stream_completed",
+            model=model,
+            duration_ms=round(duration * 1000, 2),
+            first_token_ms=first_token_ms,
+            input_tokens=input_tokens,
+            cached_input_tokens=cached_input_tokens,
+            output_tokens=output_tokens
+        )
+
+        yield {
+            "type": "done",
+            "completion": {
+                "content": "".join(chunks),
+                "model": model,
+                "provider": self.name,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                    "cached_input_tokens": cached_input_tokens,
+                    "cache_write_tokens": 0
+                },
+                "metadata": {
+                    "finish_reason": finish_reason,
+                    "duration_ms": round(duration * 1000, 2),
+                    "first_token_ms": first_token_ms
+                }
+            }
+        }
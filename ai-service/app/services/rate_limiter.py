@@ -0,0 +1,283 @@
+"""Client-side token-bucket rate limiting for provider RPM/TPM limits"""
+
+from typing import Dict, Any, List, Tuple
+import asyncio
+import math
+import time
+import structlog
+
+from app.services.call_context import time_remaining
+from app.services.errors import DeadlineExceededError, RateLimitExceededError
+from app.services.redis_client import redis_manager
+
+logger = structlog.get_logger()
+
+
+# Reserve capacity from several token buckets atomically.
+#
+# Buckets may go negative: a request that cannot be served right away
+# reserves its tokens and is told how long to wait, which queues callers
+# in arrival order across all replicas. Requests whose wait would exceed
+# the maximum are rejected without reserving anything.
+#
+# KEYS: bucket keys
+# ARGV: max_wait_ms, then (capacity, refill_per_ms, cost) for each key
+# Returns: {admitted (0/1), wait_ms}
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + now_parts[2] / 1000
+local max_wait = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+
+for i, key in ipairs(KEYS) do
+    local base = 1 + (i - 1) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    levels[i] = tokens
+    if cost > tokens then
+        wait = math.max(wait, (cost - tokens) / rate)
+    end
+end
+
+if wait > max_wait then
+    return {0, math.ceil(wait)}
+end
+
+for i, key in ipairs(KEYS) do
+    local base = 1 + (i - 1) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    redis.call('HSET', key, 'tokens', tostring(levels[i] - cost), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate) + 60000)
+end
+
+return {1, math.ceil(wait)}
+"""
+
+# Return capacity reserved by TOKEN_BUCKET_SCRIPT for a request that gave
+# up while waiting for it. Buckets that expired meanwhile are left alone.
+#
+# KEYS: bucket keys
+# ARGV: (capacity, cost) for each key
+REFUND_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local cost = tonumber(ARGV[i * 2])
+    local tokens = tonumber(redis.call('HGET', key, 'tokens'))
+    if tokens then
+        redis.call('HSET', key, 'tokens', tostring(math.min(capacity, tokens + cost)))
+    end
+end
+return 1
+"""
+
+
+class ProviderRateLimiter:
+    """
+    Shared request and token budgets per provider and model
+
+    Each provider/model has three buckets: requests per minute, requests
+    per hour and tokens per minute; a limit of 0 disables its bucket.
+    State lives in Redis so every worker and replica draws from the same
+    budget. When Redis is unavailable the limiter falls back to
+    per-process buckets.
+    """
+
+    KEY_PREFIX = "llm:ratelimit:"
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        requests_per_hour: int,
+        tokens_per_minute: int,
+        max_wait_seconds: float,
+        overrides: Dict[str, Tuple[int, int]]
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.requests_per_hour = requests_per_hour
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait_ms = max_wait_seconds * 1000
+        self.overrides = overrides
+        self._local_buckets: Dict[str, Tuple[float, float]] = {}
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+
+    def _buckets(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int
+    ) -> List[Tuple[str, float, float, float]]:
+        """Bucket definitions as (key, capacity, refill per ms, cost), without disabled ones"""
+        rpm, tpm = self.overrides.get(
+            f"{provider}:{model}",
+            (self.requests_per_minute, self.tokens_per_minute)
+        )
+        prefix = f"{self.KEY_PREFIX}{provider}:{model}"
+        limits = [
+            ("rpm", rpm, 60000, 1),
+            ("rph", self.requests_per_hour, 3600000, 1),
+            ("tpm", tpm, 60000, estimated_tokens)
+        ]
+        return [
+            (f"{prefix}:{name}", limit, limit / window_ms, cost)
+            for name, limit, window_ms, cost in limits
+            if limit > 0
+        ]
+
+    async def acquire(self, provider: str, model: str, estimated_tokens: int):
+        """
+        Wait until the request fits the provider's budgets
+
+        The wait is bounded by the current call's deadline as well as the
+        maximum wait. Capacity reserved for a caller that is cancelled
+        while waiting is returned to the buckets.
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed the maximum
+            DeadlineExceededError: If the wait would outlast the deadline
+        """
+        buckets = self._buckets(provider, model, estimated_tokens)
+        if not buckets:
+            return
+
+        max_wait_ms = self.max_wait_ms
+        remaining = time_remaining()
+        if remaining is not None:
+            max_wait_ms = min(max_wait_ms, max(remaining, 0) * 1000)
+
+        admitted, wait_ms, distributed = await self._reserve(buckets, max_wait_ms)
+        if not admitted:
+            self.rejected += 1
+            logger.warning(
+                "llm_rate_limit_rejected",
+                provider=provider,
+                model=model,
+                estimated_tokens=estimated_tokens,
+                wait_ms=wait_ms
+            )
+            if wait_ms <= self.max_wait_ms:
+                raise DeadlineExceededError(
+                    f"Request deadline exceeded waiting for the {provider}:{model} rate limit"
+                )
+            raise RateLimitExceededError(
+                f"Rate limit exceeded for {provider}:{model}",
+                retry_after=wait_ms / 1000
+            )
+
+        self.admitted += 1
+        if wait_ms > 0:
+            self.queued += 1
+            self.total_wait_ms += wait_ms
+            logger.info(
+                "llm_rate_limit_queued",
+                provider=provider,
+                model=model,
+                wait_ms=wait_ms
+            )
+            try:
+                await asyncio.sleep(wait_ms / 1000)
+            except asyncio.CancelledError:
+                await self._refund(buckets, distributed)
+                raise
+
+    async def _reserve(
+        self,
+        buckets: List[Tuple[str, float, float, float]],
+        max_wait_ms: float
+    ) -> Tuple[bool, float, bool]:
+        """
+        Reserve capacity in Redis, falling back to local buckets
+
+        Returns:
+            Tuple of (admitted, wait_ms, distributed) where distributed is
+            True if the capacity was reserved in Redis
+        """
+        client = redis_manager.client
+        if client:
+            try:
+                args: List[Any] = [max_wait_ms]
+                for _, capacity, rate, cost in buckets:
+                    args.extend([capacity, rate, cost])
+                admitted, wait_ms = await client.eval(
+                    TOKEN_BUCKET_SCRIPT,
+                    len(buckets),
+                    *[key for key, _, _, _ in buckets],
+                    *args
+                )
+                return bool(admitted), float(wait_ms), True
+            except Exception as e:
+                logger.warning("llm_rate_limit_redis_failed", error=str(e))
+
+        admitted, wait_ms = self._reserve_local(buckets, max_wait_ms)
+        return admitted, wait_ms, False
+
+    def _reserve_local(
+        self,
+        buckets: List[Tuple[str, float, float, float]],
+        max_wait_ms: float
+    ) -> Tuple[bool, float]:
+        """Per-process equivalent of TOKEN_BUCKET_SCRIPT"""
+        now = time.monotonic() * 1000
+        wait = 0.0
+        levels = []
+        for key, capacity, rate, cost in buckets:
+            tokens, ts = self._local_buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            levels.append(tokens)
+            if cost > tokens:
+                wait = max(wait, (cost - tokens) / rate)
+
+        if wait > max_wait_ms:
+            return False, math.ceil(wait)
+
+        for (key, _, _, cost), tokens in zip(buckets, levels):
+            self._local_buckets[key] = (tokens - cost, now)
+        return True, math.ceil(wait)
+
+    async def _refund(self, buckets: List[Tuple[str, float, float, float]], distributed: bool):
+        """Return capacity reserved for a request that stopped waiting"""
+        logger.info("llm_rate_limit_refunded", buckets=[key for key, _, _, _ in buckets])
+        if not distributed:
+            for key, capacity, _, cost in buckets:
+                if key in self._local_buckets:
+                    tokens, ts = self._local_buckets[key]
+                    self._local_buckets[key] = (min(capacity, tokens + cost), ts)
+            return
+
+        client = redis_manager.client
+        if not client:
+            return
+        try:
+            args: List[Any] = []
+            for _, capacity, _, cost in buckets:
+                args.extend([capacity, cost])
+            await client.eval(
+                REFUND_SCRIPT,
+                len(buckets),
+                *[key for key, _, _, _ in buckets],
+                *args
+            )
+        except Exception as e:
+            logger.warning("llm_rate_limit_refund_failed", error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": (
+                round(self.total_wait_ms / self.queued, 2) if self.queued else 0.0
+            ),
+            "distributed": redis_manager.client is not None
+        }
@@ -0,0 +1,54 @@
+"""Shared Redis connection for auxiliary services (caching, limits, accounting)"""
+
+from typing import Optional
+import structlog
+import redis.asyncio as redis
+from redis.asyncio import Redis
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+class RedisConnectionManager:
+    """
+    Lazily shared Redis connection pool
+
+    Services that can degrade gracefully without Redis (e.g. caches) use
+    this pool. A failed connection is logged and leaves ``client`` as None
+    instead of preventing startup.
+    """
+
+    def __init__(self):
+        self._redis: Optional[Redis] = None
+
+    @property
+    def client(self) -> Optional[Redis]:
+        """Connected Redis client, or None when unavailable"""
+        return self._redis
+
+    async def connect(self):
+        """Initialize Redis connection pool"""
+        try:
+            self._redis = await redis.from_url(
+                settings.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                max_connections=settings.redis_max_connections
+            )
+            await self._redis.ping()
+            logger.info("shared_redis_connected")
+        except Exception as e:
+            logger.warning("shared_redis_unavailable", error=str(e))
+            self._redis = None
+
+    async def disconnect(self):
+        """Close Redis connection"""
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+            logger.info("shared_redis_disconnected")
+
+
+# Global shared Redis connection manager
+redis_manager = RedisConnectionManager()
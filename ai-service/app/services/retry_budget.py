@@ -0,0 +1,207 @@
+"""Retry scheduling and a global retry budget for LLM provider calls"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+import random
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Server-requested wait before retrying, from a provider error's response
+
+    Reads ``retry-after-ms`` (OpenAI) and ``retry-after`` (seconds or an
+    HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the response does not say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Token bucket capping retries at a fraction of live traffic
+
+    Every first attempt deposits ``ratio`` tokens and every retry
+    withdraws one, so retries stay at about ``ratio`` of requests no matter
+    how many calls fail. ``min_per_second`` tokens accrue with time so a
+    quiet process can still retry, and the balance is capped at
+    ``max_balance`` so an idle period cannot bank a retry storm.
+
+    The budget is shared by all providers; counters are kept per provider.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_balance: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated = time.monotonic()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _counter(self, provider: str) -> Dict[str, int]:
+        counter = self._counters.get(provider)
+        if counter is None:
+            counter = {
+                "requests": 0,
+                "retries": 0,
+                "budget_exhausted": 0,
+                "non_retryable": 0,
+                "retry_after_honored": 0,
+                "retry_after_too_long": 0,
+                "deadline_too_close": 0
+            }
+            self._counters[provider] = counter
+        return counter
+
+    def _refill(self):
+        now = time.monotonic()
+        self._balance = min(
+            self.max_balance,
+            self._balance + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+    def record_request(self, provider: str):
+        """Deposit for a first attempt"""
+        self._refill()
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+        self._counter(provider)["requests"] += 1
+
+    def try_acquire(self, provider: str) -> bool:
+        """Withdraw one retry, or record that the budget is exhausted"""
+        self._refill()
+        if self._balance < 1:
+            self._counter(provider)["budget_exhausted"] += 1
+            return False
+        self._balance -= 1
+        self._counter(provider)["retries"] += 1
+        return True
+
+    def record(self, provider: str, outcome: str):
+        """Count a retry decision that did not withdraw from the budget"""
+        self._counter(provider)[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the budget balance and per-provider retry counts"""
+        self._refill()
+        return {
+            "ratio": self.ratio,
+            "balance": round(self._balance, 2),
+            "providers": {
+                provider: {
+                    **counter,
+                    "retry_rate": (
+                        round(counter["retries"] / counter["requests"], 4)
+                        if counter["requests"] else 0.0
+                    )
+                }
+                for provider, counter in self._counters.items()
+            }
+        }
+
+
+class RetryPolicy:
+    """
+    Decide whether and when to retry a failed provider call
+
+    Only errors the provider classifies as transient are retried, at most
+    ``max_retries`` times and only while the global budget allows. A
+    ``Retry-After`` from the provider replaces the jittered exponential
+    backoff; one longer than ``max_delay`` is not waited out, so the call
+    fails over to the fallback provider instead. Nor is a retry scheduled
+    whose wait would run past the caller's deadline.
+    """
+
+    def __init__(
+        self,
+        budget: RetryBudget,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float
+    ):
+        self.budget = budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt + 1``"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def next_delay(
+        self,
+        provider: str,
+        error: Exception,
+        attempt: int,
+        retryable: bool,
+        remaining: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Delay before retrying a failed call
+
+        Args:
+            provider: Provider that failed
+            error: The provider error
+            attempt: Retries already made for this call
+            retryable: Whether the provider classifies the error as transient
+            remaining: Seconds left before the caller's deadline, if any
+
+        Returns:
+            Seconds to wait before the retry, or None to give up
+        """
+        if attempt >= self.max_retries:
+            return None
+        if not retryable:
+            self.budget.record(provider, "non_retryable")
+            return None
+
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None and retry_after > self.max_delay:
+            self.budget.record(provider, "retry_after_too_long")
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        if remaining is not None and delay >= remaining:
+            self.budget.record(provider, "deadline_too_close")
+            return None
+        if not self.budget.try_acquire(provider):
+            logger.warning("llm_retry_budget_exhausted", provider=provider)
+            return None
+
+        if retry_after is not None:
+            self.budget.record(provider, "retry_after_honored")
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get retry budget and per-provider retry statistics"""
+        return {"max_retries": self.max_retries, **self.budget.get_stats()}
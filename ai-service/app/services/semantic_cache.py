@@ -0,0 +1,260 @@
+"""Semantic response cache for paraphrased LLM prompts"""
+
+from typing import Optional, Dict, Any, List, Tuple
+import hashlib
+import json
+import time
+import structlog
+
+from app.config import settings
+from app.services.cost_ledger import DEFAULT_TENANT_ID
+from app.services.redis_client import redis_manager
+
+logger = structlog.get_logger()
+
+# Pinecone rejects vectors whose metadata exceeds 40 KB
+MAX_METADATA_BYTES = 40 * 1024
+
+# Response metadata a semantic hit returns; the rest describes the original call
+RESPONSE_METADATA_FIELDS = ("finish_reason", "stop_reason", "continuations")
+
+# Pinecone deletes at most 1000 ids per request
+SWEEP_BATCH_SIZE = 1000
+
+
+class SemanticCache:
+    """
+    Near-duplicate prompt cache backed by the vector service
+
+    The final user prompt is embedded and compared against prior prompts
+    stored in a dedicated namespace. A stored answer is only reused when:
+    - it was generated for the same tenant, since paraphrase-level
+      similarity cannot tell apart prompts about different tenants' data,
+    - everything before the final prompt matches exactly (the ``scope``:
+      provider, model, sampling parameters and earlier messages), and
+    - the similarity is above the threshold configured for the agent.
+
+    Lookups ignore entries older than ``ttl_seconds``. Stored vector ids are
+    indexed by creation time in Redis, and expired vectors are deleted from
+    the index at most once per ``sweep_interval`` across replicas.
+    """
+
+    EXPIRY_KEY_PREFIX = "llm:semantic_cache:expiry:"
+    SWEEP_LOCK_PREFIX = "llm:semantic_cache:sweep:"
+
+    def __init__(
+        self,
+        namespace: str,
+        default_threshold: float,
+        agent_thresholds: Dict[str, float],
+        ttl_seconds: int,
+        sweep_interval: int
+    ):
+        self.namespace = namespace
+        self.default_threshold = default_threshold
+        self.agent_thresholds = agent_thresholds
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self.lookups = 0
+        self.hits = 0
+        self.false_hits = 0
+        self.errors = 0
+        self.oversized = 0
+        self.expired = 0
+        self._hit_similarity_total = 0.0
+
+    def threshold_for(self, agent_id: Optional[str]) -> float:
+        """Get the similarity threshold for an agent"""
+        return self.agent_thresholds.get(agent_id or "", self.default_threshold)
+
+    @staticmethod
+    def _vector_id(tenant_id: str, scope: str, prompt: str) -> str:
+        """Deterministic vector ID so repeated stores overwrite each other"""
+        return hashlib.sha256(f"{tenant_id}:{scope}:{prompt}".encode("utf-8")).hexdigest()[:32]
+
+    async def lookup(
+        self,
+        prompt: str,
+        scope: str,
+        agent_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Find a stored answer for a near-duplicate prompt
+
+        Returns:
+            Tuple of (completion or None, prompt embedding). The embedding
+            is returned so a subsequent ``store`` does not re-embed.
+        """
+        from app.services.vector_service import vector_service
+
+        threshold = self.threshold_for(agent_id)
+        if threshold > 1.0:
+            return None, None
+
+        self.lookups += 1
+        try:
+            embedding = await vector_service.generate_embedding(prompt)
+            matches = await vector_service.query_vectors(
+                vector=embedding,
+                top_k=1,
+                namespace=self.namespace,
+                filter_metadata={
+                    "tenant_id": tenant_id or DEFAULT_TENANT_ID,
+                    "scope": scope,
+                    "created_at": {"$gte": time.time() - self.ttl_seconds}
+                }
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("semantic_cache_lookup_failed", error=str(e))
+            return None, None
+
+        if not matches or matches[0]["score"] < threshold:
+            return None, embedding
+
+        match = matches[0]
+        result = json.loads(match["metadata"]["completion"])
+        result["metadata"]["cached"] = True
+        result["metadata"]["cache_tier"] = "semantic"
+        result["metadata"]["cache_entry_id"] = match["id"]
+        result["metadata"]["similarity"] = round(match["score"], 4)
+
+        self.hits += 1
+        self._hit_similarity_total += match["score"]
+
+        logger.info(
+            "semantic_cache_hit",
+            agent_id=agent_id,
+            similarity=round(match["score"], 4),
+            threshold=threshold
+        )
+        return result, embedding
+
+    async def store(
+        self,
+        prompt: str,
+        embedding: List[float],
+        scope: str,
+        result: Dict[str, Any],
+        agent_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ):
+        """
+        Store a completion under its prompt embedding
+
+        Only the fields a hit returns are kept. Completions too large for
+        vector metadata are not cached.
+        """
+        from app.services.vector_service import vector_service
+
+        completion = {
+            "content": result["content"],
+            "model": result["model"],
+            "provider": result["provider"],
+            "usage": result["usage"],
+            "metadata": {
+                key: result["metadata"][key]
+                for key in RESPONSE_METADATA_FIELDS
+                if key in result.get("metadata", {})
+            }
+        }
+        tenant_id = tenant_id or DEFAULT_TENANT_ID
+        metadata = {
+            "tenant_id": tenant_id,
+            "scope": scope,
+            "agent_id": agent_id or "",
+            "prompt": prompt[:1000],
+            "completion": json.dumps(completion, separators=(",", ":")),
+            "created_at": time.time()
+        }
+        size = len(json.dumps(metadata).encode("utf-8"))
+        if size > MAX_METADATA_BYTES:
+            self.oversized += 1
+            logger.info("semantic_cache_store_skipped", reason="oversized", size_bytes=size)
+            return
+
+        vector_id = self._vector_id(tenant_id, scope, prompt)
+        try:
+            await vector_service.upsert_vectors(
+                [{
+                    "id": vector_id,
+                    "values": embedding,
+                    "metadata": metadata
+                }],
+                namespace=self.namespace
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("semantic_cache_store_failed", error=str(e))
+            return
+
+        client = redis_manager.client
+        if not client:
+            return
+        try:
+            await client.zadd(self.EXPIRY_KEY_PREFIX + self.namespace, {vector_id: metadata["created_at"]})
+        except Exception as e:
+            logger.warning("semantic_cache_expiry_index_failed", error=str(e))
+            return
+        await self.sweep_expired()
+
+    async def sweep_expired(self):
+        """Delete vectors past their TTL, unless another sweep ran within the interval"""
+        from app.services.vector_service import vector_service
+
+        client = redis_manager.client
+        if not client:
+            return
+
+        expiry_key = self.EXPIRY_KEY_PREFIX + self.namespace
+        try:
+            if not await client.set(
+                self.SWEEP_LOCK_PREFIX + self.namespace, "1", nx=True, ex=self.sweep_interval
+            ):
+                return
+            cutoff = time.time() - self.ttl_seconds
+            while True:
+                expired = await client.zrangebyscore(
+                    expiry_key, "-inf", cutoff, start=0, num=SWEEP_BATCH_SIZE, withscores=True
+                )
+                if not expired:
+                    break
+                await vector_service.delete_vectors(
+                    [vector_id for vector_id, _ in expired],
+                    namespace=self.namespace
+                )
+                # By score, so a vector stored again meanwhile stays indexed
+                await client.zremrangebyscore(expiry_key, "-inf", expired[-1][1])
+                self.expired += len(expired)
+        except Exception as e:
+            logger.warning("semantic_cache_sweep_failed", error=str(e))
+            return
+
+        logger.info("semantic_cache_swept", expired=self.expired)
+
+    async def report_false_hit(self, cache_entry_id: str):
+        """Record that a semantic hit returned a wrong answer and evict it"""
+        from app.services.vector_service import vector_service
+
+        self.false_hits += 1
+        logger.warning("semantic_cache_false_hit", cache_entry_id=cache_entry_id)
+        await vector_service.delete_vectors([cache_entry_id], namespace=self.namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache hit and false-hit statistics"""
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "false_hits": self.false_hits,
+            "errors": self.errors,
+            "oversized": self.oversized,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "false_hit_rate": round(self.false_hits / self.hits, 4) if self.hits else 0.0,
+            "avg_hit_similarity": (
+                round(self._hit_similarity_total / self.hits, 4) if self.hits else None
+            ),
+            "default_threshold": self.default_threshold,
+            "agent_thresholds": self.agent_thresholds
+        }
@@ -0,0 +1,90 @@
+"""In-flight request coalescing for identical concurrent calls"""
+
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution
+
+    The first caller for a key starts the work as a task; callers that
+    arrive while it is running await the same task. Each caller awaits
+    through ``asyncio.shield`` so a disconnecting caller never cancels the
+    shared call for everyone else; the call is cancelled only once every
+    caller waiting on it has gone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            joined a call started by another caller
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+
+        if shared:
+            self.coalesced += 1
+            logger.info("request_coalesced", key=key[:16])
+        else:
+            self.executions += 1
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if self._waiters.get(task) == 1 and not task.done():
+                self.abandoned += 1
+                logger.info("coalesced_call_abandoned", key=key[:16])
+                # Later callers start a fresh call rather than join a cancelled one
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+                task.cancel()
+            raise
+        finally:
+            self._release(task)
+
+    def _release(self, task: asyncio.Task):
+        """Drop one waiter of a call"""
+        remaining = self._waiters.get(task, 0) - 1
+        if remaining > 0:
+            self._waiters[task] = remaining
+        else:
+            self._waiters.pop(task, None)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        """Drop a finished call so later requests start fresh"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned
+        }
@@ -0,0 +1,176 @@
+"""Local token counting and context-window-aware request shaping"""
+
+from typing import Optional, Dict, List, Tuple
+import structlog
+import tiktoken
+
+from app.services.errors import PromptTooLargeError
+
+logger = structlog.get_logger()
+
+
+# Context window sizes (prompt + completion tokens), matched by model prefix
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "claude-3": 200000,
+    "claude-2": 100000,
+    "fake-": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Chat formatting overhead per message and for priming the reply
+# (see the OpenAI cookbook "How to count tokens with tiktoken")
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Claude's tokenizer is not published; ~3.5 characters per token is a
+# slightly conservative estimate for English text
+ANTHROPIC_CHARS_PER_TOKEN = 3.5
+
+
+class TokenCounter:
+    """
+    Count prompt tokens and fit requests into a model's context window
+
+    OpenAI models are counted with tiktoken. Anthropic models use a
+    character-based estimate. If a tiktoken encoding cannot be loaded
+    (the BPE files are downloaded on first use), the estimate is used for
+    OpenAI models as well.
+    """
+
+    def __init__(self, min_output_tokens: int, safety_margin: int):
+        self.min_output_tokens = min_output_tokens
+        self.safety_margin = safety_margin
+        self._encodings: Dict[str, Optional[tiktoken.Encoding]] = {}
+
+    def warm_up(self, models: List[str]):
+        """Load tiktoken encodings ahead of the first request (blocking)"""
+        for model in models:
+            self._encoding_for(model)
+
+    def _encoding_for(self, model: str) -> Optional[tiktoken.Encoding]:
+        """tiktoken encoding for an OpenAI model, or None if unavailable"""
+        if model in self._encodings:
+            return self._encodings[model]
+
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning("tiktoken_encoding_unavailable", model=model, error=str(e))
+            encoding = None
+
+        self._encodings[model] = encoding
+        return encoding
+
+    @staticmethod
+    def context_window(model: str) -> int:
+        """Context window size for a model"""
+        model_key = model.lower()
+        for prefix, window in CONTEXT_WINDOWS.items():
+            if model_key.startswith(prefix):
+                return window
+        return DEFAULT_CONTEXT_WINDOW
+
+    def count_text(self, text: str, provider: str, model: str) -> int:
+        """Count tokens in a piece of text"""
+        if provider == "openai":
+            encoding = self._encoding_for(model)
+            if encoding:
+                return len(encoding.encode(text, disallowed_special=()))
+        return int(len(text) / ANTHROPIC_CHARS_PER_TOKEN) + 1
+
+    def count_messages(
+        self,
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str
+    ) -> int:
+        """Count prompt tokens for a list of chat messages"""
+        total = TOKENS_PER_REPLY
+        for message in messages:
+            total += TOKENS_PER_MESSAGE + self.count_text(
+                message.get("content") or "", provider, model
+            )
+        return total
+
+    def fit_request(
+        self,
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str,
+        max_tokens: int
+    ) -> Tuple[List[Dict[str, str]], int, int]:
+        """
+        Fit a request into the model's context window
+
+        System messages and the latest message are always kept. The oldest
+        conversation messages are dropped until the prompt leaves room for
+        at least ``min_output_tokens``; ``max_tokens`` is then clamped to
+        the remaining budget.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            provider: Provider name ("openai" or "anthropic")
+            model: Model the request will be sent to
+            max_tokens: Requested completion budget
+
+        Returns:
+            Tuple of (messages, prompt_tokens, max_tokens)
+
+        Raises:
+            PromptTooLargeError: If the kept messages alone overflow the window
+        """
+        budget = self.context_window(model) - self.safety_margin
+        counts = [
+            TOKENS_PER_MESSAGE + self.count_text(msg.get("content") or "", provider, model)
+            for msg in messages
+        ]
+        prompt_tokens = TOKENS_PER_REPLY + sum(counts)
+
+        if prompt_tokens + max_tokens <= budget:
+            return messages, prompt_tokens, max_tokens
+
+        # Drop the oldest conversation messages, keeping system prompts and the latest turn
+        keep = [True] * len(messages)
+        for index, message in enumerate(messages[:-1]):
+            if budget - prompt_tokens >= self.min_output_tokens:
+                break
+            if message.get("role") == "system":
+                continue
+            keep[index] = False
+            prompt_tokens -= counts[index]
+
+        # The trimmed conversation must still open with a user turn
+        for index, message in enumerate(messages[:-1]):
+            if not keep[index] or message.get("role") == "system":
+                continue
+            if message.get("role") != "assistant":
+                break
+            keep[index] = False
+            prompt_tokens -= counts[index]
+
+        remaining = budget - prompt_tokens
+        if remaining < self.min_output_tokens:
+            raise PromptTooLargeError(
+                f"Prompt of {prompt_tokens} tokens does not fit the "
+                f"{self.context_window(model)}-token context window of {model}"
+            )
+
+        fitted = [message for message, kept in zip(messages, keep) if kept]
+        if len(fitted) < len(messages):
+            logger.info(
+                "llm_prompt_trimmed",
+                model=model,
+                dropped_messages=len(messages) - len(fitted),
+                prompt_tokens=prompt_tokens
+            )
+        return fitted, prompt_tokens, min(max_tokens, remaining)
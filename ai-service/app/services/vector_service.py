@@ -1,12 +1,14 @@
 """Vector database service for embeddings and semantic search"""
 
 from typing import List, Dict, Any, Optional
+import asyncio
 import hashlib
 import structlog
 from pinecone import Pinecone, ServerlessSpec
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.llm_service import llm_service
 
 logger = structlog.get_logger()
 
@@ -16,7 +18,12 @@ class VectorService:
     
     def __init__(self):
         self.pinecone_client = Pinecone(api_key=settings.pinecone_api_key)
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+        # Reuse the LLM service's pooled keep-alive connections
+        self.openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+            http_client=llm_service.http_client
+        )
         self.index_name = settings.pinecone_index_name
         self.index = None
         
@@ -94,7 +101,7 @@ class VectorService:
                 model=model
             )
             
-            response = self.openai_client.embeddings.create(
+            response = await self.openai_client.embeddings.create(
                 input=text,
                 model=model
             )
@@ -138,7 +145,9 @@ class VectorService:
                 namespace=namespace
             )
             
-            result = self.index.upsert(
+            # Pinecone client is synchronous; keep it off the event loop
+            result = await asyncio.to_thread(
+                self.index.upsert,
                 vectors=vectors,
                 namespace=namespace or ""
             )
@@ -244,23 +253,14 @@ class VectorService:
             query_embedding = await self.generate_embedding(query)
             
             # Search in Pinecone
-            results = self.index.query(
+            matches = await self.query_vectors(
                 vector=query_embedding,
                 top_k=top_k,
-                namespace=namespace or "",
-                filter=filter_metadata,
+                namespace=namespace,
+                filter_metadata=filter_metadata,
                 include_metadata=include_metadata
             )
             
-            # Format results
-            matches = []
-            for match in results.matches:
-                matches.append({
-                    "id": match.id,
-                    "score": match.score,
-                    "metadata": match.metadata if include_metadata else None
-                })
-            
             logger.info(
                 "semantic_search_completed",
                 results_count=len(matches)
@@ -275,6 +275,46 @@ class VectorService:
             )
             raise
     
+    async def query_vectors(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: Optional[str] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Query Pinecone with a precomputed embedding
+        
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            namespace: Optional namespace to search within
+            filter_metadata: Optional metadata filters
+            include_metadata: Whether to include metadata in results
+        
+        Returns:
+            List of matching results with scores and metadata
+        """
+        # Pinecone client is synchronous; keep it off the event loop
+        results = await asyncio.to_thread(
+            self.index.query,
+            vector=vector,
+            top_k=top_k,
+            namespace=namespace or "",
+            filter=filter_metadata,
+            include_metadata=include_metadata
+        )
+        
+        return [
+            {
+                "id": match.id,
+                "score": match.score,
+                "metadata": match.metadata if include_metadata else None
+            }
+            for match in results.matches
+        ]
+    
     async def delete_vectors(
         self,
         vector_ids: List[str],
@@ -297,7 +337,8 @@ class VectorService:
                 namespace=namespace
             )
             
-            self.index.delete(
+            await asyncio.to_thread(
+                self.index.delete,
                 ids=vector_ids,
                 namespace=namespace or ""
             )
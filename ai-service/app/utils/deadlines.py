@@ -0,0 +1,96 @@
+"""Helper utilities for request deadlines and client disconnects"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Optional, TypeVar
+from fastapi import HTTPException, Request, status
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Relative timeout in seconds; a body field of the same meaning takes precedence
+DEADLINE_HEADER = "X-Request-Timeout"
+
+# nginx's "client closed request"; never seen by the client, but logged
+CLIENT_CLOSED_REQUEST = 499
+
+
+def request_deadline(request: Request, timeout_seconds: Optional[Any] = None) -> Optional[float]:
+    """
+    Absolute deadline of a request, in ``time.monotonic()`` seconds
+
+    The timeout comes from the body's ``timeout_seconds``, then the
+    ``X-Request-Timeout`` header, then ``request_default_timeout_seconds``,
+    and is capped at ``request_max_timeout_seconds``. Timeouts are relative
+    so client and server clocks never need to agree.
+
+    Args:
+        request: Incoming HTTP request
+        timeout_seconds: Timeout from the request body, if any
+
+    Returns:
+        Deadline, or None if the request has none
+
+    Raises:
+        HTTPException: If the timeout is not a positive number of seconds
+    """
+    if timeout_seconds is None:
+        timeout_seconds = request.headers.get(DEADLINE_HEADER)
+    if timeout_seconds is None:
+        timeout_seconds = settings.request_default_timeout_seconds or None
+    if timeout_seconds is None:
+        return None
+
+    try:
+        timeout = float(timeout_seconds)
+    except (TypeError, ValueError):
+        timeout = 0.0
+    if not timeout > 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request timeout must be a positive number of seconds"
+        )
+    return time.monotonic() + min(timeout, settings.request_max_timeout_seconds)
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await request work, cancelling it if the client disconnects first
+
+    Cancellation propagates into the LLM call, so an abandoned request
+    releases its concurrency slot and stops the provider request instead
+    of paying for tokens nobody reads.
+
+    Raises:
+        HTTPException: With status 499 if the client disconnected
+    """
+    work = asyncio.ensure_future(awaitable)
+
+    async def wait_for_disconnect():
+        # The body has been read, so the next message is the disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.create_task(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work.cancel()
+        watcher.cancel()
+        raise
+    watcher.cancel()
+    if work in done:
+        return work.result()
+
+    # Let the call release its limiter slot and close the provider request
+    work.cancel()
+    await asyncio.gather(work, return_exceptions=True)
+    logger.info("request_cancelled_on_disconnect", path=request.url.path)
+    raise HTTPException(
+        status_code=CLIENT_CLOSED_REQUEST,
+        detail="Client disconnected"
+    )
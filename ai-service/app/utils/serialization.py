@@ -0,0 +1,65 @@
+"""Versioned compact encoding for values stored in Redis"""
+
+import json
+from typing import Any
+import msgpack
+import zstandard
+
+from app.config import settings
+
+# First byte of an encoded value. Legacy JSON text starts with a printable
+# character ('{', '[', a digit or a quote), so it can never be mistaken
+# for a versioned value.
+FORMAT_MSGPACK = b"\x01"
+FORMAT_MSGPACK_ZSTD = b"\x02"
+
+_compressor = zstandard.ZstdCompressor(level=settings.context_compression_level)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Encode a JSON-compatible value as msgpack behind a format byte
+
+    Values whose msgpack encoding reaches
+    ``context_compression_threshold_bytes`` are zstd-compressed, unless
+    compression does not make them smaller.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        Encoded bytes
+    """
+    packed = msgpack.packb(value, use_bin_type=True)
+    threshold = settings.context_compression_threshold_bytes
+    if threshold and len(packed) >= threshold:
+        compressed = _compressor.compress(packed)
+        if len(compressed) < len(packed):
+            return FORMAT_MSGPACK_ZSTD + compressed
+    return FORMAT_MSGPACK + packed
+
+
+def decode_value(data: bytes | str) -> Any:
+    """
+    Decode a value written by ``encode_value``, or legacy JSON text
+
+    Args:
+        data: Raw value read from Redis
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the value is in neither format
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+
+    marker = data[:1]
+    if marker == FORMAT_MSGPACK:
+        return msgpack.unpackb(data[1:], raw=False)
+    if marker == FORMAT_MSGPACK_ZSTD:
+        return msgpack.unpackb(_decompressor.decompress(data[1:]), raw=False)
+    # json.loads raises a ValueError subclass for anything else
+    return json.loads(data)
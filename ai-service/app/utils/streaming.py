@@ -0,0 +1,25 @@
+"""Helper utilities for streaming HTTP responses"""
+
+import json
+from typing import Any, Dict, Optional
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Disable proxy buffering so tokens flush immediately
+}
+
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """
+    Format a payload as a Server-Sent Events message
+
+    Args:
+        data: JSON-serializable payload
+        event: Optional event name
+
+    Returns:
+        SSE-formatted message string
+    """
+    message = f"event: {event}\n" if event else ""
+    return f"{message}data: {json.dumps(data)}\n\n"
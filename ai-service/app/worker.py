@@ -0,0 +1,160 @@
+"""
+Background job worker entry point
+
+Runs queued jobs (mission synthesis, Lumi documents, Lexi bulk insights)
+outside the API processes so long generations never compete with
+interactive chat. Start one or more workers next to the API:
+
+    python -m app.worker
+"""
+
+from typing import Dict, Any
+import asyncio
+import os
+import signal
+import socket
+import uuid
+import structlog
+import sentry_sdk
+
+from app.config import settings
+from app.models.job_models import JobType
+from app.services.call_context import current_tenant_id
+from app.services.errors import LLMServiceUnavailableError
+from app.services.job_queue import job_queue
+from app.services.redis_client import redis_manager
+
+# Configure structured logging
+structlog.configure(
+    processors=[
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.add_log_level,
+        structlog.processors.JSONRenderer()
+    ]
+)
+
+logger = structlog.get_logger()
+
+
+class JobWorker:
+    """
+    Pool of job consumers sharing one process
+
+    Each consumer claims one job at a time. On SIGTERM/SIGINT the worker
+    stops claiming, gives running jobs ``job_shutdown_grace_seconds`` to
+    finish and requeues the rest; their finished steps are checkpointed
+    and are not repeated by the next worker.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop claiming new jobs"""
+        self._stopping.set()
+
+    async def run(self):
+        """Consume jobs until stopped"""
+        await redis_manager.connect()
+        if not job_queue.active:
+            raise RuntimeError("Job worker requires Redis")
+
+        from app.services.llm_service import llm_service
+        await asyncio.to_thread(llm_service.token_counter.warm_up, [settings.openai_model])
+
+        from app.agents import initialize_agents
+        initialize_agents()
+
+        await job_queue.heartbeat(self.worker_id)
+        await job_queue.recover_orphans()
+        heartbeat = asyncio.create_task(self._heartbeat())
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        logger.info("job_worker_started", worker_id=self.worker_id, concurrency=self.concurrency)
+
+        await self._stopping.wait()
+        logger.info("job_worker_stopping", worker_id=self.worker_id)
+
+        _, unfinished = await asyncio.wait(consumers, timeout=settings.job_shutdown_grace_seconds)
+        for consumer in unfinished:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+
+        # Release anything claimed but not started back to the queue
+        heartbeat.cancel()
+        await job_queue.stop_heartbeat(self.worker_id)
+        await job_queue.recover_orphans()
+        await llm_service.close()
+        await redis_manager.disconnect()
+        logger.info("job_worker_stopped", worker_id=self.worker_id)
+
+    async def _heartbeat(self):
+        """Keep this worker's claims alive and recover jobs of dead workers"""
+        while True:
+            await asyncio.sleep(job_queue.heartbeat_seconds)
+            try:
+                await job_queue.heartbeat(self.worker_id)
+                await job_queue.recover_orphans()
+            except Exception as e:
+                logger.warning("job_worker_heartbeat_failed", error=str(e))
+
+    async def _consume(self):
+        """Claim and run jobs one at a time"""
+        while not self._stopping.is_set():
+            try:
+                job = await job_queue.claim(self.worker_id, timeout=1)
+            except Exception as e:
+                logger.warning("job_claim_failed", error=str(e))
+                await asyncio.sleep(1)
+                continue
+            if job:
+                await self._run_job(job)
+
+    async def _run_job(self, job: Dict[str, Any]):
+        """Run one job and record its outcome"""
+        from app.services.job_handlers import JOB_HANDLERS
+
+        job_id = job["job_id"]
+        current_tenant_id.set(job["tenant_id"])
+        logger.info("job_started", job_id=job_id, job_type=job["type"], attempt=job["attempts"])
+
+        try:
+            checkpoint = await job_queue.checkpoint(job_id)
+            result = await JOB_HANDLERS[JobType(job["type"])](job["payload"], checkpoint)
+        except asyncio.CancelledError:
+            await job_queue.requeue(self.worker_id, job_id, front=True)
+            logger.info("job_interrupted", job_id=job_id)
+            raise
+        except LLMServiceUnavailableError as e:
+            # Provider pressure is transient: retry later, keeping finished steps
+            if job["attempts"] < job_queue.max_attempts:
+                logger.warning("job_retrying", job_id=job_id, error=str(e))
+                await job_queue.requeue(self.worker_id, job_id)
+            else:
+                await job_queue.finish(self.worker_id, job_id, error=str(e))
+        except Exception as e:
+            logger.error("job_failed", job_id=job_id, error=str(e))
+            await job_queue.finish(self.worker_id, job_id, error=str(e))
+        else:
+            await job_queue.finish(self.worker_id, job_id, result=result)
+
+
+async def main():
+    """Run a job worker until SIGTERM or SIGINT"""
+    if settings.sentry_dsn:
+        sentry_sdk.init(
+            dsn=settings.sentry_dsn,
+            environment=settings.environment,
+            traces_sample_rate=1.0 if settings.debug else 0.1
+        )
+
+    worker = JobWorker(concurrency=settings.job_worker_concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Concurrency benchmark for /api/agents/process
+
+Starts a local fake OpenAI-compatible provider that answers every chat
+completion after a fixed delay, points the LLM service at it and compares
+the wall-clock time of one request with N concurrent requests. With
+non-blocking provider calls, N concurrent requests should finish in about
+the time of one.
+
+Every request sends a distinct prompt, so none is served from the
+completion caches or merged with another by request coalescing: each one
+reaches the provider.
+
+Usage:
+    python -m benchmarks.concurrency_benchmark --concurrency 20 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+# Settings are read at import time, so configure the environment first
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_ENVIRONMENT", "benchmark")
+os.environ.setdefault("ENABLE_COST_TRACKING", "false")
+
+import logging  # noqa: E402
+
+import httpx  # noqa: E402
+import structlog  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+# Context storage runs without Redis here, so silence its expected errors
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+
+def create_fake_provider(latency: float) -> FastAPI:
+    """Create a minimal OpenAI-compatible chat completions server"""
+    fake = FastAPI()
+
+    @fake.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        await asyncio.sleep(latency)
+        return {
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Benchmark response"},
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60}
+        }
+
+    return fake
+
+
+def start_fake_provider(latency: float) -> str:
+    """Run the fake provider in a background thread and return its base URL"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_fake_provider(latency),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning"
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    return f"http://127.0.0.1:{port}/v1"
+
+
+async def run_requests(client: httpx.AsyncClient, count: int, run: str) -> float:
+    """Fire `count` concurrent agent requests with distinct prompts and return elapsed seconds"""
+    async def one(i: int):
+        response = await client.post(
+            "/api/agents/process",
+            json={
+                "agent_id": "roxy",
+                "message": f"What should I focus on this week? ({run} request {i})",
+                "context_id": f"benchmark-{run}-{i}"
+            }
+        )
+        response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return time.perf_counter() - start
+
+
+async def main(concurrency: int, latency: float):
+    os.environ["OPENAI_BASE_URL"] = start_fake_provider(latency)
+
+    from app.agents import initialize_agents
+    from app.routers import agents
+    from app.services.llm_service import llm_service
+
+    initialize_agents()
+    app = FastAPI()
+    app.include_router(agents.router, prefix="/api/agents")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        timeout=None
+    ) as client:
+        # Warm up the provider connection pool
+        await run_requests(client, 1, "warmup")
+
+        single = await run_requests(client, 1, "single")
+        concurrent = await run_requests(client, concurrency, "concurrent")
+
+    await llm_service.close()
+
+    print(f"Provider latency:        {latency:.2f}s")
+    print(f"1 request:               {single:.2f}s")
+    print(f"{concurrency} concurrent requests: {concurrent:.2f}s")
+    print(f"Ratio (concurrent/one):  {concurrent / single:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency, args.latency))
@@ -0,0 +1,202 @@
+"""
+Context storage benchmark: full JSON blob per turn vs append-only list
+
+Replays chat turns (load the context, add a user and an assistant
+message, save it) against contexts already holding ``max_history``
+messages, once with the previous layout (one JSON blob rewritten with
+SETEX every turn) and once with ``ContextStorageService``'s list layout.
+Reports per-turn save and load latency and the bytes each save sends
+(message bodies are random text, so compression is not flattered).
+
+Runs against ``--redis-url`` (default: the configured ``REDIS_URL``); if
+that Redis is unreachable and ``fakeredis`` is installed, an in-process
+fake is used instead. That measures serialization cost but no network,
+and fakeredis runs the load script in an embedded Lua interpreter that is
+far slower than Redis, so list-layout load times are only meaningful
+against a real server.
+
+Usage:
+    python -m benchmarks.context_storage_benchmark --sizes 10 50 500 --turns 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import time
+
+# Settings are read at import time, so configure the environment first
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_ENVIRONMENT", "benchmark")
+
+import logging  # noqa: E402
+
+import redis.asyncio as redis  # noqa: E402
+import structlog  # noqa: E402
+
+from app.agents.base_agent import ConversationContext  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services.context_storage import ContextStorageService  # noqa: E402
+
+# Every save and load logs at info level, which would dominate the timings
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+)
+
+TTL_SECONDS = 24 * 3600
+
+
+class BlobLayout:
+    """The previous layout: the whole context as one JSON string"""
+
+    name = "json blob"
+
+    def __init__(self, client):
+        self.client = client
+
+    async def save(self, key: str, context: ConversationContext) -> int:
+        data = json.dumps({
+            "messages": context.messages,
+            "metadata": context.metadata,
+            "max_history": context.max_history
+        })
+        await self.client.setex(f"context:benchmark:{key}", TTL_SECONDS, data)
+        return len(data)
+
+    async def load(self, key: str) -> ConversationContext:
+        parsed = json.loads(await self.client.get(f"context:benchmark:{key}"))
+        context = ConversationContext(max_history=parsed.get("max_history", 10))
+        context.messages = parsed.get("messages", [])
+        context.metadata = parsed.get("metadata", {})
+        return context
+
+
+class ListLayout:
+    """The append-only list layout of ``ContextStorageService``"""
+
+    name = "append-only list"
+
+    def __init__(self, client):
+        self.storage = ContextStorageService()
+        self.storage._redis = client
+
+    async def save(self, key: str, context: ConversationContext) -> int:
+        storage = self.storage
+        messages = context.messages if context.needs_rewrite else context.unsaved_messages
+        sent = sum(
+            len(storage._serialize_message(msg)) for msg in messages if msg["role"] != "system"
+        )
+        system_changed = context.needs_rewrite or any(
+            msg["role"] == "system" for msg in context.unsaved_messages
+        )
+        sent += sum(
+            len(field) + len(str(value) if isinstance(value, int) else value)
+            for field, value in storage._serialize_meta("benchmark", context, system_changed).items()
+        )
+        if not await storage.save_context("benchmark", key, context):
+            raise RuntimeError("save_context failed")
+        return sent
+
+    async def load(self, key: str) -> ConversationContext:
+        context = await self.storage.load_context("benchmark", key)
+        if context is None:
+            raise RuntimeError("load_context found nothing")
+        return context
+
+
+def text(chars: int) -> str:
+    """Random words, roughly as compressible as chat text"""
+    words = []
+    while sum(len(word) + 1 for word in words) < chars:
+        words.append("".join(random.choices(string.ascii_lowercase, k=random.randint(2, 9))))
+    return " ".join(words)[:chars]
+
+
+def filled_context(size: int, message_chars: int) -> ConversationContext:
+    """A context holding a system prompt and ``size`` conversation messages"""
+    context = ConversationContext(max_history=size)
+    context.add_message("system", "You are a helpful business assistant. " * 12)
+    for i in range(size):
+        context.add_message("user" if i % 2 == 0 else "assistant", text(message_chars))
+    return context
+
+
+async def run_layout(layout, size: int, turns: int, message_chars: int) -> dict:
+    """Replay ``turns`` chat turns against one pre-filled context"""
+    key = f"{layout.name.replace(' ', '-')}-{size}"
+    await layout.save(key, filled_context(size, message_chars))
+
+    save_seconds = 0.0
+    load_seconds = 0.0
+    sent_bytes = 0
+    for turn in range(turns):
+        start = time.perf_counter()
+        context = await layout.load(key)
+        load_seconds += time.perf_counter() - start
+
+        context.add_message("user", text(message_chars))
+        context.add_message("assistant", text(message_chars))
+
+        start = time.perf_counter()
+        sent_bytes += await layout.save(key, context)
+        save_seconds += time.perf_counter() - start
+
+    return {
+        "save_ms": save_seconds / turns * 1000,
+        "load_ms": load_seconds / turns * 1000,
+        "sent_bytes": sent_bytes / turns
+    }
+
+
+async def connect(redis_url: str, decode_responses: bool):
+    """Connect to Redis, falling back to fakeredis when it is unreachable"""
+    client = redis.from_url(redis_url, decode_responses=decode_responses)
+    try:
+        await client.ping()
+        return client, redis_url
+    except Exception as e:
+        await client.aclose()
+        try:
+            import fakeredis
+        except ImportError:
+            raise SystemExit(f"Redis at {redis_url} is unreachable ({e}) and fakeredis is not installed")
+        return fakeredis.aioredis.FakeRedis(decode_responses=decode_responses), "fakeredis (in-process)"
+
+
+async def main(args: argparse.Namespace):
+    text_client, target = await connect(args.redis_url, decode_responses=True)
+    # Context storage values are binary
+    binary_client, _ = await connect(args.redis_url, decode_responses=False)
+    layouts = [BlobLayout(text_client), ListLayout(binary_client)]
+
+    print(f"Redis:          {target}")
+    print(f"Turns per size: {args.turns} ({args.message_chars} characters per message)")
+    print()
+    print(f"{'messages':>8}  {'layout':<17} {'save ms':>8} {'load ms':>8} {'bytes/save':>11}")
+    try:
+        for size in args.sizes:
+            for layout in layouts:
+                result = await run_layout(layout, size, args.turns, args.message_chars)
+                print(
+                    f"{size:>8}  {layout.name:<17} {result['save_ms']:>8.3f} "
+                    f"{result['load_ms']:>8.3f} {result['sent_bytes']:>11.0f}"
+                )
+    finally:
+        for client in (text_client, binary_client):
+            keys = [key async for key in client.scan_iter(match="context*:benchmark:*")]
+            if keys:
+                await client.delete(*keys)
+            await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis-url", default=settings.redis_url)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 500])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--message-chars", type=int, default=400)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Load benchmark for /api/agents/process on the built-in fake provider
+
+Routes every LLM call to the in-process ``fake`` provider, so the whole
+request path (agent prompt building, request shaping, rate and
+concurrency limits, caching, cost tracking) runs without network access
+or API spend. Provider rate limits are off unless ``--rate-limits`` is
+given. Sends a fixed number of requests with bounded concurrency
+and reports throughput, error rate and latency percentiles.
+
+Usage:
+    python -m benchmarks.load_benchmark --requests 500 --concurrency 50 \\
+        --latency-ms 800 --distribution lognormal --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+
+def configure(args: argparse.Namespace):
+    """Point the service at the fake provider; settings are read at import time"""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+    os.environ.setdefault("PINECONE_ENVIRONMENT", "benchmark")
+    os.environ["ENABLE_FAKE_PROVIDER"] = "true"
+    os.environ["LLM_PROVIDER_OVERRIDE"] = "fake"
+    os.environ["FAKE_LATENCY_DISTRIBUTION"] = args.distribution
+    os.environ["FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_OUTPUT_TOKENS"] = str(args.output_tokens)
+    os.environ["FAKE_SEED"] = str(args.seed)
+    if not args.rate_limits:
+        # The default per-provider limits model real API quotas, not the fake
+        os.environ["ENABLE_RATE_LIMITING"] = "false"
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def main(args: argparse.Namespace):
+    import logging
+
+    import httpx
+    import structlog
+    from fastapi import FastAPI
+
+    # Context storage runs without Redis here, so silence its expected errors
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+    )
+
+    from app.agents import initialize_agents
+    from app.routers import agents
+    from app.services.llm_service import llm_service
+
+    initialize_agents()
+    app = FastAPI()
+    app.include_router(agents.router, prefix="/api/agents")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = {}
+
+    async def one(client: httpx.AsyncClient, i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/agents/process",
+                json={
+                    "agent_id": "roxy",
+                    # Distinct messages keep the response cache out of the measurement
+                    "message": f"What should I focus on this week? (request {i})",
+                    "context_id": f"load-{i}"
+                }
+            )
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        timeout=None
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    cost_stats = await llm_service.get_cost_stats()
+    await llm_service.close()
+
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    print(f"Requests:                {args.requests} ({args.concurrency} concurrent)")
+    print(f"Fake provider latency:   {args.latency_ms:.0f}ms {args.distribution}")
+    print(f"Elapsed:                 {elapsed:.2f}s")
+    print(f"Throughput:              {args.requests / elapsed:.1f} req/s")
+    print(f"Errors:                  {errors} ({errors / args.requests:.1%})")
+    print(f"Status codes:            {dict(sorted(statuses.items()))}")
+    for pct in (50, 90, 99):
+        print(f"p{pct} latency:             {percentile(latencies, pct) * 1000:.0f}ms")
+    if cost_stats:
+        print(f"Provider calls tracked:  {cost_stats['total_requests']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument(
+        "--distribution",
+        choices=("fixed", "uniform", "normal", "lognormal"),
+        default="lognormal"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rate-limits",
+        action="store_true",
+        help="Keep the configured provider rate limits"
+    )
+    args = parser.parse_args()
+
+    configure(args)
+    asyncio.run(main(args))